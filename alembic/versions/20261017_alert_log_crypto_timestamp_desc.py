@@ -0,0 +1,33 @@
+"""Newest-first alert log index per cryptocurrency
+
+Revision ID: 018_alert_log_crypto_timestamp_desc
+Revises: 017_chat_history_session_covering_index
+Create Date: 2026-10-17 00:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '018_alert_log_crypto_timestamp_desc'
+down_revision: Union[str, None] = '017_chat_history_session_covering_index'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Cooldown checks and per-crypto history read the newest alerts first
+    op.drop_index('idx_alert_log_crypto_timestamp', table_name='alert_logs')
+    op.create_index(
+        'idx_alert_log_crypto_timestamp_desc',
+        'alert_logs',
+        ['crypto_id', sa.text('timestamp DESC')]
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('idx_alert_log_crypto_timestamp_desc', table_name='alert_logs')
+    op.create_index('idx_alert_log_crypto_timestamp', 'alert_logs', ['crypto_id', 'timestamp'])
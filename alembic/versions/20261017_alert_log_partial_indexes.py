@@ -0,0 +1,40 @@
+"""Partial indexes for failed and successful alerts
+
+Revision ID: 008_alert_log_partial_indexes
+Revises: 007_chat_question_hash_index
+Create Date: 2026-10-17 00:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '008_alert_log_partial_indexes'
+down_revision: Union[str, None] = '007_chat_question_hash_index'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index(
+        'idx_alert_log_failed_recent',
+        'alert_logs',
+        ['created_at'],
+        postgresql_where=sa.text('success = false')
+    )
+    op.create_index(
+        'idx_alert_log_crypto_ts_success',
+        'alert_logs',
+        ['crypto_id', 'timestamp'],
+        postgresql_where=sa.text('success = true')
+    )
+    op.drop_index('idx_alert_log_success', table_name='alert_logs')
+
+
+def downgrade() -> None:
+    op.create_index('idx_alert_log_success', 'alert_logs', ['success', 'created_at'])
+    op.drop_index('idx_alert_log_crypto_ts_success', table_name='alert_logs')
+    op.drop_index('idx_alert_log_failed_recent', table_name='alert_logs')
@@ -0,0 +1,71 @@
+"""Hash-partition query_audit_log on session_id
+
+Revision ID: 010_audit_log_hash_partitions
+Revises: 009_brin_timestamp_indexes
+Create Date: 2026-10-17 00:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '010_audit_log_hash_partitions'
+down_revision: Union[str, None] = '009_brin_timestamp_indexes'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+PARTITION_COUNT = 16
+
+
+def _rebuild_table(partitioned: bool) -> None:
+    """Recreate query_audit_log, copying rows, with or without partitions."""
+    op.execute("ALTER TABLE query_audit_log RENAME TO query_audit_log_old")
+    op.execute("ALTER INDEX query_audit_log_pkey RENAME TO query_audit_log_old_pkey")
+    
+    partition_clause = " PARTITION BY HASH (session_id)" if partitioned else ""
+    op.execute(
+        "CREATE TABLE query_audit_log "
+        "(LIKE query_audit_log_old INCLUDING DEFAULTS INCLUDING CONSTRAINTS)"
+        + partition_clause
+    )
+    # Unique keys on a partitioned table must include the partition column
+    primary_key = "id, session_id" if partitioned else "id"
+    op.execute(f"ALTER TABLE query_audit_log ADD PRIMARY KEY ({primary_key})")
+    op.execute(
+        "ALTER TABLE query_audit_log ADD CONSTRAINT query_audit_log_chat_history_id_fkey "
+        "FOREIGN KEY (chat_history_id) REFERENCES chat_history (id) ON DELETE CASCADE"
+    )
+    
+    if partitioned:
+        for remainder in range(PARTITION_COUNT):
+            op.execute(
+                f"CREATE TABLE query_audit_log_p{remainder} PARTITION OF query_audit_log "
+                f"FOR VALUES WITH (MODULUS {PARTITION_COUNT}, REMAINDER {remainder})"
+            )
+    
+    op.execute("INSERT INTO query_audit_log SELECT * FROM query_audit_log_old")
+    # Keep the id sequence when the old table (its owner) is dropped
+    op.execute("ALTER SEQUENCE query_audit_log_id_seq OWNED BY query_audit_log.id")
+    op.execute("DROP TABLE query_audit_log_old")
+    
+    # Indexes on a partitioned table are created on every partition
+    op.create_index('idx_audit_log_session_created', 'query_audit_log', ['session_id', 'created_at'])
+    op.create_index('idx_audit_log_rejected_created', 'query_audit_log', ['rejected', 'created_at'])
+    op.create_index('ix_query_audit_log_session_id', 'query_audit_log', ['session_id'])
+    op.create_index(
+        'idx_audit_pii_patterns',
+        'query_audit_log',
+        ['pii_patterns_detected'],
+        postgresql_using='gin'
+    )
+
+
+def upgrade() -> None:
+    _rebuild_table(partitioned=True)
+
+
+def downgrade() -> None:
+    _rebuild_table(partitioned=False)
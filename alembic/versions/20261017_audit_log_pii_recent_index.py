@@ -0,0 +1,31 @@
+"""Partial index for recent PII detections in the audit log
+
+Revision ID: 020_audit_log_pii_recent_index
+Revises: 019_drop_chat_history_session_id_index
+Create Date: 2026-10-17 00:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '020_audit_log_pii_recent_index'
+down_revision: Union[str, None] = '019_drop_chat_history_session_id_index'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index(
+        'idx_audit_log_pii_recent',
+        'query_audit_log',
+        [sa.text('created_at DESC')],
+        postgresql_where=sa.text('pii_patterns_detected IS NOT NULL')
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('idx_audit_log_pii_recent', table_name='query_audit_log')
@@ -0,0 +1,54 @@
+"""Store audit PII patterns as a varchar array with a GIN index
+
+Revision ID: 005_audit_pii_patterns_array
+Revises: 004_price_history_covering_index
+Create Date: 2026-10-17 00:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = '005_audit_pii_patterns_array'
+down_revision: Union[str, None] = '004_price_history_covering_index'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        'query_audit_log',
+        sa.Column('pii_patterns_detected_new', postgresql.ARRAY(sa.String(length=32)), nullable=True)
+    )
+    op.execute(
+        "UPDATE query_audit_log "
+        "SET pii_patterns_detected_new = ARRAY("
+        "SELECT jsonb_array_elements_text(pii_patterns_detected::jsonb)) "
+        "WHERE pii_patterns_detected IS NOT NULL"
+    )
+    op.drop_column('query_audit_log', 'pii_patterns_detected')
+    op.alter_column(
+        'query_audit_log',
+        'pii_patterns_detected_new',
+        new_column_name='pii_patterns_detected'
+    )
+    op.create_index(
+        'idx_audit_pii_patterns',
+        'query_audit_log',
+        ['pii_patterns_detected'],
+        postgresql_using='gin'
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('idx_audit_pii_patterns', table_name='query_audit_log')
+    op.alter_column(
+        'query_audit_log',
+        'pii_patterns_detected',
+        type_=sa.JSON(),
+        postgresql_using='to_json(pii_patterns_detected)'
+    )
@@ -0,0 +1,85 @@
+"""64-bit ids with cached sequences on high-volume append tables
+
+Revision ID: 013_bigint_ids
+Revises: 012_predictions_covering_index
+Create Date: 2026-10-17 00:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '013_bigint_ids'
+down_revision: Union[str, None] = '012_predictions_covering_index'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# (table, column); ids first, then the foreign key that references one
+ID_COLUMNS = [
+    ('price_history', 'id'),
+    ('chat_history', 'id'),
+    ('query_audit_log', 'id'),
+    ('alert_logs', 'id'),
+    ('query_audit_log', 'chat_history_id'),
+]
+
+# Tables whose id comes from an owned <table>_id_seq sequence
+SEQUENCE_TABLES = ['price_history', 'chat_history', 'query_audit_log', 'alert_logs']
+
+SEQUENCE_CACHE = 1000
+
+
+def _price_history_compressed() -> bool:
+    """Check whether price_history is a hypertable with compression enabled."""
+    bind = op.get_bind()
+    has_timescale = bind.execute(sa.text(
+        "SELECT 1 FROM pg_extension WHERE extname = 'timescaledb'"
+    )).scalar()
+    if not has_timescale:
+        return False
+    return bool(bind.execute(sa.text(
+        "SELECT compression_enabled FROM timescaledb_information.hypertables "
+        "WHERE hypertable_name = 'price_history'"
+    )).scalar())
+
+
+def _alter_ids(column_type: sa.types.TypeEngine, sql_type: str, cache: int) -> None:
+    """Change id column types and sequences, lifting price_history compression meanwhile."""
+    compressed = _price_history_compressed()
+    if compressed:
+        # Column types cannot change while compression is enabled
+        op.execute("SELECT remove_compression_policy('price_history', if_exists => true)")
+        op.execute(
+            "SELECT decompress_chunk(c, if_compressed => true) "
+            "FROM show_chunks('price_history') c"
+        )
+        op.execute("ALTER TABLE price_history SET (timescaledb.compress = false)")
+    
+    for table, column in ID_COLUMNS:
+        op.alter_column(table, column, type_=column_type)
+    
+    # Each backend reserves `cache` ids at a time instead of one per nextval()
+    for table in SEQUENCE_TABLES:
+        op.execute(f"ALTER SEQUENCE {table}_id_seq AS {sql_type} CACHE {cache}")
+    
+    if compressed:
+        op.execute(
+            "ALTER TABLE price_history SET ("
+            "timescaledb.compress, "
+            "timescaledb.compress_segmentby = 'crypto_id', "
+            "timescaledb.compress_orderby = '\"timestamp\" DESC')"
+        )
+        op.execute(
+            "SELECT add_compression_policy('price_history', INTERVAL '30 days', if_not_exists => true)"
+        )
+
+
+def upgrade() -> None:
+    _alter_ids(sa.BigInteger(), 'bigint', SEQUENCE_CACHE)
+
+
+def downgrade() -> None:
+    _alter_ids(sa.Integer(), 'integer', 1)
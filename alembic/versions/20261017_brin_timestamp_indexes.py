@@ -0,0 +1,42 @@
+"""BRIN indexes for append-only timestamp columns
+
+Revision ID: 009_brin_timestamp_indexes
+Revises: 008_alert_log_partial_indexes
+Create Date: 2026-10-17 00:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '009_brin_timestamp_indexes'
+down_revision: Union[str, None] = '008_alert_log_partial_indexes'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# (table, column, btree index, BRIN index)
+BRIN_INDEXES = [
+    ('price_history', 'timestamp', 'idx_price_history_timestamp', 'brin_price_history_ts'),
+    ('chat_history', 'created_at', 'idx_chat_history_created', 'brin_chat_history_created'),
+]
+
+
+def upgrade() -> None:
+    for table, column, btree_name, brin_name in BRIN_INDEXES:
+        op.create_index(
+            brin_name,
+            table,
+            [column],
+            postgresql_using='brin',
+            postgresql_with={'pages_per_range': 32}
+        )
+        op.drop_index(btree_name, table_name=table)
+
+
+def downgrade() -> None:
+    for table, column, btree_name, brin_name in BRIN_INDEXES:
+        op.create_index(btree_name, table, [column])
+        op.drop_index(brin_name, table_name=table)
@@ -0,0 +1,38 @@
+"""Newest-first covering index for chat history per session
+
+Revision ID: 017_chat_history_session_covering_index
+Revises: 016_top_prediction_rejected_audit_indexes
+Create Date: 2026-10-17 00:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '017_chat_history_session_covering_index'
+down_revision: Union[str, None] = '016_top_prediction_rejected_audit_indexes'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.drop_index('idx_chat_history_session_created', table_name='chat_history')
+    op.create_index(
+        'idx_chat_history_session_created_desc_cov',
+        'chat_history',
+        ['session_id', sa.text('created_at DESC'), sa.text('id DESC')],
+        postgresql_include=[
+            'openai_cost_usd',
+            'openai_tokens_input',
+            'openai_tokens_output',
+            'response_time_ms',
+        ]
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('idx_chat_history_session_created_desc_cov', table_name='chat_history')
+    op.create_index('idx_chat_history_session_created', 'chat_history', ['session_id', 'created_at'])
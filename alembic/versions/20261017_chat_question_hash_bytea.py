@@ -0,0 +1,39 @@
+"""Store chat_history.question_hash as a raw SHA256 digest
+
+Revision ID: 011_chat_question_hash_bytea
+Revises: 010_audit_log_hash_partitions
+Create Date: 2026-10-17 00:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '011_chat_question_hash_bytea'
+down_revision: Union[str, None] = '010_audit_log_hash_partitions'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Hex digests decode to 32 raw bytes; the index is rebuilt by the type change
+    op.alter_column(
+        'chat_history',
+        'question_hash',
+        type_=sa.LargeBinary(length=32),
+        existing_nullable=True,
+        postgresql_using="decode(question_hash, 'hex')"
+    )
+
+
+def downgrade() -> None:
+    op.alter_column(
+        'chat_history',
+        'question_hash',
+        type_=sa.String(length=64),
+        existing_nullable=True,
+        postgresql_using="encode(question_hash, 'hex')"
+    )
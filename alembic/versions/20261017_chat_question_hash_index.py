@@ -0,0 +1,31 @@
+"""Index chat history by question hash
+
+Revision ID: 007_chat_question_hash_index
+Revises: 006_jsonb_columns
+Create Date: 2026-10-17 00:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '007_chat_question_hash_index'
+down_revision: Union[str, None] = '006_jsonb_columns'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index(
+        'idx_chat_history_question_hash',
+        'chat_history',
+        ['question_hash', 'created_at'],
+        postgresql_where=sa.text('question_hash IS NOT NULL')
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('idx_chat_history_question_hash', table_name='chat_history')
@@ -0,0 +1,41 @@
+"""CHECK constraints on classification and score columns
+
+Revision ID: 015_check_constraints
+Revises: 014_daily_ohlc_view
+Create Date: 2026-10-17 00:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '015_check_constraints'
+down_revision: Union[str, None] = '014_daily_ohlc_view'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# (constraint name, table, condition)
+CHECK_CONSTRAINTS = [
+    ('ck_predictions_confidence', 'predictions', 'confidence_score BETWEEN 0 AND 1'),
+    (
+        'ck_market_tendency_tendency',
+        'market_tendencies',
+        "tendency IN ('bullish', 'bearish', 'volatile', 'stable', 'consolidating')"
+    ),
+    ('ck_market_tendency_confidence', 'market_tendencies', 'confidence BETWEEN 0 AND 1'),
+    ('ck_alert_log_shift_type', 'alert_logs', "shift_type IN ('increase', 'decrease')"),
+    ('ck_alert_log_change_percent', 'alert_logs', 'change_percent >= -100'),
+]
+
+
+def upgrade() -> None:
+    for name, table, condition in CHECK_CONSTRAINTS:
+        op.create_check_constraint(name, table, condition)
+
+
+def downgrade() -> None:
+    for name, table, _ in CHECK_CONSTRAINTS:
+        op.drop_constraint(name, table, type_='check')
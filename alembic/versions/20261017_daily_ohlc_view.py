@@ -0,0 +1,76 @@
+"""Daily OHLC rollup view of price history
+
+Revision ID: 014_daily_ohlc_view
+Revises: 013_bigint_ids
+Create Date: 2026-10-17 00:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '014_daily_ohlc_view'
+down_revision: Union[str, None] = '013_bigint_ids'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def _price_history_hypertable() -> bool:
+    """Check whether price_history is a TimescaleDB hypertable."""
+    bind = op.get_bind()
+    has_timescale = bind.execute(sa.text(
+        "SELECT 1 FROM pg_extension WHERE extname = 'timescaledb'"
+    )).scalar()
+    if not has_timescale:
+        return False
+    return bool(bind.execute(sa.text(
+        "SELECT 1 FROM timescaledb_information.hypertables "
+        "WHERE hypertable_name = 'price_history'"
+    )).scalar())
+
+
+def upgrade() -> None:
+    if not _price_history_hypertable():
+        op.execute(
+            "CREATE MATERIALIZED VIEW mv_daily_ohlc AS "
+            "SELECT crypto_id, date_trunc('day', \"timestamp\") AS day, "
+            "(array_agg(price_usd ORDER BY \"timestamp\"))[1] AS open, "
+            "max(price_usd) AS high, min(price_usd) AS low, "
+            "(array_agg(price_usd ORDER BY \"timestamp\" DESC))[1] AS close, "
+            "(array_agg(volume_24h ORDER BY \"timestamp\" DESC))[1] AS volume_24h "
+            "FROM price_history GROUP BY 1, 2"
+        )
+        # REFRESH ... CONCURRENTLY requires a unique index
+        op.create_index(
+            'idx_mv_daily_ohlc_crypto_day',
+            'mv_daily_ohlc',
+            ['crypto_id', 'day'],
+            unique=True
+        )
+        return
+    
+    # Continuous aggregates cannot be created or backfilled in a transaction
+    with op.get_context().autocommit_block():
+        op.execute(
+            "CREATE MATERIALIZED VIEW mv_daily_ohlc "
+            "WITH (timescaledb.continuous) AS "
+            "SELECT crypto_id, time_bucket(INTERVAL '1 day', \"timestamp\") AS day, "
+            "first(price_usd, \"timestamp\") AS open, "
+            "max(price_usd) AS high, min(price_usd) AS low, "
+            "last(price_usd, \"timestamp\") AS close, "
+            "last(volume_24h, \"timestamp\") AS volume_24h "
+            "FROM price_history GROUP BY 1, 2 WITH NO DATA"
+        )
+        op.execute(
+            "SELECT add_continuous_aggregate_policy('mv_daily_ohlc', "
+            "start_offset => INTERVAL '3 days', end_offset => INTERVAL '1 hour', "
+            "schedule_interval => INTERVAL '1 hour', if_not_exists => true)"
+        )
+        op.execute("CALL refresh_continuous_aggregate('mv_daily_ohlc', NULL, NULL)")
+
+
+def downgrade() -> None:
+    op.execute("DROP MATERIALIZED VIEW IF EXISTS mv_daily_ohlc")
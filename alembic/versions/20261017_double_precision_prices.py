@@ -0,0 +1,90 @@
+"""Store prices, volumes and changes as double precision
+
+Revision ID: 003_double_precision_prices
+Revises: 002_price_history_timescale
+Create Date: 2026-10-17 00:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '003_double_precision_prices'
+down_revision: Union[str, None] = '002_price_history_timescale'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# (table, column, original precision, original scale)
+PRICE_COLUMNS = [
+    ('price_history', 'price_usd', 20, 8),
+    ('price_history', 'volume_24h', 20, 2),
+    ('price_history', 'market_cap', 20, 2),
+    ('predictions', 'predicted_price', 20, 8),
+    ('alert_logs', 'change_percent', 10, 2),
+    ('alert_logs', 'previous_price', 20, 8),
+    ('alert_logs', 'current_price', 20, 8),
+]
+
+
+
+def _price_history_compressed() -> bool:
+    """Check whether price_history is a hypertable with compression enabled."""
+    bind = op.get_bind()
+    has_timescale = bind.execute(sa.text(
+        "SELECT 1 FROM pg_extension WHERE extname = 'timescaledb'"
+    )).scalar()
+    if not has_timescale:
+        return False
+    return bool(bind.execute(sa.text(
+        "SELECT compression_enabled FROM timescaledb_information.hypertables "
+        "WHERE hypertable_name = 'price_history'"
+    )).scalar())
+
+
+def _alter_columns(type_for, using_for) -> None:
+    """Change column types, lifting price_history compression meanwhile."""
+    compressed = _price_history_compressed()
+    if compressed:
+        # Column types cannot change while compression is enabled
+        op.execute("SELECT remove_compression_policy('price_history', if_exists => true)")
+        op.execute(
+            "SELECT decompress_chunk(c, if_compressed => true) "
+            "FROM show_chunks('price_history') c"
+        )
+        op.execute("ALTER TABLE price_history SET (timescaledb.compress = false)")
+    
+    for table, column, precision, scale in PRICE_COLUMNS:
+        op.alter_column(
+            table,
+            column,
+            type_=type_for(precision, scale),
+            postgresql_using=using_for(column, precision, scale)
+        )
+    
+    if compressed:
+        op.execute(
+            "ALTER TABLE price_history SET ("
+            "timescaledb.compress, "
+            "timescaledb.compress_segmentby = 'crypto_id', "
+            "timescaledb.compress_orderby = '\"timestamp\" DESC')"
+        )
+        op.execute(
+            "SELECT add_compression_policy('price_history', INTERVAL '30 days', if_not_exists => true)"
+        )
+
+
+def upgrade() -> None:
+    _alter_columns(
+        lambda precision, scale: sa.Float(),
+        lambda column, precision, scale: f'{column}::double precision'
+    )
+
+
+def downgrade() -> None:
+    _alter_columns(
+        lambda precision, scale: sa.Numeric(precision=precision, scale=scale),
+        lambda column, precision, scale: f'{column}::numeric({precision}, {scale})'
+    )
@@ -0,0 +1,28 @@
+"""Drop single-column chat history session index
+
+Revision ID: 019_drop_chat_history_session_id_index
+Revises: 018_alert_log_crypto_timestamp_desc
+Create Date: 2026-10-17 00:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '019_drop_chat_history_session_id_index'
+down_revision: Union[str, None] = '018_alert_log_crypto_timestamp_desc'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # idx_chat_history_session_created_desc_cov leads with session_id and
+    # serves every session lookup, including MIN/MAX(created_at)
+    op.drop_index('ix_chat_history_session_id', table_name='chat_history')
+
+
+def downgrade() -> None:
+    op.create_index('ix_chat_history_session_id', 'chat_history', ['session_id'])
@@ -0,0 +1,54 @@
+"""Store chat context and tendency metrics as JSONB
+
+Revision ID: 006_jsonb_columns
+Revises: 005_audit_pii_patterns_array
+Create Date: 2026-10-17 00:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = '006_jsonb_columns'
+down_revision: Union[str, None] = '005_audit_pii_patterns_array'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+JSON_COLUMNS = [
+    ('chat_history', 'context_used'),
+    ('market_tendencies', 'metrics'),
+]
+
+
+def upgrade() -> None:
+    for table, column in JSON_COLUMNS:
+        op.alter_column(
+            table,
+            column,
+            type_=postgresql.JSONB(),
+            postgresql_using=f'{column}::jsonb'
+        )
+    
+    # jsonb_path_ops only serves @> containment but is smaller than jsonb_ops
+    op.create_index(
+        'idx_chat_context_gin',
+        'chat_history',
+        ['context_used'],
+        postgresql_using='gin',
+        postgresql_ops={'context_used': 'jsonb_path_ops'}
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('idx_chat_context_gin', table_name='chat_history')
+    for table, column in JSON_COLUMNS:
+        op.alter_column(
+            table,
+            column,
+            type_=sa.JSON(),
+            postgresql_using=f'{column}::json'
+        )
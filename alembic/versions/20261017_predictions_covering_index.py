@@ -0,0 +1,33 @@
+"""Newest-first covering index for predictions per crypto
+
+Revision ID: 012_predictions_covering_index
+Revises: 011_chat_question_hash_bytea
+Create Date: 2026-10-17 00:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '012_predictions_covering_index'
+down_revision: Union[str, None] = '011_chat_question_hash_bytea'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.drop_index('idx_predictions_crypto_date', table_name='predictions')
+    op.create_index(
+        'idx_predictions_crypto_date_desc_cov',
+        'predictions',
+        ['crypto_id', sa.text('prediction_date DESC')],
+        postgresql_include=['predicted_price', 'confidence_score']
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('idx_predictions_crypto_date_desc_cov', table_name='predictions')
+    op.create_index('idx_predictions_crypto_date', 'predictions', ['crypto_id', 'prediction_date'])
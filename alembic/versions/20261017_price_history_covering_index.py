@@ -0,0 +1,37 @@
+"""Covering index for price history feature loads
+
+Revision ID: 004_price_history_covering_index
+Revises: 003_double_precision_prices
+Create Date: 2026-10-17 00:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '004_price_history_covering_index'
+down_revision: Union[str, None] = '003_double_precision_prices'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.drop_index('idx_price_history_crypto_timestamp_desc', table_name='price_history')
+    op.create_index(
+        'idx_price_history_crypto_ts_cov',
+        'price_history',
+        ['crypto_id', sa.text('timestamp DESC')],
+        postgresql_include=['price_usd', 'volume_24h']
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('idx_price_history_crypto_ts_cov', table_name='price_history')
+    op.create_index(
+        'idx_price_history_crypto_timestamp_desc',
+        'price_history',
+        ['crypto_id', sa.text('timestamp DESC')]
+    )
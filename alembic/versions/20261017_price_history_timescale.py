@@ -0,0 +1,65 @@
+"""Newest-first price history index and TimescaleDB hypertable
+
+Revision ID: 002_price_history_timescale
+Revises: 001_initial
+Create Date: 2026-10-17 00:00:00.000000
+
+"""
+import os
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '002_price_history_timescale'
+down_revision: Union[str, None] = '001_initial'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Replace the ascending composite index with a newest-first one
+    op.drop_index('idx_price_history_crypto_timestamp', table_name='price_history')
+    op.create_index(
+        'idx_price_history_crypto_timestamp_desc',
+        'price_history',
+        ['crypto_id', sa.text('timestamp DESC')]
+    )
+    
+    # Convert to a compressed hypertable only when opted in and installed
+    if os.getenv('TIMESCALE_ENABLED', 'false').lower() not in ('true', '1', 'yes', 'on'):
+        return
+    
+    bind = op.get_bind()
+    available = bind.execute(sa.text(
+        "SELECT 1 FROM pg_available_extensions WHERE name = 'timescaledb'"
+    )).scalar()
+    if not available:
+        return
+    
+    op.execute("CREATE EXTENSION IF NOT EXISTS timescaledb")
+    # Unique indexes on a hypertable must include the partitioning column, so
+    # the primary key is rebuilt as (id, timestamp) instead of being dropped
+    op.execute("ALTER TABLE price_history DROP CONSTRAINT price_history_pkey")
+    op.execute('ALTER TABLE price_history ADD PRIMARY KEY (id, "timestamp")')
+    op.execute(
+        "SELECT create_hypertable('price_history', 'timestamp', "
+        "chunk_time_interval => INTERVAL '7 days', migrate_data => true)"
+    )
+    op.execute(
+        "ALTER TABLE price_history SET ("
+        "timescaledb.compress, "
+        "timescaledb.compress_segmentby = 'crypto_id', "
+        "timescaledb.compress_orderby = '\"timestamp\" DESC')"
+    )
+    op.execute(
+        "SELECT add_compression_policy('price_history', INTERVAL '30 days', if_not_exists => true)"
+    )
+
+
+def downgrade() -> None:
+    # A hypertable cannot be converted back in place; only the index is restored
+    op.drop_index('idx_price_history_crypto_timestamp_desc', table_name='price_history')
+    op.create_index('idx_price_history_crypto_timestamp', 'price_history', ['crypto_id', 'timestamp'])
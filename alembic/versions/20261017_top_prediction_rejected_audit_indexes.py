@@ -0,0 +1,40 @@
+"""Partial indexes for top predictions and rejected queries
+
+Revision ID: 016_top_prediction_rejected_audit_indexes
+Revises: 015_check_constraints
+Create Date: 2026-10-17 00:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '016_top_prediction_rejected_audit_indexes'
+down_revision: Union[str, None] = '015_check_constraints'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index(
+        'idx_predictions_date_confidence',
+        'predictions',
+        ['prediction_date', sa.text('confidence_score DESC')],
+        postgresql_where=sa.text('confidence_score IS NOT NULL')
+    )
+    op.create_index(
+        'idx_audit_log_rejected_recent',
+        'query_audit_log',
+        [sa.text('created_at DESC')],
+        postgresql_where=sa.text('rejected')
+    )
+    op.drop_index('idx_audit_log_rejected_created', table_name='query_audit_log')
+
+
+def downgrade() -> None:
+    op.create_index('idx_audit_log_rejected_created', 'query_audit_log', ['rejected', 'created_at'])
+    op.drop_index('idx_audit_log_rejected_recent', table_name='query_audit_log')
+    op.drop_index('idx_predictions_date_confidence', table_name='predictions')
@@ -18,8 +18,10 @@ setup(
         "Flask>=3.0.0",
         "SQLAlchemy>=2.0.23",
         "psycopg2-binary>=2.9.9",
+        "psycopg[binary]>=3.1.18",
         "python-dotenv>=1.0.0",
         "requests>=2.31.0",
+        "orjson>=3.9.10",
         "numpy>=1.26.2",
         "pandas>=2.1.4",
         "scikit-learn>=1.3.2",
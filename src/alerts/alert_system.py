@@ -5,7 +5,7 @@ Coordinates market shift detection and SMS notification sending.
 
 from datetime import datetime
 from decimal import Decimal
-from typing import List, Optional
+from typing import Any, Dict, List, Optional
 import logging
 
 from sqlalchemy.orm import Session
@@ -41,6 +41,8 @@ class AlertSystem:
         self.db_session = db_session
         self.config = config
         self.alert_log_repo = AlertLogRepository(db_session)
+        # Alert log records of the current check, written together at its end
+        self._pending_alert_logs: List[Dict[str, Any]] = []
         
         # Initialize market monitor
         self.market_monitor = MarketMonitor(
@@ -145,7 +147,8 @@ class AlertSystem:
             for shift in shifts:
                 self._send_alert(shift)
             
-            # Commit all changes
+            # Write the alert logs in one batch and commit all changes
+            self.alert_log_repo.bulk_create(self._pending_alert_logs)
             self.db_session.commit()
             
             return shifts
@@ -154,6 +157,8 @@ class AlertSystem:
             logger.error(f"Error during market shift check: {e}", exc_info=True)
             self.db_session.rollback()
             return []
+        finally:
+            self._pending_alert_logs = []
     
     def _send_alert(self, shift: MarketShift) -> bool:
         """
@@ -234,32 +239,28 @@ class AlertSystem:
         result: SMSResult
     ) -> None:
         """
-        Log alert to database.
+        Queue an alert log record, written when the current check completes.
         
         Args:
             shift: MarketShift object
             message: Alert message that was sent
             result: SMSResult from send operation
         """
-        try:
-            self.alert_log_repo.create(
-                crypto_id=shift.crypto_id,
-                shift_type=shift.shift_type,
-                change_percent=Decimal(str(shift.change_percent)),
-                previous_price=shift.previous_price,
-                current_price=shift.current_price,
-                alert_message=message,
-                recipient_number=self.config.sms_phone_number or "N/A",
-                sms_provider=self.config.sms_provider,
-                timestamp=shift.timestamp,
-                sms_message_id=result.message_id,
-                success=result.success,
-                error_message=result.error
-            )
-            logger.debug(f"Alert logged for {shift.crypto_symbol}")
-            
-        except Exception as e:
-            logger.error(f"Failed to log alert: {e}", exc_info=True)
+        self._pending_alert_logs.append({
+            'crypto_id': shift.crypto_id,
+            'shift_type': shift.shift_type,
+            'change_percent': Decimal(str(shift.change_percent)),
+            'previous_price': shift.previous_price,
+            'current_price': shift.current_price,
+            'alert_message': message,
+            'recipient_number': self.config.sms_phone_number or "N/A",
+            'sms_provider': self.config.sms_provider,
+            'timestamp': shift.timestamp,
+            'sms_message_id': result.message_id,
+            'success': result.success,
+            'error_message': result.error
+        })
+        logger.debug(f"Alert logged for {shift.crypto_symbol}")
     
     def get_alert_statistics(self) -> dict:
         """
@@ -134,9 +134,7 @@ class MarketMonitor:
         """
         try:
             # Get cryptocurrency info
-            crypto = self.db_session.query(Cryptocurrency).filter(
-                Cryptocurrency.id == crypto_id
-            ).first()
+            crypto = self.db_session.get(Cryptocurrency, crypto_id)
             
             if not crypto:
                 logger.warning(f"Cryptocurrency with ID {crypto_id} not found")
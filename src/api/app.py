@@ -35,6 +35,11 @@ def create_app(config: Config) -> Flask:
         static_folder=os.path.join(app_dir, 'static')
     )
     
+    # Serialize JSON responses with orjson when available
+    from src.api.json_provider import OrjsonProvider, orjson
+    if orjson is not None:
+        app.json = OrjsonProvider(app)
+    
     # Configure Flask
     app.config['SECRET_KEY'] = config.secret_key
     app.config['JSON_SORT_KEYS'] = False
@@ -77,6 +82,14 @@ def register_middleware(app: Flask, config: Config) -> None:
     from src.api.middleware.audit_middleware import AuditMiddleware
     audit_middleware = AuditMiddleware(app)
     
+    # Release the request's shared database session
+    from src.data.database import remove_session
+    
+    @app.teardown_appcontext
+    def shutdown_session(exception=None):
+        """Remove the scoped database session at the end of the request."""
+        remove_session()
+    
     # Request logging middleware
     @app.before_request
     def log_request():
@@ -96,6 +109,21 @@ def register_middleware(app: Flask, config: Config) -> None:
         )
         return response
     
+    # Conditional GET: tag JSON responses so unchanged payloads return
+    # 304 Not Modified with an empty body
+    @app.after_request
+    def add_conditional_etag(response):
+        """Add ETag and honour If-None-Match on successful API reads."""
+        if (
+            request.method == 'GET'
+            and request.path.startswith('/api/')
+            and response.status_code == 200
+            and response.mimetype == 'application/json'
+        ):
+            response.add_etag()
+            response = response.make_conditional(request)
+        return response
+    
     # API key authentication middleware (if required)
     if config.api_key_required:
         from src.api.middleware.auth import require_api_key
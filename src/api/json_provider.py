@@ -0,0 +1,89 @@
+"""
+orjson-backed JSON provider for the Flask API.
+Serializes responses in C, producing the same JSON as Flask's default
+provider for the types the API returns.
+"""
+
+import dataclasses
+import decimal
+import uuid
+from datetime import date
+from typing import Any
+
+from flask.json.provider import DefaultJSONProvider
+from werkzeug.http import http_date
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def _default(o: Any) -> Any:
+    """Convert types orjson does not serialize the way Flask does."""
+    if isinstance(o, date):
+        return http_date(o)
+    if isinstance(o, (decimal.Decimal, uuid.UUID)):
+        return str(o)
+    if dataclasses.is_dataclass(o):
+        return dataclasses.asdict(o)
+    if hasattr(o, '__html__'):
+        return str(o.__html__())
+    raise TypeError(f"Object of type {type(o).__name__} is not JSON serializable")
+
+
+class OrjsonProvider(DefaultJSONProvider):
+    """
+    JSON provider serializing with orjson.
+    
+    Dates keep Flask's HTTP date format and decimals are still written as
+    strings; key sorting follows the provider's sort_keys setting. Requires
+    orjson to be installed.
+    """
+    
+    def _options(self, indent: bool = False) -> int:
+        """Build orjson options for this provider's settings."""
+        options = orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
+        if self.sort_keys:
+            options |= orjson.OPT_SORT_KEYS
+        if indent:
+            options |= orjson.OPT_INDENT_2
+        return options
+    
+    def dumps(self, obj: Any, **kwargs: Any) -> str:
+        """
+        Serialize data as JSON.
+        
+        Args:
+            obj: Data to serialize
+            **kwargs: indent is honored; other json.dumps arguments are ignored
+        
+        Returns:
+            JSON string
+        """
+        return orjson.dumps(obj, default=_default, option=self._options(bool(kwargs.get('indent')))).decode()
+    
+    def loads(self, s: str | bytes, **kwargs: Any) -> Any:
+        """
+        Deserialize JSON data.
+        
+        Args:
+            s: JSON text
+            **kwargs: Ignored
+        
+        Returns:
+            Deserialized data
+        """
+        return orjson.loads(s)
+    
+    def response(self, *args: Any, **kwargs: Any):
+        """
+        Serialize data as a JSON response without an intermediate str.
+        
+        Returns:
+            Response with the application/json mimetype
+        """
+        obj = self._prepare_response_obj(args, kwargs)
+        indent = self.compact is False or (self.compact is None and self._app.debug)
+        body = orjson.dumps(obj, default=_default, option=self._options(indent))
+        return self._app.response_class(body + b"\n", mimetype=self.mimetype)
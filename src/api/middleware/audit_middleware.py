@@ -10,8 +10,13 @@ from typing import Optional
 from flask import request, g, current_app
 from sqlalchemy.orm import Session
 
-from src.data.database import get_session
-from src.utils.audit_logger import AuditLogger, AuditEventType, AuditSeverity, get_request_info
+from src.utils.audit_logger import (
+    AuditLogger,
+    AuditEventType,
+    AuditSeverity,
+    get_audit_write_queue,
+    get_request_info,
+)
 
 logger = logging.getLogger(__name__)
 
@@ -31,20 +36,17 @@ class AuditMiddleware:
         """Initialize middleware with Flask app."""
         app.before_request(self.before_request)
         app.after_request(self.after_request)
-        app.teardown_appcontext(self.teardown_request)
     
     def before_request(self):
         """Called before each request."""
         # Store request start time
         g.request_start_time = time.time()
         
-        # Initialize audit logger session
+        # Audit events are written in the background, off the request path
         try:
-            g.audit_session = get_session()
-            g.audit_logger = AuditLogger(g.audit_session)
+            g.audit_logger = AuditLogger(write_queue=get_audit_write_queue())
         except Exception as e:
             logger.error(f"Failed to initialize audit logger: {e}", exc_info=True)
-            g.audit_session = None
             g.audit_logger = None
     
     def after_request(self, response):
@@ -81,14 +83,6 @@ class AuditMiddleware:
             logger.error(f"Error in audit middleware after_request: {e}", exc_info=True)
         
         return response
-    
-    def teardown_request(self, exception=None):
-        """Called when request context is torn down."""
-        if hasattr(g, 'audit_session') and g.audit_session:
-            try:
-                g.audit_session.close()
-            except Exception as e:
-                logger.error(f"Error closing audit session: {e}", exc_info=True)
 
 
 def audit_endpoint(event_type: AuditEventType = None, severity: AuditSeverity = AuditSeverity.LOW):
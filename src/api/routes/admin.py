@@ -293,9 +293,9 @@ def get_system_info():
             latest_price = None
             if total_cryptos > 0:
                 first_crypto = crypto_repo.get_all()[0]
-                latest_prices = price_repo.get_latest_by_crypto(first_crypto.id, limit=1)
-                if latest_prices:
-                    latest_price = latest_prices[0].timestamp
+                latest = price_repo.get_latest_price(first_crypto.id)
+                if latest:
+                    latest_price = latest.timestamp
             
             # Get prediction count
             total_predictions = prediction_repo.count_all()
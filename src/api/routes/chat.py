@@ -182,62 +182,26 @@ def process_chat_query():
                 user_agent=user_agent
             )
             
-            # Get chat history (last 3 Q&A pairs)
             history_manager = ChatHistoryManager(session)
             
-            # Store chat interaction if successful
-            if chat_response.success and not chat_response.rejected:
-                history_manager.store_chat(
-                    session_id=session_id,
-                    question=question,
-                    answer=chat_response.answer,
-                    question_hash=genai_engine.generate_question_hash(question),
-                    topic_valid=True,
-                    pii_detected=False,
-                    context_used=chat_response.context_used,
-                    openai_tokens_input=chat_response.tokens_input,
-                    openai_tokens_output=chat_response.tokens_output,
-                    openai_cost_usd=chat_response.cost_usd,
-                    response_time_ms=chat_response.response_time_ms
-                )
-                
-                # Store audit log
-                history_manager.store_audit_log(
-                    session_id=session_id,
-                    question_sanitized=question,
-                    pii_patterns_detected=[],
-                    topic_validation_result='valid',
-                    ip_address=ip_address,
-                    user_agent=user_agent,
-                    rejected=False
-                )
-            else:
-                # Store audit log for rejected queries
-                history_manager.store_audit_log(
-                    session_id=session_id,
-                    question_sanitized=question,
-                    pii_patterns_detected=chat_response.pii_patterns,
-                    topic_validation_result='invalid' if chat_response.rejection_reason else 'valid',
-                    ip_address=ip_address,
-                    user_agent=user_agent,
-                    rejected=True,
-                    rejection_reason=chat_response.rejection_reason
-                )
+            # Get chat history (last 3 Q&A pairs, already formatted)
+            formatted_history = history_manager.get_recent_history(session_id, limit=3)
             
-            session.commit()
-            
-            # Get chat history
-            history = history_manager.get_recent_history(session_id, limit=3)
+            # Queue chat interaction and audit log; written in the background
+            chat_record = history_manager.queue_chat_message(
+                chat_response,
+                ip_address=ip_address,
+                user_agent=user_agent
+            )
             
-            # Format history for response
-            formatted_history = [
-                {
-                    'question': h.question,
-                    'answer': h.answer,
-                    'timestamp': h.created_at.isoformat()
-                }
-                for h in history
-            ]
+            # The queued exchange is not in the database yet; add it here
+            if chat_record is not None:
+                formatted_history.append({
+                    'question': chat_record['question'],
+                    'answer': chat_record['answer'],
+                    'timestamp': datetime.now().isoformat()
+                })
+                formatted_history = formatted_history[-3:]
             
             # Format response
             response = format_chat_response(chat_response, formatted_history)
@@ -14,6 +14,15 @@ logger = logging.getLogger(__name__)
 
 market_bp = Blueprint('market', __name__)
 
+# Sections served by /bundle
+BUNDLE_SECTIONS = ('tendency', 'history', 'overview')
+
+INSUFFICIENT_DATA_ERROR = {
+    'code': 'INSUFFICIENT_DATA',
+    'message': 'Unable to determine market tendency',
+    'details': 'Insufficient price data available'
+}
+
 
 def format_tendency_response(result: TendencyResult) -> dict:
     """
@@ -41,6 +50,88 @@ def format_tendency_response(result: TendencyResult) -> dict:
     }
 
 
+def build_tendency_history_response(
+    classifier: MarketTendencyClassifier,
+    hours: int
+) -> dict:
+    """
+    Build tendency history response.
+    
+    Args:
+        classifier: MarketTendencyClassifier bound to a session
+        hours: Number of hours to look back
+    
+    Returns:
+        Formatted history dictionary
+    """
+    history = classifier.get_tendency_history(hours=hours)
+    
+    if not history:
+        return {
+            'tendencies': [],
+            'count': 0,
+            'hours': hours
+        }
+    
+    return {
+        'tendencies': [format_tendency_response(t) for t in history],
+        'count': len(history),
+        'hours': hours,
+        'start_time': history[0].timestamp.isoformat(),
+        'end_time': history[-1].timestamp.isoformat()
+    }
+
+
+def build_overview_response(
+    classifier: MarketTendencyClassifier,
+    tendency_result: TendencyResult
+) -> dict:
+    """
+    Build market overview response around a tendency result.
+    
+    Args:
+        classifier: MarketTendencyClassifier bound to a session
+        tendency_result: Current tendency result
+    
+    Returns:
+        Formatted overview dictionary
+    """
+    # Get price changes for additional context
+    price_changes = classifier.get_price_changes()
+    
+    # Calculate additional metrics
+    top_gainers = sorted(
+        price_changes,
+        key=lambda x: x['price_change_percent'],
+        reverse=True
+    )[:5]
+    
+    top_losers = sorted(
+        price_changes,
+        key=lambda x: x['price_change_percent']
+    )[:5]
+    
+    return {
+        'tendency': format_tendency_response(tendency_result),
+        'top_gainers': [
+            {
+                'symbol': g['symbol'],
+                'change_percent': round(g['price_change_percent'], 2)
+            }
+            for g in top_gainers
+        ],
+        'top_losers': [
+            {
+                'symbol': l['symbol'],
+                'change_percent': round(l['price_change_percent'], 2)
+            }
+            for l in top_losers
+        ],
+        'total_cryptos_analyzed': len(price_changes),
+        'timestamp': datetime.now().isoformat()
+    }
+
+
 @market_bp.route('/tendency', methods=['GET'])
 def get_market_tendency():
     """
@@ -142,22 +233,7 @@ def get_tendency_history():
         with session_scope() as session:
             classifier = MarketTendencyClassifier(session=session)
             
-            history = classifier.get_tendency_history(hours=hours)
-            
-            if not history:
-                return jsonify({
-                    'tendencies': [],
-                    'count': 0,
-                    'hours': hours
-                }), 200
-            
-            response = {
-                'tendencies': [format_tendency_response(t) for t in history],
-                'count': len(history),
-                'hours': hours,
-                'start_time': history[0].timestamp.isoformat() if history else None,
-                'end_time': history[-1].timestamp.isoformat() if history else None
-            }
+            response = build_tendency_history_response(classifier, hours)
             
             return jsonify(response), 200
             
@@ -200,40 +276,7 @@ def get_market_overview():
                     }
                 }), 503
             
-            # Get price changes for additional context
-            price_changes = classifier.get_price_changes()
-            
-            # Calculate additional metrics
-            top_gainers = sorted(
-                price_changes,
-                key=lambda x: x['price_change_percent'],
-                reverse=True
-            )[:5]
-            
-            top_losers = sorted(
-                price_changes,
-                key=lambda x: x['price_change_percent']
-            )[:5]
-            
-            response = {
-                'tendency': format_tendency_response(tendency_result),
-                'top_gainers': [
-                    {
-                        'symbol': g['symbol'],
-                        'change_percent': round(g['price_change_percent'], 2)
-                    }
-                    for g in top_gainers
-                ],
-                'top_losers': [
-                    {
-                        'symbol': l['symbol'],
-                        'change_percent': round(l['price_change_percent'], 2)
-                    }
-                    for l in top_losers
-                ],
-                'total_cryptos_analyzed': len(price_changes),
-                'timestamp': datetime.now().isoformat()
-            }
+            response = build_overview_response(classifier, tendency_result)
             
             return jsonify(response), 200
             
@@ -246,3 +289,96 @@ def get_market_overview():
                 'details': str(e)
             }
         }), 500
+
+
+@market_bp.route('/bundle', methods=['GET'])
+def get_market_bundle():
+    """
+    Get several market sections in a single round-trip.
+    
+    Sections share one database session and one tendency classification,
+    so a dashboard page needs one request instead of one per endpoint.
+    
+    Query Parameters:
+        - include: Comma-separated sections (tendency, history, overview; default: all)
+        - use_cache: Whether to use cached tendency (default: true)
+        - max_age_hours: Maximum age of cached tendency in hours (default: 1)
+        - lookback_hours: Hours to look back for analysis (default: 24)
+        - hours: Number of hours of tendency history (default: 168, max: 720)
+    
+    Returns:
+        JSON response keyed by section name
+    """
+    try:
+        include_param = request.args.get('include', ','.join(BUNDLE_SECTIONS))
+        include = {s.strip() for s in include_param.split(',') if s.strip()}
+        
+        unknown = include - set(BUNDLE_SECTIONS)
+        if unknown or not include:
+            return jsonify({
+                'error': {
+                    'code': 'INVALID_INCLUDE',
+                    'message': 'Invalid bundle sections requested',
+                    'details': f"Supported sections: {', '.join(BUNDLE_SECTIONS)}"
+                }
+            }), 400
+        
+        use_cache = request.args.get('use_cache', 'true').lower() == 'true'
+        max_age_hours = request.args.get('max_age_hours', 1, type=int)
+        lookback_hours = request.args.get('lookback_hours', 24, type=int)
+        hours = min(request.args.get('hours', 168, type=int), 720)
+        
+        logger.info(f"Fetching market bundle (include={sorted(include)})")
+        
+        with session_scope() as session:
+            classifier = MarketTendencyClassifier(
+                session=session,
+                lookback_hours=lookback_hours
+            )
+            
+            response = {}
+            
+            if include & {'tendency', 'overview'}:
+                result = None
+                cached = False
+                
+                if use_cache:
+                    result = classifier.get_cached_or_analyze(max_age_hours=max_age_hours)
+                    if result:
+                        age_seconds = (datetime.now() - result.timestamp).total_seconds()
+                        cached = age_seconds < (max_age_hours * 3600)
+                
+                if not result:
+                    result = classifier.analyze_and_store()
+                
+                has_data = result is not None and result.confidence > 0.0
+                
+                if 'tendency' in include:
+                    if has_data:
+                        response['tendency'] = format_tendency_response(result)
+                        response['tendency']['cached'] = cached
+                    else:
+                        response['tendency'] = {'error': INSUFFICIENT_DATA_ERROR}
+                
+                if 'overview' in include:
+                    if has_data:
+                        response['overview'] = build_overview_response(classifier, result)
+                    else:
+                        response['overview'] = {'error': INSUFFICIENT_DATA_ERROR}
+            
+            if 'history' in include:
+                response['history'] = build_tendency_history_response(classifier, hours)
+            
+            response['timestamp'] = datetime.now().isoformat()
+            
+            return jsonify(response), 200
+            
+    except Exception as e:
+        logger.error(f"Error fetching market bundle: {e}", exc_info=True)
+        return jsonify({
+            'error': {
+                'code': 'BUNDLE_ERROR',
+                'message': 'Failed to fetch market bundle',
+                'details': str(e)
+            }
+        }), 500
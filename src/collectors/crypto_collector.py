@@ -14,7 +14,7 @@ from sqlalchemy.orm import Session
 from src.collectors.binance_client import BinanceClient, BinanceAPIError, PriceData
 from src.collectors.gap_detector import DataGapDetector, DataGap
 from src.data.repositories import CryptoRepository, PriceHistoryRepository
-from src.data.database import session_scope
+from src.data.database import session_scope, vacuum_analyze, refresh_daily_ohlc
 
 logger = logging.getLogger(__name__)
 
@@ -119,6 +119,21 @@ class CryptoCollector:
             logger.error(f"Failed to get tracked cryptocurrencies: {e}")
             return []
     
+    def _get_crypto_ids(self, symbols: List[str]) -> Dict[str, int]:
+        """
+        Resolve symbols to cryptocurrency IDs in one round trip, creating missing ones.
+        
+        Args:
+            symbols: Cryptocurrency symbols.
+        
+        Returns:
+            Dictionary mapping upper-case symbols to cryptocurrency IDs.
+        """
+        with session_scope() as session:
+            return CryptoRepository(session).bulk_get_or_create(
+                (symbol, symbol, None) for symbol in symbols
+            )
+    
     def collect_backward(
         self,
         start_date: datetime,
@@ -157,6 +172,7 @@ class CryptoCollector:
         )
         
         results = []
+        crypto_ids = self._get_crypto_ids(crypto_symbols)
         
         for symbol in crypto_symbols:
             try:
@@ -164,7 +180,8 @@ class CryptoCollector:
                     symbol=symbol,
                     start_time=start_date,
                     end_time=end_date,
-                    direction="backward"
+                    direction="backward",
+                    crypto_id=crypto_ids[symbol.upper()]
                 )
                 results.append(result)
                 
@@ -193,6 +210,11 @@ class CryptoCollector:
         self.collection_results.extend(results)
         self._log_collection_summary(results, "backward")
         
+        # Backfills write many rows; refresh the visibility map and statistics
+        if any(r.records_collected for r in results):
+            vacuum_analyze('price_history')
+            refresh_daily_ohlc()
+        
         return results
     
     def collect_forward(
@@ -230,67 +252,71 @@ class CryptoCollector:
         )
         
         results = []
+        crypto_ids = self._get_crypto_ids(crypto_symbols)
         
         with session_scope() as session:
-            crypto_repo = CryptoRepository(session)
             price_repo = PriceHistoryRepository(session)
-            
-            for symbol in crypto_symbols:
-                try:
-                    # Get or create crypto record
-                    crypto = crypto_repo.get_or_create(symbol, symbol)
-                    
-                    # Get latest timestamp
-                    latest_timestamp = price_repo.get_latest_timestamp(crypto.id)
-                    
-                    if latest_timestamp is None:
-                        logger.info(
-                            f"{symbol}: No existing data, skipping forward collection"
-                        )
-                        continue
-                    
-                    # Check if update is needed
-                    time_diff = end_date - latest_timestamp
-                    if time_diff < timedelta(hours=1):
-                        logger.debug(
-                            f"{symbol}: Data is up to date (latest: {latest_timestamp})"
-                        )
-                        continue
-                    
-                    # Collect from latest timestamp to end_date
-                    result = self._collect_for_crypto(
-                        symbol=symbol,
-                        start_time=latest_timestamp,
-                        end_time=end_date,
-                        direction="forward"
+            latest_timestamps = price_repo.get_latest_timestamps(list(crypto_ids.values()))
+        
+        for symbol in crypto_symbols:
+            try:
+                crypto_id = crypto_ids[symbol.upper()]
+                
+                # Get latest timestamp
+                latest_timestamp = latest_timestamps.get(crypto_id)
+                
+                if latest_timestamp is None:
+                    logger.info(
+                        f"{symbol}: No existing data, skipping forward collection"
+                    )
+                    continue
+                
+                # Check if update is needed
+                time_diff = end_date - latest_timestamp
+                if time_diff < timedelta(hours=1):
+                    logger.debug(
+                        f"{symbol}: Data is up to date (latest: {latest_timestamp})"
+                    )
+                    continue
+                
+                # Collect from latest timestamp to end_date
+                result = self._collect_for_crypto(
+                    symbol=symbol,
+                    start_time=latest_timestamp,
+                    end_time=end_date,
+                    direction="forward",
+                    crypto_id=crypto_id
+                )
+                results.append(result)
+                
+                if result.success:
+                    logger.info(
+                        f"✓ {symbol}: Collected {result.records_collected} records "
+                        f"in {result.duration_seconds:.1f}s"
+                    )
+                else:
+                    logger.warning(
+                        f"✗ {symbol}: Collection failed - {result.error_message}"
                     )
-                    results.append(result)
                     
-                    if result.success:
-                        logger.info(
-                            f"✓ {symbol}: Collected {result.records_collected} records "
-                            f"in {result.duration_seconds:.1f}s"
-                        )
-                    else:
-                        logger.warning(
-                            f"✗ {symbol}: Collection failed - {result.error_message}"
-                        )
-                        
-                except Exception as e:
-                    logger.error(f"Unexpected error collecting {symbol}: {e}")
-                    results.append(CollectionResult(
-                        crypto_symbol=symbol,
-                        success=False,
-                        records_collected=0,
-                        time_range_start=latest_timestamp if latest_timestamp else end_date,
-                        time_range_end=end_date,
-                        duration_seconds=0,
-                        error_message=str(e)
-                    ))
+            except Exception as e:
+                logger.error(f"Unexpected error collecting {symbol}: {e}")
+                results.append(CollectionResult(
+                    crypto_symbol=symbol,
+                    success=False,
+                    records_collected=0,
+                    time_range_start=latest_timestamp if latest_timestamp else end_date,
+                    time_range_end=end_date,
+                    duration_seconds=0,
+                    error_message=str(e)
+                ))
         
         self.collection_results.extend(results)
         self._log_collection_summary(results, "forward")
         
+        if any(r.records_collected for r in results):
+            refresh_daily_ohlc()
+        
         return results
     
     def _get_missing_ranges(
@@ -313,28 +339,24 @@ class CryptoCollector:
         with session_scope() as session:
             price_repo = PriceHistoryRepository(session)
             
-            # Get all existing timestamps
-            existing_timestamps = price_repo.get_timestamps_in_range(
-                crypto_id, start_time, end_time
-            )
-            
-            if not existing_timestamps:
-                # No data exists, return full range
-                return [(start_time, end_time)]
-            
-            # Find gaps
+            # Find gaps, streaming existing timestamps in chronological order
             missing_ranges = []
             current_time = start_time
+            has_data = False
             
-            # Sort timestamps
-            existing_timestamps.sort()
-            
-            for timestamp in existing_timestamps:
+            for timestamp in price_repo.iter_timestamps_in_range(
+                crypto_id, start_time, end_time
+            ):
+                has_data = True
                 # Check if there's a gap
                 if (timestamp - current_time) > timedelta(hours=1):
                     missing_ranges.append((current_time, timestamp))
                 current_time = timestamp + timedelta(hours=1)
             
+            if not has_data:
+                # No data exists, return full range
+                return [(start_time, end_time)]
+            
             # Check if there's a gap at the end
             if (end_time - current_time) > timedelta(hours=1):
                 missing_ranges.append((current_time, end_time))
@@ -346,7 +368,8 @@ class CryptoCollector:
         symbol: str,
         start_time: datetime,
         end_time: datetime,
-        direction: str = "backward"
+        direction: str = "backward",
+        crypto_id: Optional[int] = None
     ) -> CollectionResult:
         """
         Collect data for a single cryptocurrency with smart resume.
@@ -356,6 +379,7 @@ class CryptoCollector:
             start_time: Start of time range.
             end_time: End of time range.
             direction: Collection direction ('backward' or 'forward').
+            crypto_id: Cryptocurrency ID, resolved from the symbol if omitted.
         
         Returns:
             CollectionResult instance.
@@ -364,10 +388,8 @@ class CryptoCollector:
         
         try:
             # Step 1: Check what data already exists
-            with session_scope() as session:
-                crypto_repo = CryptoRepository(session)
-                crypto = crypto_repo.get_or_create(symbol, symbol)
-                crypto_id = crypto.id
+            if crypto_id is None:
+                crypto_id = self._get_crypto_ids([symbol])[symbol.upper()]
             
             # Get missing ranges
             missing_ranges = self._get_missing_ranges(crypto_id, start_time, end_time)
@@ -406,7 +428,9 @@ class CryptoCollector:
                         
                         if price_data_list:
                             # Persist to database immediately
-                            records_saved = self._persist_price_data(symbol, price_data_list)
+                            records_saved = self._persist_price_data(
+                                symbol, price_data_list, crypto_id
+                            )
                             total_records += records_saved
                             success = True
                             logger.debug(
@@ -493,7 +517,8 @@ class CryptoCollector:
     def _persist_price_data(
         self,
         symbol: str,
-        price_data_list: List[PriceData]
+        price_data_list: List[PriceData],
+        crypto_id: int
     ) -> int:
         """
         Persist price data to database.
@@ -501,22 +526,19 @@ class CryptoCollector:
         Args:
             symbol: Cryptocurrency symbol.
             price_data_list: List of PriceData instances.
+            crypto_id: Cryptocurrency ID.
         
         Returns:
             Number of records saved.
         """
         with session_scope() as session:
-            crypto_repo = CryptoRepository(session)
             price_repo = PriceHistoryRepository(session)
             
-            # Get or create cryptocurrency record
-            crypto = crypto_repo.get_or_create(symbol, symbol)
-            
             # Prepare price records for bulk insert
             price_records = []
             for price_data in price_data_list:
                 price_records.append({
-                    'crypto_id': crypto.id,
+                    'crypto_id': crypto_id,
                     'timestamp': price_data.timestamp,
                     'price_usd': price_data.price_usd,
                     'volume_24h': price_data.volume_24h,
@@ -589,7 +611,8 @@ class CryptoCollector:
                             symbol=symbol,
                             start_time=gap.start_time,
                             end_time=gap.end_time,
-                            direction="gap_fill"
+                            direction="gap_fill",
+                            crypto_id=crypto.id
                         )
                         results.append(result)
                         
@@ -599,6 +622,9 @@ class CryptoCollector:
         self.collection_results.extend(results)
         self._log_collection_summary(results, "gap_fill")
         
+        if any(r.records_collected for r in results):
+            refresh_daily_ohlc()
+        
         return results
     
     def get_collection_status(self) -> Dict[str, Any]:
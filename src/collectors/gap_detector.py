@@ -211,8 +211,7 @@ class DataGapDetector:
         all_gaps.extend(backward_gaps)
         
         # Check for forward gaps (only if we have some data)
-        latest_timestamp = self.price_repo.get_latest_timestamp(crypto_id)
-        if latest_timestamp is not None:
+        if self.price_repo.exists_for_crypto(crypto_id):
             forward_gaps = self.find_gaps_forward(
                 crypto_id,
                 crypto_symbol,
@@ -246,14 +245,15 @@ class DataGapDetector:
         Returns:
             List of DataGap instances for internal gaps.
         """
-        # Get all price records in range
-        price_records = self.price_repo.get_by_crypto_and_time_range(
+        # Stream timestamps in range rather than loading full records
+        timestamps = self.price_repo.iter_timestamps_in_range(
             crypto_id,
             start_date,
             end_date
         )
+        current_time = next(timestamps, None)
         
-        if not price_records:
+        if current_time is None:
             logger.debug(f"No data found for {crypto_symbol} in specified range")
             return []
         
@@ -261,9 +261,7 @@ class DataGapDetector:
         expected_interval = timedelta(hours=expected_interval_hours)
         
         # Check for gaps between consecutive records
-        for i in range(len(price_records) - 1):
-            current_time = price_records[i].timestamp
-            next_time = price_records[i + 1].timestamp
+        for next_time in timestamps:
             time_diff = next_time - current_time
             
             # If gap is larger than expected interval (with small tolerance)
@@ -281,6 +279,7 @@ class DataGapDetector:
                     f"Internal gap found for {crypto_symbol} "
                     f"from {current_time} to {next_time} ({hours_missing} hours)"
                 )
+            current_time = next_time
         
         return gaps
     
@@ -301,7 +300,8 @@ class DataGapDetector:
         """
         earliest = self.price_repo.get_earliest_timestamp(crypto_id)
         latest = self.price_repo.get_latest_timestamp(crypto_id)
-        count = self.price_repo.count_by_crypto(crypto_id)
+        # Skip the count for cryptocurrencies without data
+        count = self.price_repo.count_by_crypto(crypto_id) if latest else 0
         
         summary = {
             "crypto_id": crypto_id,
@@ -309,7 +309,7 @@ class DataGapDetector:
             "earliest_timestamp": earliest,
             "latest_timestamp": latest,
             "total_records": count,
-            "has_data": count > 0
+            "has_data": latest is not None
         }
         
         if earliest and latest:
@@ -9,7 +9,7 @@ import pandas as pd
 from datetime import datetime, timedelta
 import logging
 
-from src.dashboard.utils import APIClient
+from src.dashboard.utils import get_api_client
 
 logger = logging.getLogger(__name__)
 
@@ -61,7 +61,7 @@ def show():
     st.warning("⚠️ Admin Access Required - This page controls data collection operations")
     
     # Initialize API client
-    api_client = APIClient(base_url="http://localhost:5000")
+    api_client = get_api_client("http://localhost:5000")
     
     # Auto-refresh for status monitoring
     col1, col2 = st.columns([1, 5])
@@ -9,9 +9,9 @@ from datetime import datetime
 import logging
 
 from src.dashboard.utils import (
-    APIClient,
     format_currency,
     format_percentage,
+    get_api_client,
     get_tendency_emoji,
     get_tendency_color
 )
@@ -24,7 +24,7 @@ def show():
     st.markdown('<h1 class="main-header">🏠 Market Overview</h1>', unsafe_allow_html=True)
     
     # Initialize API client
-    api_client = APIClient(base_url="http://localhost:5000")
+    api_client = get_api_client("http://localhost:5000")
     
     # Add refresh button
     col1, col2, col3 = st.columns([1, 1, 4])
@@ -7,18 +7,84 @@ import streamlit as st
 import plotly.graph_objects as go
 import plotly.express as px
 import pandas as pd
+import numpy as np
+from collections import namedtuple
 from datetime import datetime
+from string import Template
 import logging
 
 from src.dashboard.utils import (
-    APIClient,
+    format_metrics_grid,
     format_percentage,
+    get_api_client,
     get_tendency_emoji,
     get_tendency_color
 )
 
 logger = logging.getLogger(__name__)
 
+# History metrics are single-precision percentages/ratios; float32 halves the
+# bytes pushed through numpy reductions and the Plotly serializer
+_METRIC_COLS = [
+    'confidence',
+    'avg_change_percent',
+    'volatility_index',
+    'market_cap_change',
+    'positive_ratio'
+]
+
+# Tuple-backed history row; avoids a per-record dict during parsing
+_HistoryRecord = namedtuple('_HistoryRecord', ['timestamp', 'tendency'] + _METRIC_COLS)
+
+# Current tendency card, compiled once and substituted on each rerun
+_CARD_TMPL = Template(
+    '<div style="text-align: center; padding: 1.5rem; background-color: ${color}20; '
+    'border-radius: 0.5rem; border: 2px solid ${color};">'
+    '<div style="font-size: 4rem;">${emoji}</div>'
+    '<div style="font-size: 1.8rem; font-weight: bold; color: ${color};">${tendency}</div>'
+    '<div style="font-size: 1rem; color: #666; margin-top: 0.5rem;">Confidence: ${conf}</div>'
+    '</div>'
+)
+
+# Confidence threshold lines, built once and passed straight to update_layout
+_CONF_THRESHOLDS = [
+    (0.7, 'green', 'High Confidence'),
+    (0.5, 'orange', 'Medium Confidence')
+]
+_CONF_HLINES = [
+    dict(
+        type='line', xref='paper', yref='y',
+        x0=0, x1=1, y0=y, y1=y,
+        line=dict(dash='dash', color=color)
+    )
+    for y, color, _ in _CONF_THRESHOLDS
+]
+_CONF_ANNOTS = [
+    dict(
+        xref='paper', yref='y', x=1, y=y,
+        text=text, showarrow=False,
+        xanchor='right', yanchor='bottom'
+    )
+    for y, _, text in _CONF_THRESHOLDS
+]
+
+
+def _parse_timestamps(timestamps: pd.Series) -> pd.Series:
+    """
+    Parse API timestamps in a single vectorized pass.
+    
+    Args:
+        timestamps: Series of ISO-8601 timestamp strings
+    
+    Returns:
+        Series of datetimes, naive as sent by the API
+    """
+    try:
+        return pd.to_datetime(timestamps, format='ISO8601', cache=True)
+    except (ValueError, TypeError):
+        # Heterogeneous timestamps from older API versions
+        return pd.to_datetime(timestamps, format='mixed', cache=True)
+
 
 def create_tendency_timeline(history_df: pd.DataFrame) -> go.Figure:
     """
@@ -107,28 +173,15 @@ def create_confidence_timeline(history_df: pd.DataFrame) -> go.Figure:
         )
     ))
     
-    # Add threshold line
-    fig.add_hline(
-        y=0.7,
-        line_dash="dash",
-        line_color="green",
-        annotation_text="High Confidence"
-    )
-    
-    fig.add_hline(
-        y=0.5,
-        line_dash="dash",
-        line_color="orange",
-        annotation_text="Medium Confidence"
-    )
-    
     fig.update_layout(
         title="Confidence Score Over Time",
         xaxis_title="Time",
         yaxis_title="Confidence Score",
         yaxis=dict(range=[0, 1]),
         height=400,
-        hovermode='x unified'
+        hovermode='x unified',
+        shapes=_CONF_HLINES,
+        annotations=_CONF_ANNOTS
     )
     
     return fig
@@ -225,7 +278,7 @@ def show():
     st.markdown('<h1 class="main-header">📈 Market Tendency</h1>', unsafe_allow_html=True)
     
     # Initialize API client
-    api_client = APIClient(base_url="http://localhost:5000")
+    api_client = get_api_client("http://localhost:5000")
     
     # Controls
     col1, col2, col3 = st.columns([1, 1, 4])
@@ -241,15 +294,28 @@ def show():
             format_func=lambda x: f"{x}h ({x//24}d)" if x >= 24 else f"{x}h"
         )
     
-    # Fetch current tendency
+    # Historical period widget is rendered further down; read its last value
+    # so current and historical data come back in one request
+    history_hours = st.session_state.get('history_hours', 168)
+    
+    # Fetch current tendency and history
     try:
         with st.spinner("Loading market tendency..."):
-            current_data = api_client.get_market_tendency(
+            bundle = api_client.get_market_bundle(
+                include=('tendency', 'history'),
                 use_cache=True,
                 max_age_hours=1,
-                lookback_hours=lookback_hours
+                lookback_hours=lookback_hours,
+                hours=history_hours
             )
         
+        current_data = bundle.get('tendency', {})
+        history_data = bundle.get('history', {})
+        
+        if 'error' in current_data:
+            st.warning(current_data['error'].get('message', 'Market tendency unavailable'))
+            return
+        
         tendency = current_data.get('tendency', 'unknown')
         confidence = current_data.get('confidence', 0.0)
         metrics = current_data.get('metrics', {})
@@ -257,73 +323,42 @@ def show():
         # Display current tendency
         st.markdown("### 🎯 Current Market Tendency")
         
-        col1, col2, col3, col4, col5 = st.columns(5)
+        col1, col2 = st.columns([1, 4])
         
         with col1:
-            emoji = get_tendency_emoji(tendency)
             st.markdown(
-                f"""
-                <div style="text-align: center; padding: 1.5rem; background-color: {get_tendency_color(tendency)}20; border-radius: 0.5rem; border: 2px solid {get_tendency_color(tendency)};">
-                    <div style="font-size: 4rem;">{emoji}</div>
-                    <div style="font-size: 1.8rem; font-weight: bold; color: {get_tendency_color(tendency)};">
-                        {tendency.upper()}
-                    </div>
-                    <div style="font-size: 1rem; color: #666; margin-top: 0.5rem;">
-                        Confidence: {confidence:.0%}
-                    </div>
-                </div>
-                """,
+                _CARD_TMPL.substitute(
+                    color=get_tendency_color(tendency),
+                    emoji=get_tendency_emoji(tendency),
+                    tendency=tendency.upper(),
+                    conf=f"{confidence:.0%}"
+                ),
                 unsafe_allow_html=True
             )
         
         with col2:
-            st.metric(
-                "Avg Change",
-                format_percentage(metrics.get('avg_change_percent', 0.0))
-            )
-        
-        with col3:
-            st.metric(
-                "Volatility",
-                f"{metrics.get('volatility_index', 0.0):.4f}"
-            )
-        
-        with col4:
-            st.metric(
-                "Market Cap Δ",
-                format_percentage(metrics.get('market_cap_change', 0.0))
-            )
-        
-        with col5:
-            positive_ratio = metrics.get('positive_ratio', 0.0)
-            st.metric(
-                "Positive Ratio",
-                f"{positive_ratio:.0%}"
+            st.markdown(
+                format_metrics_grid([
+                    ("Avg Change", format_percentage(metrics.get('avg_change_percent', 0.0))),
+                    ("Volatility", f"{metrics.get('volatility_index', 0.0):.4f}"),
+                    ("Market Cap Δ", format_percentage(metrics.get('market_cap_change', 0.0))),
+                    ("Positive Ratio", f"{metrics.get('positive_ratio', 0.0):.0%}")
+                ]),
+                unsafe_allow_html=True
             )
         
         # Detailed metrics
         st.markdown("---")
         st.markdown("### 📊 Detailed Metrics")
         
-        col1, col2, col3 = st.columns(3)
-        
-        with col1:
-            st.metric(
-                "Positive Cryptos",
-                metrics.get('positive_count', 0)
-            )
-        
-        with col2:
-            st.metric(
-                "Negative Cryptos",
-                metrics.get('negative_count', 0)
-            )
-        
-        with col3:
-            st.metric(
-                "Total Analyzed",
-                metrics.get('total_count', 0)
-            )
+        st.markdown(
+            format_metrics_grid([
+                ("Positive Cryptos", metrics.get('positive_count', 0)),
+                ("Negative Cryptos", metrics.get('negative_count', 0)),
+                ("Total Analyzed", metrics.get('total_count', 0))
+            ]),
+            unsafe_allow_html=True
+        )
         
         st.markdown("---")
         
@@ -331,35 +366,37 @@ def show():
         st.markdown("### 📈 Historical Analysis")
         
         # Time range selector
-        history_hours = st.selectbox(
+        st.selectbox(
             "Historical Period",
             [24, 48, 72, 168, 336, 720],
             index=3,
-            format_func=lambda x: f"{x}h ({x//24}d)"
+            format_func=lambda x: f"{x}h ({x//24}d)",
+            key='history_hours'
         )
         
-        # Fetch historical data
-        with st.spinner("Loading historical data..."):
-            history_data = api_client.get_tendency_history(hours=history_hours)
-        
         tendencies = history_data.get('tendencies', [])
         
         if tendencies:
             # Convert to DataFrame
-            history_records = []
-            for t in tendencies:
-                record = {
-                    'timestamp': pd.to_datetime(t['timestamp']),
-                    'tendency': t['tendency'],
-                    'confidence': t['confidence'],
-                    'avg_change_percent': t['metrics']['avg_change_percent'],
-                    'volatility_index': t['metrics']['volatility_index'],
-                    'market_cap_change': t['metrics']['market_cap_change'],
-                    'positive_ratio': t['metrics']['positive_ratio']
-                }
-                history_records.append(record)
+            history_records = [
+                _HistoryRecord(
+                    t['timestamp'],
+                    t['tendency'],
+                    t['confidence'],
+                    t['metrics']['avg_change_percent'],
+                    t['metrics']['volatility_index'],
+                    t['metrics']['market_cap_change'],
+                    t['metrics']['positive_ratio']
+                )
+                for t in tendencies
+            ]
             
-            df_history = pd.DataFrame(history_records)
+            df_history = pd.DataFrame.from_records(
+                history_records,
+                columns=_HistoryRecord._fields
+            )
+            df_history[_METRIC_COLS] = df_history[_METRIC_COLS].astype(np.float32)
+            df_history['timestamp'] = _parse_timestamps(df_history['timestamp'])
             df_history = df_history.sort_values('timestamp')
             
             # Display charts in tabs
@@ -402,7 +439,7 @@ def show():
                 col1, col2, col3 = st.columns(3)
                 
                 with col1:
-                    high_conf = len(df_history[df_history['confidence'] >= 0.7])
+                    high_conf = np.count_nonzero(df_history['confidence'].to_numpy() >= 0.7)
                     st.metric("High Confidence", f"{high_conf}/{len(df_history)}")
                 
                 with col2:
@@ -7,17 +7,116 @@ import streamlit as st
 import plotly.graph_objects as go
 import plotly.express as px
 import pandas as pd
+import numpy as np
 from datetime import datetime
+from typing import Any, Dict, List
 import logging
 
 from src.dashboard.utils import (
-    APIClient,
-    format_currency,
-    format_percentage
+    format_currency_array,
+    format_metrics_grid,
+    format_percentage,
+    format_percentage_array,
+    get_api_client
 )
 
 logger = logging.getLogger(__name__)
 
+API_BASE_URL = "http://localhost:5000"
+
+# Medium/high confidence thresholds
+_CONFIDENCE_BINS = [0.5, 0.7]
+
+# Ingest dtypes: percentages/scores fit float32 and symbols repeat across
+# cached frames. Prices stay float64 so large values keep cent precision.
+_PREDICTION_DTYPES = {
+    'predicted_change_percent': 'float32',
+    'confidence': 'float32',
+    'symbol': 'category',
+    'name': 'category'
+}
+
+
+@st.cache_data(ttl=300, show_spinner=False)
+def _fetch_top_predictions(
+    base_url: str,
+    limit: int,
+    use_cache: bool,
+    max_age_hours: int
+) -> dict:
+    """
+    Fetch top predictions, memoized across reruns.
+    
+    Widget interactions (sorting, filtering, tab switches) replay the cached
+    payload instead of issuing a new HTTP request.
+    
+    Args:
+        base_url: Base URL of the API
+        limit: Number of predictions to return
+        use_cache: Whether the API should use cached predictions
+        max_age_hours: Maximum age of cached predictions
+    
+    Returns:
+        Predictions data
+    """
+    return get_api_client(base_url).get_top_predictions(
+        limit=limit,
+        use_cache=use_cache,
+        max_age_hours=max_age_hours
+    )
+
+
+@st.cache_data(max_entries=8, show_spinner=False)
+def _predictions_df(predictions: List[Dict[str, Any]]) -> pd.DataFrame:
+    """
+    Build the predictions DataFrame once per distinct payload, downcasting
+    columns to _PREDICTION_DTYPES.
+    
+    Args:
+        predictions: Prediction records (hashed by content)
+    
+    Returns:
+        DataFrame with prediction data
+    """
+    df = pd.DataFrame(predictions)
+    return df.astype({
+        column: dtype
+        for column, dtype in _PREDICTION_DTYPES.items()
+        if column in df.columns
+    })
+
+
+@st.cache_data(max_entries=8, show_spinner=False)
+def _summary_metrics(df: pd.DataFrame) -> Dict[str, Any]:
+    """
+    Compute summary and confidence-bucket statistics in one place.
+    
+    Args:
+        df: DataFrame with prediction data
+    
+    Returns:
+        Dictionary of summary statistics
+    """
+    changes = df['predicted_change_percent']
+    
+    # One pass buckets confidence into low (<0.5), medium, high (>=0.7)
+    confidence = df['confidence'].to_numpy()
+    low_conf, med_conf, high_conf = np.bincount(
+        np.digitize(confidence, np.asarray(_CONFIDENCE_BINS, dtype=confidence.dtype)),
+        minlength=3
+    )
+    
+    return {
+        'avg_change': changes.mean(),
+        'max_gain': changes.max(),
+        'avg_confidence': df['confidence'].mean(),
+        'positive_count': int((changes > 0).sum()),
+        'total_count': len(df),
+        'high_conf': int(high_conf),
+        'med_conf': int(med_conf),
+        'low_conf': int(low_conf)
+    }
+
 
 def create_predictions_bar_chart(predictions_df: pd.DataFrame) -> go.Figure:
     """
@@ -29,19 +128,23 @@ def create_predictions_bar_chart(predictions_df: pd.DataFrame) -> go.Figure:
     Returns:
         Plotly figure
     """
-    # Sort by predicted change
-    df_sorted = predictions_df.sort_values('predicted_change_percent', ascending=True)
+    values = predictions_df['predicted_change_percent'].to_numpy()
+    
+    # Sort by predicted change, projecting only the plotted columns
+    order = values.argsort(kind='stable')
+    df_sorted = predictions_df[['symbol', 'predicted_change_percent']].iloc[order]
     
     # Color bars based on positive/negative
-    colors = ['#00c853' if x > 0 else '#d32f2f' for x in df_sorted['predicted_change_percent']]
+    changes = df_sorted['predicted_change_percent']
+    colors = np.where(changes.to_numpy() > 0, '#00c853', '#d32f2f')
     
     fig = go.Figure(data=[
         go.Bar(
-            x=df_sorted['predicted_change_percent'],
+            x=changes,
             y=df_sorted['symbol'],
             orientation='h',
             marker=dict(color=colors),
-            text=[f"{x:+.2f}%" for x in df_sorted['predicted_change_percent']],
+            text=changes.map('{:+.2f}%'.format).to_numpy(),
             textposition='outside',
             hovertemplate=(
                 '<b>%{y}</b><br>' +
@@ -117,7 +220,9 @@ def create_price_comparison_chart(predictions_df: pd.DataFrame) -> go.Figure:
         Plotly figure
     """
     # Select top 10 for readability
-    df_top = predictions_df.nlargest(10, 'predicted_change_percent')
+    df_top = predictions_df[
+        ['symbol', 'current_price', 'predicted_price', 'predicted_change_percent']
+    ].nlargest(10, 'predicted_change_percent', keep='first')
     
     fig = go.Figure(data=[
         go.Bar(
@@ -125,7 +230,7 @@ def create_price_comparison_chart(predictions_df: pd.DataFrame) -> go.Figure:
             x=df_top['symbol'],
             y=df_top['current_price'],
             marker_color='#1976d2',
-            text=[format_currency(x) for x in df_top['current_price']],
+            text=format_currency_array(df_top['current_price']),
             textposition='outside'
         ),
         go.Bar(
@@ -133,7 +238,7 @@ def create_price_comparison_chart(predictions_df: pd.DataFrame) -> go.Figure:
             x=df_top['symbol'],
             y=df_top['predicted_price'],
             marker_color='#00c853',
-            text=[format_currency(x) for x in df_top['predicted_price']],
+            text=format_currency_array(df_top['predicted_price']),
             textposition='outside'
         )
     ])
@@ -150,18 +255,92 @@ def create_price_comparison_chart(predictions_df: pd.DataFrame) -> go.Figure:
     return fig
 
 
+# Data table sort options: label -> (column, descending)
+_SORT_OPTIONS = {
+    "Predicted Change (High to Low)": ('predicted_change_percent', True),
+    "Predicted Change (Low to High)": ('predicted_change_percent', False),
+    "Confidence (High to Low)": ('confidence', True),
+    "Symbol (A-Z)": ('symbol', False)
+}
+
+
+@st.cache_data(max_entries=8, show_spinner=False)
+def _filter_and_sort(
+    predictions_df: pd.DataFrame,
+    sort_by: str,
+    min_confidence: float
+) -> pd.DataFrame:
+    """
+    Filter by confidence and sort for the data table.
+    
+    The sort order comes from one NumPy argsort over the sort column, cached
+    per (data, sort_by, min_confidence).
+    
+    Args:
+        predictions_df: DataFrame with prediction data
+        sort_by: Label from _SORT_OPTIONS
+        min_confidence: Minimum confidence to keep
+    
+    Returns:
+        Filtered and sorted DataFrame
+    """
+    column, descending = _SORT_OPTIONS[sort_by]
+    
+    df_filtered = predictions_df[predictions_df['confidence'].to_numpy() >= min_confidence]
+    values = df_filtered[column].to_numpy()
+    
+    if descending:
+        order = (-values).argsort(kind='stable')
+    else:
+        order = values.argsort(kind='stable')
+    
+    return df_filtered.iloc[order]
+
+
+@st.cache_data(max_entries=4, show_spinner=False)
+def _to_csv(predictions_df: pd.DataFrame) -> bytes:
+    """
+    Serialize the data table for download, once per filter/sort state.
+    
+    Args:
+        predictions_df: Filtered and sorted DataFrame
+    
+    Returns:
+        UTF-8 encoded CSV
+    """
+    return predictions_df.to_csv(index=False).encode('utf-8')
+
+
+# Streamlit executes every tab body on each rerun; cache the figures on the
+# DataFrame's content hash so unrelated widget changes reuse them
+@st.cache_resource(max_entries=8, show_spinner=False)
+def _bar_fig(predictions_df: pd.DataFrame) -> go.Figure:
+    """Cached predicted-change bar chart."""
+    return create_predictions_bar_chart(predictions_df)
+
+
+@st.cache_resource(max_entries=8, show_spinner=False)
+def _scatter_fig(predictions_df: pd.DataFrame) -> go.Figure:
+    """Cached confidence scatter plot."""
+    return create_confidence_scatter(predictions_df)
+
+
+@st.cache_resource(max_entries=8, show_spinner=False)
+def _comparison_fig(predictions_df: pd.DataFrame) -> go.Figure:
+    """Cached current vs predicted price chart."""
+    return create_price_comparison_chart(predictions_df)
+
+
 def show():
     """Display predictions page."""
     st.markdown('<h1 class="main-header">🎯 Top Predictions</h1>', unsafe_allow_html=True)
     
-    # Initialize API client
-    api_client = APIClient(base_url="http://localhost:5000")
-    
     # Controls
     col1, col2, col3, col4 = st.columns([1, 1, 1, 3])
     
     with col1:
         if st.button("🔄 Refresh"):
+            _fetch_top_predictions.clear()
             st.rerun()
     
     with col2:
@@ -173,10 +352,11 @@ def show():
     # Fetch predictions
     try:
         with st.spinner("Loading predictions..."):
-            data = api_client.get_top_predictions(
-                limit=limit,
-                use_cache=use_cache,
-                max_age_hours=24
+            data = _fetch_top_predictions(
+                API_BASE_URL,
+                limit,
+                use_cache,
+                24
             )
         
         predictions = data.get('predictions', [])
@@ -186,44 +366,21 @@ def show():
             return
         
         # Convert to DataFrame
-        df = pd.DataFrame(predictions)
+        df = _predictions_df(predictions)
+        summary = _summary_metrics(df)
         
         # Display summary metrics
         st.markdown("### 📊 Summary")
         
-        col1, col2, col3, col4 = st.columns(4)
-        
-        with col1:
-            avg_change = df['predicted_change_percent'].mean()
-            st.metric(
-                "Avg Predicted Change",
-                format_percentage(avg_change),
-                delta=None
-            )
-        
-        with col2:
-            max_gain = df['predicted_change_percent'].max()
-            st.metric(
-                "Highest Gain",
-                format_percentage(max_gain),
-                delta=None
-            )
-        
-        with col3:
-            avg_confidence = df['confidence'].mean()
-            st.metric(
-                "Avg Confidence",
-                f"{avg_confidence:.2f}",
-                delta=None
-            )
-        
-        with col4:
-            positive_count = len(df[df['predicted_change_percent'] > 0])
-            st.metric(
-                "Positive Predictions",
-                f"{positive_count}/{len(df)}",
-                delta=None
-            )
+        st.markdown(
+            format_metrics_grid([
+                ("Avg Predicted Change", format_percentage(summary['avg_change'])),
+                ("Highest Gain", format_percentage(summary['max_gain'])),
+                ("Avg Confidence", f"{summary['avg_confidence']:.2f}"),
+                ("Positive Predictions", f"{summary['positive_count']}/{summary['total_count']}")
+            ]),
+            unsafe_allow_html=True
+        )
         
         st.markdown("---")
         
@@ -237,13 +394,13 @@ def show():
         
         with tab1:
             st.plotly_chart(
-                create_predictions_bar_chart(df),
+                _bar_fig(df),
                 use_container_width=True
             )
         
         with tab2:
             st.plotly_chart(
-                create_confidence_scatter(df),
+                _scatter_fig(df),
                 use_container_width=True
             )
             
@@ -251,20 +408,16 @@ def show():
             st.markdown("#### Confidence Distribution")
             col1, col2, col3 = st.columns(3)
             
-            high_conf = len(df[df['confidence'] >= 0.7])
-            med_conf = len(df[(df['confidence'] >= 0.5) & (df['confidence'] < 0.7)])
-            low_conf = len(df[df['confidence'] < 0.5])
-            
             with col1:
-                st.metric("High (≥0.7)", high_conf)
+                st.metric("High (≥0.7)", summary['high_conf'])
             with col2:
-                st.metric("Medium (0.5-0.7)", med_conf)
+                st.metric("Medium (0.5-0.7)", summary['med_conf'])
             with col3:
-                st.metric("Low (<0.5)", low_conf)
+                st.metric("Low (<0.5)", summary['low_conf'])
         
         with tab3:
             st.plotly_chart(
-                create_price_comparison_chart(df),
+                _comparison_fig(df),
                 use_container_width=True
             )
         
@@ -277,12 +430,7 @@ def show():
             with col1:
                 sort_by = st.selectbox(
                     "Sort by",
-                    [
-                        "Predicted Change (High to Low)",
-                        "Predicted Change (Low to High)",
-                        "Confidence (High to Low)",
-                        "Symbol (A-Z)"
-                    ]
+                    list(_SORT_OPTIONS)
                 )
             
             with col2:
@@ -291,27 +439,21 @@ def show():
                     0.0, 1.0, 0.0, 0.1
                 )
             
-            # Apply filters
-            df_filtered = df[df['confidence'] >= min_confidence].copy()
-            
-            # Apply sorting
-            if sort_by == "Predicted Change (High to Low)":
-                df_filtered = df_filtered.sort_values('predicted_change_percent', ascending=False)
-            elif sort_by == "Predicted Change (Low to High)":
-                df_filtered = df_filtered.sort_values('predicted_change_percent', ascending=True)
-            elif sort_by == "Confidence (High to Low)":
-                df_filtered = df_filtered.sort_values('confidence', ascending=False)
-            else:  # Symbol A-Z
-                df_filtered = df_filtered.sort_values('symbol')
+            # Apply filters and sorting
+            df_filtered = _filter_and_sort(df, sort_by, min_confidence)
             
             # Format for display
             df_display = df_filtered.copy()
-            df_display['current_price'] = df_display['current_price'].apply(format_currency)
-            df_display['predicted_price'] = df_display['predicted_price'].apply(format_currency)
-            df_display['predicted_change_percent'] = df_display['predicted_change_percent'].apply(
-                lambda x: format_percentage(x)
+            df_display['current_price'] = format_currency_array(
+                df_display['current_price'].to_numpy()
+            )
+            df_display['predicted_price'] = format_currency_array(
+                df_display['predicted_price'].to_numpy()
+            )
+            df_display['predicted_change_percent'] = format_percentage_array(
+                df_display['predicted_change_percent'].to_numpy()
             )
-            df_display['confidence'] = df_display['confidence'].apply(lambda x: f"{x:.2f}")
+            df_display['confidence'] = np.char.mod('%.2f', df_display['confidence'].to_numpy())
             
             # Rename columns for display
             df_display = df_display.rename(columns={
@@ -330,10 +472,9 @@ def show():
             )
             
             # Download button
-            csv = df_filtered.to_csv(index=False)
             st.download_button(
                 label="📥 Download CSV",
-                data=csv,
+                data=_to_csv(df_filtered),
                 file_name=f"predictions_{datetime.now().strftime('%Y%m%d_%H%M%S')}.csv",
                 mime="text/csv"
             )
@@ -353,4 +494,4 @@ def show():
     except Exception as e:
         logger.error(f"Error loading predictions: {e}", exc_info=True)
         st.error(f"Failed to load predictions: {str(e)}")
-        st.info("Make sure the Flask API is running on http://localhost:5000")
+        st.info(f"Make sure the Flask API is running on {API_BASE_URL}")
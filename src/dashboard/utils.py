@@ -5,15 +5,45 @@ Handles API calls and data formatting.
 
 import requests
 import logging
-from typing import Dict, Any, Optional
+from collections import OrderedDict
+import numpy as np
+import plotly.io as pio
+import streamlit as st
+from requests.adapters import HTTPAdapter
+from html import escape
+from string import Template
+from typing import Dict, Any, Iterable, List, Optional, Tuple
 from datetime import datetime
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 logger = logging.getLogger(__name__)
 
+# Serialize Plotly figures (including st.plotly_chart's) with orjson when available
+if orjson is not None:
+    pio.json.config.default_engine = 'orjson'
+
+# Read-only metric rows rendered as one markdown block instead of one
+# st.metric delta per column
+_METRICS_GRID_TMPL = Template(
+    '<div style="display: grid; grid-template-columns: repeat(${columns}, 1fr); '
+    'gap: 1rem; margin-bottom: 1rem;">${cells}</div>'
+)
+_METRIC_CELL_TMPL = Template(
+    '<div><div style="font-size: 0.875rem; color: #666;">${label}</div>'
+    '<div style="font-size: 2.25rem; line-height: 1.4;">${value}</div></div>'
+)
+
 
 class APIClient:
     """Client for interacting with the Flask API."""
     
+    # Maximum number of GET responses remembered for conditional requests
+    ETAG_CACHE_SIZE = 64
+    
     def __init__(self, base_url: str, api_key: Optional[str] = None):
         """
         Initialize API client.
@@ -26,8 +56,16 @@ class APIClient:
         self.api_key = api_key
         self.session = requests.Session()
         
+        # Keep-alive pool sized for parallel widget-triggered calls
+        adapter = HTTPAdapter(pool_connections=10, pool_maxsize=20)
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+        
         if api_key:
             self.session.headers.update({'X-API-Key': api_key})
+        
+        # (url, params) -> (etag, decoded body), least recently used first
+        self._etag_cache: OrderedDict = OrderedDict()
     
     def _make_request(
         self,
@@ -53,16 +91,45 @@ class APIClient:
         """
         url = f"{self.base_url}{endpoint}"
         
+        cache_key = None
+        cached = None
+        headers = None
+        if method == 'GET':
+            cache_key = (url, tuple(sorted((params or {}).items())))
+            cached = self._etag_cache.get(cache_key)
+            if cached:
+                headers = {'If-None-Match': cached[0]}
+        
         try:
             response = self.session.request(
                 method=method,
                 url=url,
                 params=params,
                 json=json,
+                headers=headers,
                 timeout=30
             )
+            
+            # Unchanged since last poll: reuse the decoded body
+            if response.status_code == 304 and cached:
+                return cached[1]
+            
             response.raise_for_status()
-            return response.json()
+            
+            # orjson decodes straight from bytes, skipping stdlib json
+            if orjson is not None:
+                data = orjson.loads(response.content)
+            else:
+                data = response.json()
+            
+            etag = response.headers.get('ETag')
+            if cache_key and etag:
+                self._etag_cache[cache_key] = (etag, data)
+                self._etag_cache.move_to_end(cache_key)
+                if len(self._etag_cache) > self.ETAG_CACHE_SIZE:
+                    self._etag_cache.popitem(last=False)
+            
+            return data
         
         except requests.RequestException as e:
             logger.error(f"API request failed: {method} {url} - {e}")
@@ -153,6 +220,39 @@ class APIClient:
             params={'hours': hours}
         )
     
+    def get_market_bundle(
+        self,
+        include: Tuple[str, ...] = ('tendency', 'history', 'overview'),
+        use_cache: bool = True,
+        max_age_hours: int = 1,
+        lookback_hours: int = 24,
+        hours: int = 168
+    ) -> Dict[str, Any]:
+        """
+        Get several market sections in one request.
+        
+        Args:
+            include: Sections to return (tendency, history, overview)
+            use_cache: Whether to use cached tendency
+            max_age_hours: Maximum age of cached tendency
+            lookback_hours: Hours to look back for analysis
+            hours: Hours of tendency history
+        
+        Returns:
+            Market data keyed by section name
+        """
+        return self._make_request(
+            'GET',
+            '/api/market/bundle',
+            params={
+                'include': ','.join(include),
+                'use_cache': str(use_cache).lower(),
+                'max_age_hours': max_age_hours,
+                'lookback_hours': lookback_hours,
+                'hours': hours
+            }
+        )
+    
     def get_market_overview(self) -> Dict[str, Any]:
         """
         Get comprehensive market overview.
@@ -207,6 +307,24 @@ class APIClient:
         return self._make_request('GET', '/api/admin/system/info')
 
 
+@st.cache_resource(show_spinner=False)
+def get_api_client(base_url: str, api_key: Optional[str] = None) -> APIClient:
+    """
+    Get a shared API client.
+    
+    The client (and its session connection pool) is reused across reruns
+    and users instead of being rebuilt on every script run.
+    
+    Args:
+        base_url: Base URL of the API
+        api_key: Optional API key for authentication
+    
+    Returns:
+        APIClient instance
+    """
+    return APIClient(base_url=base_url, api_key=api_key)
+
+
 def format_currency(value: float) -> str:
     """
     Format value as currency.
@@ -225,6 +343,62 @@ def format_currency(value: float) -> str:
         return f"${value:.6f}"
 
 
+def format_currency_array(values: Iterable[float]) -> np.ndarray:
+    """
+    Format many values as currency, matching format_currency.
+    
+    Magnitude bins are selected with array masks rather than a Python
+    branch per value.
+    
+    Args:
+        values: Numeric values
+    
+    Returns:
+        Array of formatted currency strings
+    """
+    arr = np.asarray(values, dtype=np.float64)
+    out = np.char.mod('$%.6f', arr).astype(object)
+    
+    mid = arr >= 1
+    out[mid] = np.char.mod('$%.2f', arr[mid])
+    
+    big = arr >= 1000
+    out[big] = ['${:,.2f}'.format(v) for v in arr[big]]
+    
+    return out
+
+
+def format_percentage_array(values: Iterable[float]) -> np.ndarray:
+    """
+    Format many values as percentages, matching format_percentage.
+    
+    Args:
+        values: Numeric values
+    
+    Returns:
+        Array of formatted percentage strings
+    """
+    arr = np.asarray(values, dtype=np.float64)
+    return np.char.add(np.where(arr > 0, '+', ''), np.char.mod('%.2f%%', arr))
+
+
+def format_metrics_grid(metrics: List[Tuple[str, Any]]) -> str:
+    """
+    Format a row of read-only metrics as a single HTML grid.
+    
+    Args:
+        metrics: List of (label, value) pairs, one per grid column
+    
+    Returns:
+        HTML string for st.markdown(..., unsafe_allow_html=True)
+    """
+    cells = ''.join(
+        _METRIC_CELL_TMPL.substitute(label=escape(str(label)), value=escape(str(value)))
+        for label, value in metrics
+    )
+    return _METRICS_GRID_TMPL.substitute(columns=len(metrics), cells=cells)
+
+
 def format_percentage(value: float) -> str:
     """
     Format value as percentage.
@@ -8,9 +8,15 @@ from src.data.database import (
     init_db,
     get_engine,
     get_session,
+    new_session,
+    remove_session,
     session_scope,
     create_tables,
+    is_hypertable,
+    create_daily_ohlc_view,
+    refresh_daily_ohlc,
     drop_tables,
+    vacuum_analyze,
     check_connection,
     close_db,
 )
@@ -39,9 +45,15 @@ __all__ = [
     'init_db',
     'get_engine',
     'get_session',
+    'new_session',
+    'remove_session',
     'session_scope',
     'create_tables',
+    'is_hypertable',
+    'create_daily_ohlc_view',
+    'refresh_daily_ohlc',
     'drop_tables',
+    'vacuum_analyze',
     'check_connection',
     'close_db',
     # Models
@@ -0,0 +1,78 @@
+"""
+In-process cache of recent chat history per session.
+Serves the last Q&A pairs read for every chat context build without a
+database round-trip.
+"""
+
+import logging
+from typing import Iterable, List
+
+from sqlalchemy.orm import Session
+
+from src.data.session_cache import SessionCache
+
+logger = logging.getLogger(__name__)
+
+# Seconds an entry is served before re-reading the database. Bounds staleness
+# for messages written by other processes.
+DEFAULT_TTL_SECONDS = 60
+
+# Most entries kept; the least recently used one is evicted first
+DEFAULT_MAX_SESSIONS = 1024
+
+
+def _invalidate_sessions(session_ids: List[str]) -> None:
+    """Drop all cached entries of chat sessions that received messages."""
+    session_ids = set(session_ids)
+    recent_history_cache.invalidate(lambda key: key[0] in session_ids)
+
+
+# Entries are keyed by (chat session ID, limit) and hold the rows returned by
+# ChatHistoryRepository.get_recent_by_session_projected as a tuple
+recent_history_cache = SessionCache(
+    'recent_history',
+    DEFAULT_TTL_SECONDS,
+    max_entries=DEFAULT_MAX_SESSIONS,
+    on_commit=_invalidate_sessions
+)
+
+
+def invalidate_recent_history(session: Session, session_ids: Iterable[str]) -> None:
+    """
+    Drop cached history of chat sessions once session commits new messages.
+    
+    Args:
+        session: Database session the messages were written with
+        session_ids: User session IDs the messages belong to
+    """
+    recent_history_cache.stage(session, session_ids)
+
+
+def has_pending_history(session: Session, session_id: str) -> bool:
+    """
+    Check whether session holds uncommitted messages for a chat session.
+    
+    Args:
+        session: Database session
+        session_id: User session ID
+    
+    Returns:
+        True if reads must bypass the cache
+    """
+    return recent_history_cache.is_staged(session, session_id)
+
+
+def is_known_empty(session_id: str) -> bool:
+    """
+    Check whether a fresh entry shows a chat session has no messages.
+    
+    Args:
+        session_id: User session ID
+    
+    Returns:
+        True if a cached read of the session returned no rows
+    """
+    return any(
+        key[0] == session_id and not rows
+        for key, rows in recent_history_cache.items()
+    )
@@ -0,0 +1,153 @@
+"""
+Chat write queue module.
+Persists chat history and audit records from a background thread in batches,
+keeping the database commit off the request path.
+"""
+
+import atexit
+import logging
+import threading
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm import Session
+
+from src.data.database import new_session
+from src.data.repositories import ChatHistoryRepository, AuditLogRepository
+from src.data.write_queue import BatchWriteQueue
+
+logger = logging.getLogger(__name__)
+
+# Most entries written per transaction
+CHAT_WRITE_BATCH_SIZE = 500
+
+# Longest time an entry waits in the queue before it is written
+CHAT_WRITE_FLUSH_SECONDS = 1.0
+
+# (chat history record or None, audit log record)
+WriteEntry = Tuple[Optional[Dict[str, Any]], Dict[str, Any]]
+
+
+class ChatWriteQueue(BatchWriteQueue):
+    """
+    Background batch writer for chat history and audit log records.
+    
+    Entries are queued by request handlers and written by a daemon thread,
+    up to CHAT_WRITE_BATCH_SIZE entries or CHAT_WRITE_FLUSH_SECONDS at a time.
+    Each audit record is linked to the ID of the chat record queued with it;
+    audit records are written even when their chat record cannot be.
+    Entries still queued when the process is killed are lost.
+    """
+    
+    thread_name = 'chat-write-queue'
+    
+    def __init__(
+        self,
+        session_factory: Callable[[], Session] = new_session,
+        batch_size: int = CHAT_WRITE_BATCH_SIZE,
+        flush_seconds: float = CHAT_WRITE_FLUSH_SECONDS
+    ):
+        """
+        Initialize chat write queue.
+        
+        Args:
+            session_factory: Callable returning a new database session
+            batch_size: Most entries written per transaction
+            flush_seconds: Longest wait before queued entries are written
+        """
+        super().__init__(session_factory, batch_size, flush_seconds)
+    
+    def put(self, chat: Optional[Dict[str, Any]], audit: Dict[str, Any]) -> None:
+        """
+        Queue a chat interaction for writing, starting the writer if needed.
+        
+        Args:
+            chat: ChatHistory column values, or None if not answered
+            audit: QueryAuditLog column values (chat_history_id is filled in)
+        """
+        self._enqueue((chat, audit))
+    
+    def _write_batch(self, batch: List[WriteEntry]) -> None:
+        """
+        Write a batch of entries in one transaction.
+        
+        Args:
+            batch: Queued (chat, audit) entries
+        """
+        session = self.session_factory()
+        try:
+            chat_records = [chat for chat, _ in batch if chat is not None]
+            chat_ids = iter(self._write_chat_records(session, chat_records))
+            
+            audit_records = []
+            for chat, audit in batch:
+                audit_records.append({
+                    **audit,
+                    'chat_history_id': next(chat_ids) if chat is not None else None
+                })
+            AuditLogRepository(session).bulk_create(audit_records)
+            
+            session.commit()
+            logger.debug(
+                f"Wrote {len(chat_records)} chat records and "
+                f"{len(audit_records)} audit records"
+            )
+        except Exception as e:
+            session.rollback()
+            logger.error(f"Error writing {len(batch)} queued chat entries: {e}", exc_info=True)
+        finally:
+            session.close()
+    
+    @staticmethod
+    def _write_chat_records(session: Session, chat_records: List[Dict[str, Any]]) -> List[Optional[int]]:
+        """
+        Insert chat records in savepoints so a failure keeps the audit records.
+        
+        The batch is inserted in one savepoint; if that fails, each record is
+        retried in its own savepoint and records that still fail are skipped.
+        
+        Args:
+            session: Session of the batch transaction
+            chat_records: ChatHistory column values
+        
+        Returns:
+            Chat history IDs in record order, None for records not written
+        """
+        repo = ChatHistoryRepository(session)
+        try:
+            with session.begin_nested():
+                return repo.bulk_create(chat_records)
+        except SQLAlchemyError as e:
+            logger.warning(f"Error writing {len(chat_records)} chat records, retrying one by one: {e}")
+        
+        chat_ids: List[Optional[int]] = []
+        for chat in chat_records:
+            try:
+                with session.begin_nested():
+                    chat_ids.extend(repo.bulk_create([chat]))
+            except SQLAlchemyError as e:
+                logger.error(f"Dropping chat record for session {chat.get('session_id')}: {e}")
+                chat_ids.append(None)
+        return chat_ids
+
+
+# Global write queue instance
+_chat_write_queue = None
+_queue_lock = threading.Lock()
+
+
+def get_chat_write_queue() -> ChatWriteQueue:
+    """
+    Get the global chat write queue, flushed on interpreter exit.
+    
+    Returns:
+        ChatWriteQueue instance
+    """
+    global _chat_write_queue
+    
+    with _queue_lock:
+        if _chat_write_queue is None:
+            _chat_write_queue = ChatWriteQueue()
+            atexit.register(_chat_write_queue.stop, CHAT_WRITE_FLUSH_SECONDS * 5)
+    
+    return _chat_write_queue
@@ -3,25 +3,94 @@ Database connection and session management module.
 Provides SQLAlchemy engine, session factory, and database initialization.
 """
 
+import itertools
 import logging
+import time
 from contextlib import contextmanager
-from typing import Generator
+from contextvars import ContextVar
+from typing import Generator, Optional, Tuple
 
-from sqlalchemy import create_engine, event, pool
-from sqlalchemy.orm import sessionmaker, Session, declarative_base
+from sqlalchemy import create_engine, event, pool, text
+from sqlalchemy.orm import sessionmaker, scoped_session, Session, DeclarativeBase
 from sqlalchemy.exc import SQLAlchemyError
 
 from src.config.config_loader import Config
 
 logger = logging.getLogger(__name__)
 
-# Base class for all SQLAlchemy models
-Base = declarative_base()
 
-# Global engine and session factory (initialized by init_db)
+class Base(DeclarativeBase):
+    """Base class for all SQLAlchemy models (typed Mapped[] declarations)."""
+
+
+# Global engine and session factories (initialized by init_db).
+# _SessionFactory hands out one shared session per context (request/thread);
+# _SessionMaker creates independent sessions.
 _engine = None
+_SessionMaker = None
 _SessionFactory = None
 
+# Scope key for the current context; reset by remove_session()
+_scope_ids = itertools.count(1)
+_scope_id: ContextVar[Optional[int]] = ContextVar('db_session_scope_id', default=None)
+
+# Nesting depth of session_scope() in the current context
+_scope_depth: ContextVar[int] = ContextVar('db_session_scope_depth', default=0)
+
+# Seconds a connection check result is reused; pool_pre_ping already
+# validates every checkout, so health probes need not hit the DB each time
+CONNECTION_CHECK_TTL_SECONDS = 5.0
+
+# Rows per multi-row INSERT statement for executemany() batches
+INSERTMANYVALUES_PAGE_SIZE = 5000
+
+# Executions after which psycopg 3 prepares a statement server-side, so
+# repeated INSERT/SELECT shapes skip parsing and planning
+PREPARE_THRESHOLD = 5
+
+# Daily OHLC rollup of price_history (PostgreSQL only). A TimescaleDB
+# continuous aggregate refreshes itself; a plain materialized view is
+# refreshed by refresh_daily_ohlc() after collection runs.
+DAILY_OHLC_VIEW = 'mv_daily_ohlc'
+
+_DAILY_OHLC_SQL = (
+    "CREATE MATERIALIZED VIEW IF NOT EXISTS mv_daily_ohlc AS "
+    "SELECT crypto_id, date_trunc('day', \"timestamp\") AS day, "
+    "(array_agg(price_usd ORDER BY \"timestamp\"))[1] AS open, "
+    "max(price_usd) AS high, min(price_usd) AS low, "
+    "(array_agg(price_usd ORDER BY \"timestamp\" DESC))[1] AS close, "
+    "(array_agg(volume_24h ORDER BY \"timestamp\" DESC))[1] AS volume_24h "
+    "FROM price_history GROUP BY 1, 2"
+)
+
+_DAILY_OHLC_CONTINUOUS_SQL = (
+    "CREATE MATERIALIZED VIEW IF NOT EXISTS mv_daily_ohlc "
+    "WITH (timescaledb.continuous) AS "
+    "SELECT crypto_id, time_bucket(INTERVAL '1 day', \"timestamp\") AS day, "
+    "first(price_usd, \"timestamp\") AS open, "
+    "max(price_usd) AS high, min(price_usd) AS low, "
+    "last(price_usd, \"timestamp\") AS close, "
+    "last(volume_24h, \"timestamp\") AS volume_24h "
+    "FROM price_history GROUP BY 1, 2 WITH NO DATA"
+)
+
+# (monotonic time of last check, result)
+_last_check: Tuple[float, bool] = (0.0, False)
+
+
+def _get_scope_id() -> int:
+    """
+    Get the session registry key for the current context.
+    
+    Returns:
+        Integer key, allocated on first use in each context.
+    """
+    scope_id = _scope_id.get()
+    if scope_id is None:
+        scope_id = next(_scope_ids)
+        _scope_id.set(scope_id)
+    return scope_id
+
 
 def init_db(config: Config) -> None:
     """
@@ -33,7 +102,7 @@ def init_db(config: Config) -> None:
     Raises:
         SQLAlchemyError: If database connection fails.
     """
-    global _engine, _SessionFactory
+    global _engine, _SessionMaker, _SessionFactory
     
     try:
         # Resolve database URL for SQLite with environment path
@@ -50,6 +119,17 @@ def init_db(config: Config) -> None:
             database_url = f'sqlite:///{abs_db_path}'
             logger.info(f"Resolved SQLite database path: {abs_db_path}")
         
+        # Plain PostgreSQL URLs use the psycopg 3 driver
+        if database_url.startswith('postgresql://'):
+            database_url = 'postgresql+psycopg://' + database_url[len('postgresql://'):]
+        
+        engine_options = {}
+        if database_url.startswith('postgresql+psycopg://'):
+            engine_options['connect_args'] = {'prepare_threshold': PREPARE_THRESHOLD}
+        elif database_url.startswith('postgresql'):
+            # psycopg2: send executemany() batches as multi-row VALUES statements
+            engine_options['executemany_mode'] = 'values_plus_batch'
+        
         # Create engine with connection pooling
         _engine = create_engine(
             database_url,
@@ -59,6 +139,8 @@ def init_db(config: Config) -> None:
             pool_pre_ping=True,  # Verify connections before using
             pool_recycle=3600,   # Recycle connections after 1 hour
             echo=config.log_level == 'DEBUG',  # Log SQL in debug mode
+            insertmanyvalues_page_size=INSERTMANYVALUES_PAGE_SIZE,
+            **engine_options,
         )
         
         # Add connection event listeners for logging
@@ -70,13 +152,14 @@ def init_db(config: Config) -> None:
         def receive_close(dbapi_conn, connection_record):
             logger.debug("Database connection closed")
         
-        # Create session factory
-        _SessionFactory = sessionmaker(
+        # Create session factories
+        _SessionMaker = sessionmaker(
             bind=_engine,
             autocommit=False,
             autoflush=False,
             expire_on_commit=False,
         )
+        _SessionFactory = scoped_session(_SessionMaker, scopefunc=_get_scope_id)
         
         logger.info(f"Database initialized successfully: {config.database_url.split('@')[1]}")
         
@@ -102,7 +185,11 @@ def get_engine():
 
 def get_session() -> Session:
     """
-    Get a new database session.
+    Get the database session for the current context.
+    
+    Repeated calls within one request (or thread) return the same session,
+    so they share a single pooled connection. Call remove_session() when
+    the context ends.
     
     Returns:
         SQLAlchemy Session instance.
@@ -115,11 +202,43 @@ def get_session() -> Session:
     return _SessionFactory()
 
 
+def new_session() -> Session:
+    """
+    Get a new, independent database session.
+    
+    Use for work whose commits must not interleave with the context's shared
+    session (e.g. audit writes that persist even if the request rolls back).
+    
+    Returns:
+        SQLAlchemy Session instance.
+    
+    Raises:
+        RuntimeError: If database is not initialized.
+    """
+    if _SessionMaker is None:
+        raise RuntimeError("Database not initialized. Call init_db() first.")
+    return _SessionMaker()
+
+
+def remove_session() -> None:
+    """
+    Close and discard the current context's shared session.
+    
+    Called on Flask request teardown; safe to call when no session exists.
+    """
+    if _SessionFactory is not None:
+        _SessionFactory.remove()
+    _scope_id.set(None)
+
+
 @contextmanager
 def session_scope() -> Generator[Session, None, None]:
     """
     Provide a transactional scope for database operations.
     
+    Nested scopes reuse the outer scope's session; only the outermost scope
+    commits, rolls back and closes.
+    
     Usage:
         with session_scope() as session:
             session.add(obj)
@@ -132,6 +251,16 @@ def session_scope() -> Generator[Session, None, None]:
         SQLAlchemyError: If database operation fails.
     """
     session = get_session()
+    depth = _scope_depth.get()
+    token = _scope_depth.set(depth + 1)
+    
+    if depth:
+        try:
+            yield session
+        finally:
+            _scope_depth.reset(token)
+        return
+    
     try:
         yield session
         session.commit()
@@ -141,6 +270,7 @@ def session_scope() -> Generator[Session, None, None]:
         raise
     finally:
         session.close()
+        _scope_depth.reset(token)
 
 
 def create_tables() -> None:
@@ -160,6 +290,108 @@ def create_tables() -> None:
     except SQLAlchemyError as e:
         logger.error(f"Failed to create database tables: {e}")
         raise
+    
+    create_daily_ohlc_view(engine, continuous=is_hypertable(engine))
+
+
+def is_hypertable(engine) -> bool:
+    """
+    Check whether price_history is a TimescaleDB hypertable.
+    
+    The conversion is done by an Alembic migration when TIMESCALE_ENABLED is
+    set, never by create_tables().
+    
+    Args:
+        engine: SQLAlchemy Engine instance.
+    
+    Returns:
+        True if price_history is a hypertable, False otherwise.
+    """
+    if engine.dialect.name != 'postgresql':
+        return False
+    
+    try:
+        with engine.connect() as conn:
+            has_timescale = conn.execute(text(
+                "SELECT 1 FROM pg_extension WHERE extname = 'timescaledb'"
+            )).scalar()
+            if not has_timescale:
+                return False
+            return bool(conn.execute(text(
+                "SELECT 1 FROM timescaledb_information.hypertables "
+                "WHERE hypertable_name = 'price_history'"
+            )).scalar())
+    except SQLAlchemyError as e:
+        logger.warning(f"Failed to check TimescaleDB status of price_history: {e}")
+        return False
+
+
+def create_daily_ohlc_view(engine, continuous: bool = False) -> bool:
+    """
+    Create the mv_daily_ohlc rollup of price_history.
+    
+    One row per crypto and day with open, high, low and close prices and the
+    closing 24h volume. PostgreSQL only; other databases are skipped.
+    
+    Args:
+        engine: SQLAlchemy Engine instance.
+        continuous: Create a self-refreshing TimescaleDB continuous aggregate
+            (price_history must be a hypertable).
+    
+    Returns:
+        True if the view exists, False otherwise.
+    """
+    if engine.dialect.name != 'postgresql':
+        return False
+    
+    try:
+        # Continuous aggregates cannot be created or backfilled in a transaction
+        with engine.connect().execution_options(isolation_level='AUTOCOMMIT') as conn:
+            if continuous:
+                conn.execute(text(_DAILY_OHLC_CONTINUOUS_SQL))
+                conn.execute(text(
+                    "SELECT add_continuous_aggregate_policy('mv_daily_ohlc', "
+                    "start_offset => INTERVAL '3 days', end_offset => INTERVAL '1 hour', "
+                    "schedule_interval => INTERVAL '1 hour', if_not_exists => true)"
+                ))
+                conn.execute(text("CALL refresh_continuous_aggregate('mv_daily_ohlc', NULL, NULL)"))
+            else:
+                conn.execute(text(_DAILY_OHLC_SQL))
+                # REFRESH ... CONCURRENTLY requires a unique index
+                conn.execute(text(
+                    "CREATE UNIQUE INDEX IF NOT EXISTS idx_mv_daily_ohlc_crypto_day "
+                    "ON mv_daily_ohlc (crypto_id, day)"
+                ))
+        logger.info(f"Created {DAILY_OHLC_VIEW} view")
+        return True
+    except SQLAlchemyError as e:
+        logger.warning(f"Failed to create {DAILY_OHLC_VIEW} view: {e}")
+        return False
+
+
+def refresh_daily_ohlc() -> None:
+    """
+    Refresh mv_daily_ohlc after new prices are collected.
+    
+    Readers are not blocked during the refresh. Does nothing for a TimescaleDB
+    continuous aggregate (refreshed by its policy) or on other databases.
+    """
+    engine = get_engine()
+    if engine.dialect.name != 'postgresql':
+        return
+    
+    try:
+        with engine.begin() as conn:
+            # Continuous aggregates are not listed in pg_matviews
+            plain = conn.execute(text(
+                "SELECT 1 FROM pg_matviews WHERE matviewname = :name"
+            ), {'name': DAILY_OHLC_VIEW}).scalar()
+            if not plain:
+                return
+            conn.execute(text(f"REFRESH MATERIALIZED VIEW CONCURRENTLY {DAILY_OHLC_VIEW}"))
+        logger.info(f"Refreshed {DAILY_OHLC_VIEW}")
+    except SQLAlchemyError as e:
+        logger.warning(f"Failed to refresh {DAILY_OHLC_VIEW}: {e}")
 
 
 def drop_tables() -> None:
@@ -173,6 +405,10 @@ def drop_tables() -> None:
     """
     try:
         engine = get_engine()
+        if engine.dialect.name == 'postgresql':
+            # The rollup view depends on price_history
+            with engine.begin() as conn:
+                conn.execute(text(f"DROP MATERIALIZED VIEW IF EXISTS {DAILY_OHLC_VIEW}"))
         Base.metadata.drop_all(bind=engine)
         logger.warning("All database tables dropped")
     except SQLAlchemyError as e:
@@ -180,22 +416,61 @@ def drop_tables() -> None:
         raise
 
 
-def check_connection() -> bool:
+def vacuum_analyze(table_name: str) -> None:
+    """
+    Run VACUUM (ANALYZE) on a table after a bulk load.
+    
+    Keeps the visibility map current so covering indexes are used for
+    index-only scans, and refreshes planner statistics. PostgreSQL only;
+    other databases are skipped.
+    
+    Args:
+        table_name: Name of the table to vacuum.
+    """
+    engine = get_engine()
+    if engine.dialect.name != 'postgresql':
+        return
+    
+    try:
+        # VACUUM cannot run inside a transaction block
+        with engine.connect().execution_options(isolation_level='AUTOCOMMIT') as conn:
+            conn.execute(text(f'VACUUM (ANALYZE) "{table_name}"'))
+        logger.info(f"Vacuumed and analyzed {table_name}")
+    except SQLAlchemyError as e:
+        logger.warning(f"Failed to vacuum {table_name}: {e}")
+
+
+def check_connection(max_age_seconds: float = CONNECTION_CHECK_TTL_SECONDS) -> bool:
     """
     Check if database connection is working.
     
+    A result younger than max_age_seconds is returned without a round-trip.
+    
+    Args:
+        max_age_seconds: Maximum age of a cached result (0 forces a check)
+    
     Returns:
         True if connection is successful, False otherwise.
     """
+    global _last_check
+    
+    checked_at, ok = _last_check
+    now = time.monotonic()
+    if checked_at and now - checked_at < max_age_seconds:
+        return ok
+    
     try:
         engine = get_engine()
         with engine.connect() as conn:
-            conn.execute("SELECT 1")
+            conn.execute(text("SELECT 1"))
         logger.info("Database connection check successful")
-        return True
+        ok = True
     except Exception as e:
         logger.error(f"Database connection check failed: {e}")
-        return False
+        ok = False
+    
+    _last_check = (now, ok)
+    return ok
 
 
 def close_db() -> None:
@@ -204,10 +479,14 @@ def close_db() -> None:
     
     Should be called when shutting down the application.
     """
-    global _engine, _SessionFactory
+    global _engine, _SessionMaker, _SessionFactory, _last_check
+    
+    _last_check = (0.0, False)
     
     if _engine is not None:
+        remove_session()
         _engine.dispose()
         _engine = None
+        _SessionMaker = None
         _SessionFactory = None
         logger.info("Database connections closed")
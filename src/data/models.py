@@ -6,18 +6,33 @@ chat history, audit logs, and market tendencies.
 
 from datetime import datetime
 from decimal import Decimal
-from typing import Optional
+from typing import Any, Dict, List, Optional
 
 from sqlalchemy import (
-    Column, Integer, String, DateTime, Numeric, Boolean, Text,
-    ForeignKey, Index, JSON
+    Integer, BigInteger, String, DateTime, Numeric, Float, Boolean, Text, LargeBinary,
+    CheckConstraint, ForeignKey, Identity, Index, JSON, text
 )
-from sqlalchemy.orm import relationship
+from sqlalchemy.orm import Mapped, mapped_column, relationship, validates
 from sqlalchemy.sql import func
-from sqlalchemy.dialects.postgresql import ARRAY
+from sqlalchemy.dialects.postgresql import ARRAY, JSONB
 
 from src.data.database import Base
 
+# Binary JSON on PostgreSQL (decomposed, indexable); plain JSON elsewhere
+JSONType = JSON().with_variant(JSONB(), 'postgresql')
+
+# 64-bit ids for high-volume append tables; SQLite only autoincrements INTEGER
+BigIntegerId = BigInteger().with_variant(Integer(), 'sqlite')
+
+# Allowed values for constrained text columns
+TENDENCY_TYPES = ('bullish', 'bearish', 'volatile', 'stable', 'consolidating')
+SHIFT_TYPES = ('increase', 'decrease')
+
+
+def _in_values(column: str, values: tuple) -> str:
+    """Build a CHECK expression restricting a column to fixed values."""
+    return f"{column} IN ({', '.join(repr(v) for v in values)})"
+
 
 class Cryptocurrency(Base):
     """
@@ -26,16 +41,34 @@ class Cryptocurrency(Base):
     """
     __tablename__ = 'cryptocurrencies'
     
-    id = Column(Integer, primary_key=True, autoincrement=True)
-    symbol = Column(String(20), unique=True, nullable=False, index=True)
-    name = Column(String(100), nullable=False)
-    market_cap_rank = Column(Integer, nullable=True)
-    created_at = Column(DateTime, nullable=False, server_default=func.now())
-    updated_at = Column(DateTime, nullable=False, server_default=func.now(), onupdate=func.now())
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
+    symbol: Mapped[str] = mapped_column(String(20), unique=True, nullable=False, index=True)
+    name: Mapped[str] = mapped_column(String(100), nullable=False)
+    market_cap_rank: Mapped[Optional[int]] = mapped_column(Integer, nullable=True)
+    created_at: Mapped[datetime] = mapped_column(DateTime, nullable=False, server_default=func.now())
+    updated_at: Mapped[datetime] = mapped_column(DateTime, nullable=False, server_default=func.now(), onupdate=func.now())
     
-    # Relationships
-    price_history = relationship("PriceHistory", back_populates="cryptocurrency", cascade="all, delete-orphan")
-    predictions = relationship("Prediction", back_populates="cryptocurrency", cascade="all, delete-orphan")
+    # Relationships; the unbounded collections are never loaded implicitly
+    # (read them through the repositories) and deletes rely on the foreign
+    # keys' ON DELETE CASCADE.
+    price_history: Mapped[List["PriceHistory"]] = relationship(
+        back_populates="cryptocurrency",
+        cascade="all, delete-orphan",
+        order_by="PriceHistory.timestamp",
+        lazy="noload",
+        passive_deletes=True,
+    )
+    predictions: Mapped[List["Prediction"]] = relationship(
+        back_populates="cryptocurrency",
+        cascade="all, delete-orphan",
+        lazy="noload",
+        passive_deletes=True,
+    )
+    
+    @validates('symbol')
+    def _normalize_symbol(self, key: str, symbol: str) -> str:
+        """Store symbols upper-case so lookups are exact unique-index matches."""
+        return symbol.upper()
     
     def __repr__(self):
         return f"<Cryptocurrency(id={self.id}, symbol='{self.symbol}', name='{self.name}')>"
@@ -48,21 +81,38 @@ class PriceHistory(Base):
     """
     __tablename__ = 'price_history'
     
-    id = Column(Integer, primary_key=True, autoincrement=True)
-    crypto_id = Column(Integer, ForeignKey('cryptocurrencies.id', ondelete='CASCADE'), nullable=False)
-    timestamp = Column(DateTime, nullable=False)
-    price_usd = Column(Numeric(20, 8), nullable=False)
-    volume_24h = Column(Numeric(20, 2), nullable=True)
-    market_cap = Column(Numeric(20, 2), nullable=True)
-    created_at = Column(DateTime, nullable=False, server_default=func.now())
+    # ids come from the identity sequence, so they stay unique when the opt-in
+    # hypertable migration widens the database key to (id, timestamp)
+    id: Mapped[int] = mapped_column(BigIntegerId, Identity(cache=1000), primary_key=True)
+    crypto_id: Mapped[int] = mapped_column(Integer, ForeignKey('cryptocurrencies.id', ondelete='CASCADE'), nullable=False)
+    timestamp: Mapped[datetime] = mapped_column(DateTime, nullable=False)
+    # Prices and volumes are DOUBLE PRECISION: fixed-width and read as float
+    price_usd: Mapped[float] = mapped_column(Float, nullable=False)
+    volume_24h: Mapped[Optional[float]] = mapped_column(Float, nullable=True)
+    market_cap: Mapped[Optional[float]] = mapped_column(Float, nullable=True)
+    created_at: Mapped[datetime] = mapped_column(DateTime, nullable=False, server_default=func.now())
     
     # Relationships
-    cryptocurrency = relationship("Cryptocurrency", back_populates="price_history")
+    cryptocurrency: Mapped["Cryptocurrency"] = relationship(back_populates="price_history")
     
-    # Indexes for efficient querying
+    # Indexes for efficient querying; newest-first per crypto matches the
+    # "WHERE crypto_id = ? ... ORDER BY timestamp DESC" access pattern, and
+    # the included columns let feature loads run as index-only scans
     __table_args__ = (
-        Index('idx_price_history_crypto_timestamp', 'crypto_id', 'timestamp'),
-        Index('idx_price_history_timestamp', 'timestamp'),
+        Index(
+            'idx_price_history_crypto_ts_cov',
+            crypto_id,
+            timestamp.desc(),
+            postgresql_include=['price_usd', 'volume_24h'],
+        ),
+        # Rows arrive in timestamp order, so a BRIN index serves range scans
+        # at a fraction of a btree's size
+        Index(
+            'brin_price_history_ts',
+            'timestamp',
+            postgresql_using='brin',
+            postgresql_with={'pages_per_range': 32},
+        ),
         # Unique constraint to prevent duplicate entries
         Index('uq_price_history_crypto_timestamp', 'crypto_id', 'timestamp', unique=True),
     )
@@ -78,21 +128,34 @@ class Prediction(Base):
     """
     __tablename__ = 'predictions'
     
-    id = Column(Integer, primary_key=True, autoincrement=True)
-    crypto_id = Column(Integer, ForeignKey('cryptocurrencies.id', ondelete='CASCADE'), nullable=False)
-    prediction_date = Column(DateTime, nullable=False)
-    predicted_price = Column(Numeric(20, 8), nullable=True)
-    confidence_score = Column(Numeric(5, 4), nullable=True)
-    prediction_horizon_hours = Column(Integer, nullable=False, default=24)
-    created_at = Column(DateTime, nullable=False, server_default=func.now())
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
+    crypto_id: Mapped[int] = mapped_column(Integer, ForeignKey('cryptocurrencies.id', ondelete='CASCADE'), nullable=False)
+    prediction_date: Mapped[datetime] = mapped_column(DateTime, nullable=False)
+    predicted_price: Mapped[Optional[float]] = mapped_column(Float, nullable=True)
+    confidence_score: Mapped[Optional[float]] = mapped_column(Numeric(5, 4, asdecimal=False), nullable=True)
+    prediction_horizon_hours: Mapped[int] = mapped_column(Integer, nullable=False, default=24)
+    created_at: Mapped[datetime] = mapped_column(DateTime, nullable=False, server_default=func.now())
     
     # Relationships
-    cryptocurrency = relationship("Cryptocurrency", back_populates="predictions")
+    cryptocurrency: Mapped["Cryptocurrency"] = relationship(back_populates="predictions")
     
-    # Indexes for efficient querying
+    # Indexes for efficient querying; latest-per-crypto reads are index-only
     __table_args__ = (
-        Index('idx_predictions_crypto_date', 'crypto_id', 'prediction_date'),
+        Index(
+            'idx_predictions_crypto_date_desc_cov',
+            crypto_id,
+            prediction_date.desc(),
+            postgresql_include=['predicted_price', 'confidence_score'],
+        ),
         Index('idx_predictions_date', 'prediction_date'),
+        # Top performers: highest confidence on a given date
+        Index(
+            'idx_predictions_date_confidence',
+            prediction_date,
+            confidence_score.desc(),
+            postgresql_where=confidence_score.isnot(None),
+        ),
+        CheckConstraint('confidence_score BETWEEN 0 AND 1', name='ck_predictions_confidence'),
     )
     
     def __repr__(self):
@@ -106,29 +169,63 @@ class ChatHistory(Base):
     """
     __tablename__ = 'chat_history'
     
-    id = Column(Integer, primary_key=True, autoincrement=True)
-    session_id = Column(String(100), nullable=False, index=True)
-    question = Column(Text, nullable=False)
-    answer = Column(Text, nullable=False)
-    question_hash = Column(String(64), nullable=True)  # SHA256 hash for deduplication
-    topic_valid = Column(Boolean, nullable=False, default=True)
-    pii_detected = Column(Boolean, nullable=False, default=False)
-    context_used = Column(JSON, nullable=True)  # LSTM predictions and data used
-    openai_tokens_input = Column(Integer, nullable=True)
-    openai_tokens_output = Column(Integer, nullable=True)
-    openai_cost_usd = Column(Numeric(10, 6), nullable=True)
-    response_time_ms = Column(Integer, nullable=True)
-    created_at = Column(DateTime, nullable=False, server_default=func.now())
+    id: Mapped[int] = mapped_column(BigIntegerId, Identity(cache=1000), primary_key=True)
+    session_id: Mapped[str] = mapped_column(String(100), nullable=False)
+    question: Mapped[str] = mapped_column(Text, nullable=False)
+    answer: Mapped[str] = mapped_column(Text, nullable=False)
+    question_hash: Mapped[Optional[bytes]] = mapped_column(LargeBinary(32), nullable=True)  # Raw SHA256 digest for deduplication
+    topic_valid: Mapped[bool] = mapped_column(Boolean, nullable=False, default=True)
+    pii_detected: Mapped[bool] = mapped_column(Boolean, nullable=False, default=False)
+    context_used: Mapped[Optional[Dict[str, Any]]] = mapped_column(JSONType, nullable=True)  # LSTM predictions and data used
+    openai_tokens_input: Mapped[Optional[int]] = mapped_column(Integer, nullable=True)
+    openai_tokens_output: Mapped[Optional[int]] = mapped_column(Integer, nullable=True)
+    openai_cost_usd: Mapped[Optional[Decimal]] = mapped_column(Numeric(10, 6), nullable=True)
+    response_time_ms: Mapped[Optional[int]] = mapped_column(Integer, nullable=True)
+    created_at: Mapped[datetime] = mapped_column(DateTime, nullable=False, server_default=func.now())
     
     # Relationships
-    audit_logs = relationship("QueryAuditLog", back_populates="chat_history", cascade="all, delete-orphan")
+    audit_logs: Mapped[List["QueryAuditLog"]] = relationship(back_populates="chat_history", cascade="all, delete-orphan")
     
     # Indexes for efficient querying
     __table_args__ = (
-        Index('idx_chat_history_session_created', 'session_id', 'created_at'),
-        Index('idx_chat_history_created', 'created_at'),
+        # Newest-first per session; session statistics are read index-only
+        Index(
+            'idx_chat_history_session_created_desc_cov',
+            session_id,
+            created_at.desc(),
+            id.desc(),
+            postgresql_include=[
+                'openai_cost_usd',
+                'openai_tokens_input',
+                'openai_tokens_output',
+                'response_time_ms',
+            ],
+        ),
+        Index(
+            'brin_chat_history_created',
+            'created_at',
+            postgresql_using='brin',
+            postgresql_with={'pages_per_range': 32},
+        ),
+        Index(
+            'idx_chat_history_question_hash',
+            'question_hash',
+            'created_at',
+            postgresql_where=question_hash.isnot(None),
+        ),
+        Index(
+            'idx_chat_context_gin',
+            'context_used',
+            postgresql_using='gin',
+            postgresql_ops={'context_used': 'jsonb_path_ops'},
+        ),
     )
     
+    @property
+    def question_hash_hex(self) -> Optional[str]:
+        """Question hash as a hex string, for logs and debugging."""
+        return self.question_hash.hex() if self.question_hash is not None else None
+    
     def __repr__(self):
         return f"<ChatHistory(id={self.id}, session='{self.session_id}', created={self.created_at})>"
 
@@ -137,28 +234,43 @@ class QueryAuditLog(Base):
     """
     Query audit log model for security and compliance.
     Tracks all queries with PII detection and validation results.
+    
+    On PostgreSQL the migrations hash-partition this table on session_id
+    (primary key (id, session_id)); ids remain unique via their sequence.
     """
     __tablename__ = 'query_audit_log'
     
-    id = Column(Integer, primary_key=True, autoincrement=True)
-    session_id = Column(String(100), nullable=False, index=True)
-    chat_history_id = Column(Integer, ForeignKey('chat_history.id', ondelete='CASCADE'), nullable=True)
-    question_sanitized = Column(Text, nullable=True)  # Question with PII removed
-    pii_patterns_detected = Column(JSON, nullable=True)  # Array of PII types found (stored as JSON for compatibility)
-    topic_validation_result = Column(String(50), nullable=True)
-    ip_address = Column(String(45), nullable=True)  # IPv4 or IPv6
-    user_agent = Column(Text, nullable=True)
-    rejected = Column(Boolean, nullable=False, default=False)
-    rejection_reason = Column(String(200), nullable=True)
-    created_at = Column(DateTime, nullable=False, server_default=func.now())
+    id: Mapped[int] = mapped_column(BigIntegerId, Identity(cache=1000), primary_key=True)
+    session_id: Mapped[str] = mapped_column(String(100), nullable=False, index=True)
+    chat_history_id: Mapped[Optional[int]] = mapped_column(BigIntegerId, ForeignKey('chat_history.id', ondelete='CASCADE'), nullable=True)
+    question_sanitized: Mapped[Optional[str]] = mapped_column(Text, nullable=True)  # Question with PII removed
+    # Array of PII types found; native VARCHAR[] on PostgreSQL, JSON elsewhere
+    pii_patterns_detected: Mapped[Optional[List[str]]] = mapped_column(
+        JSON().with_variant(ARRAY(String(32)), 'postgresql'),
+        nullable=True
+    )
+    topic_validation_result: Mapped[Optional[str]] = mapped_column(String(50), nullable=True)
+    ip_address: Mapped[Optional[str]] = mapped_column(String(45), nullable=True)  # IPv4 or IPv6
+    user_agent: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
+    rejected: Mapped[bool] = mapped_column(Boolean, nullable=False, default=False)
+    rejection_reason: Mapped[Optional[str]] = mapped_column(String(200), nullable=True)
+    created_at: Mapped[datetime] = mapped_column(DateTime, nullable=False, server_default=func.now())
     
     # Relationships
-    chat_history = relationship("ChatHistory", back_populates="audit_logs")
+    chat_history: Mapped[Optional["ChatHistory"]] = relationship(back_populates="audit_logs")
     
     # Indexes for efficient querying
     __table_args__ = (
         Index('idx_audit_log_session_created', 'session_id', 'created_at'),
-        Index('idx_audit_log_rejected_created', 'rejected', 'created_at'),
+        # Partial index: rejected queries are a small fraction of the table
+        Index('idx_audit_log_rejected_recent', created_at.desc(), postgresql_where=rejected),
+        # Partial index: newest PII detections for the admin review list
+        Index(
+            'idx_audit_log_pii_recent',
+            created_at.desc(),
+            postgresql_where=pii_patterns_detected.isnot(None)
+        ),
+        Index('idx_audit_pii_patterns', 'pii_patterns_detected', postgresql_using='gin'),
     )
     
     def __repr__(self):
@@ -172,17 +284,19 @@ class MarketTendency(Base):
     """
     __tablename__ = 'market_tendencies'
     
-    id = Column(Integer, primary_key=True, autoincrement=True)
-    tendency = Column(String(50), nullable=False)  # bullish, bearish, volatile, stable, consolidating
-    confidence = Column(Numeric(5, 4), nullable=True)
-    metrics = Column(JSON, nullable=True)  # Additional metrics as JSON
-    timestamp = Column(DateTime, nullable=False)
-    created_at = Column(DateTime, nullable=False, server_default=func.now())
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
+    tendency: Mapped[str] = mapped_column(String(50), nullable=False)  # One of TENDENCY_TYPES
+    confidence: Mapped[Optional[float]] = mapped_column(Numeric(5, 4, asdecimal=False), nullable=True)
+    metrics: Mapped[Optional[Dict[str, Any]]] = mapped_column(JSONType, nullable=True)  # Additional metrics as JSON
+    timestamp: Mapped[datetime] = mapped_column(DateTime, nullable=False)
+    created_at: Mapped[datetime] = mapped_column(DateTime, nullable=False, server_default=func.now())
     
     # Indexes for efficient querying
     __table_args__ = (
         Index('idx_market_tendency_timestamp', 'timestamp'),
         Index('idx_market_tendency_created', 'created_at'),
+        CheckConstraint(_in_values('tendency', TENDENCY_TYPES), name='ck_market_tendency_tendency'),
+        CheckConstraint('confidence BETWEEN 0 AND 1', name='ck_market_tendency_confidence'),
     )
     
     def __repr__(self):
@@ -196,29 +310,39 @@ class AlertLog(Base):
     """
     __tablename__ = 'alert_logs'
     
-    id = Column(Integer, primary_key=True, autoincrement=True)
-    crypto_id = Column(Integer, ForeignKey('cryptocurrencies.id', ondelete='CASCADE'), nullable=False)
-    shift_type = Column(String(20), nullable=False)  # 'increase' or 'decrease'
-    change_percent = Column(Numeric(10, 2), nullable=False)
-    previous_price = Column(Numeric(20, 8), nullable=False)
-    current_price = Column(Numeric(20, 8), nullable=False)
-    alert_message = Column(Text, nullable=False)
-    recipient_number = Column(String(20), nullable=False)
-    sms_provider = Column(String(20), nullable=False)  # 'twilio' or 'aws_sns'
-    sms_message_id = Column(String(100), nullable=True)
-    success = Column(Boolean, nullable=False, default=False)
-    error_message = Column(Text, nullable=True)
-    timestamp = Column(DateTime, nullable=False)
-    created_at = Column(DateTime, nullable=False, server_default=func.now())
+    id: Mapped[int] = mapped_column(BigIntegerId, Identity(cache=1000), primary_key=True)
+    crypto_id: Mapped[int] = mapped_column(Integer, ForeignKey('cryptocurrencies.id', ondelete='CASCADE'), nullable=False)
+    shift_type: Mapped[str] = mapped_column(String(20), nullable=False)  # One of SHIFT_TYPES
+    change_percent: Mapped[float] = mapped_column(Float, nullable=False)
+    previous_price: Mapped[float] = mapped_column(Float, nullable=False)
+    current_price: Mapped[float] = mapped_column(Float, nullable=False)
+    alert_message: Mapped[str] = mapped_column(Text, nullable=False)
+    recipient_number: Mapped[str] = mapped_column(String(20), nullable=False)
+    sms_provider: Mapped[str] = mapped_column(String(20), nullable=False)  # 'twilio' or 'aws_sns'
+    sms_message_id: Mapped[Optional[str]] = mapped_column(String(100), nullable=True)
+    success: Mapped[bool] = mapped_column(Boolean, nullable=False, default=False)
+    error_message: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
+    timestamp: Mapped[datetime] = mapped_column(DateTime, nullable=False)
+    created_at: Mapped[datetime] = mapped_column(DateTime, nullable=False, server_default=func.now())
     
     # Relationships
-    cryptocurrency = relationship("Cryptocurrency")
+    cryptocurrency: Mapped["Cryptocurrency"] = relationship()
     
     # Indexes for efficient querying
     __table_args__ = (
-        Index('idx_alert_log_crypto_timestamp', 'crypto_id', 'timestamp'),
+        Index('idx_alert_log_crypto_timestamp_desc', 'crypto_id', timestamp.desc()),
         Index('idx_alert_log_timestamp', 'timestamp'),
-        Index('idx_alert_log_success', 'success', 'created_at'),
+        # Partial indexes: failures for monitoring, successes for per-crypto history
+        Index('idx_alert_log_failed_recent', 'created_at', postgresql_where=text('success = false')),
+        Index(
+            'idx_alert_log_crypto_ts_success',
+            'crypto_id',
+            'timestamp',
+            postgresql_where=text('success = true'),
+        ),
+        CheckConstraint(_in_values('shift_type', SHIFT_TYPES), name='ck_alert_log_shift_type'),
+        # A price cannot fall by more than 100%
+        CheckConstraint('change_percent >= -100', name='ck_alert_log_change_percent'),
     )
     
     def __repr__(self):
@@ -0,0 +1,96 @@
+"""
+In-process cache of the latest price per cryptocurrency.
+Serves hot "current price" reads without a database round-trip.
+"""
+
+import logging
+from dataclasses import dataclass, fields
+from datetime import datetime
+from decimal import Decimal
+from typing import Any, Dict, Iterable, List, Mapping, Optional
+
+from sqlalchemy.orm import Session
+
+from src.data.session_cache import SessionCache
+
+logger = logging.getLogger(__name__)
+
+# Seconds an entry is served before re-reading the database. Bounds staleness
+# for writes made by other processes (e.g. the collector service).
+DEFAULT_TTL_SECONDS = 60
+
+
+@dataclass(frozen=True)
+class LatestPrice:
+    """Latest price of a cryptocurrency, detached from any session."""
+    crypto_id: int
+    timestamp: datetime
+    price_usd: Decimal
+    volume_24h: Optional[Decimal] = None
+    market_cap: Optional[Decimal] = None
+    
+    @classmethod
+    def from_record(cls, record: Mapping[str, Any]) -> 'LatestPrice':
+        """
+        Build from a price record.
+        
+        Args:
+            record: Dictionary with the PriceHistory columns crypto_id,
+                timestamp and price_usd, and optionally volume_24h and
+                market_cap
+        
+        Returns:
+            LatestPrice instance
+        """
+        return cls(**{field.name: record.get(field.name) for field in fields(cls)})
+
+
+def _refresh(records: List[Mapping[str, Any]]) -> None:
+    """
+    Update cached entries with committed price records.
+    
+    Only cryptocurrencies already cached are updated, and only with newer
+    timestamps, so backfills of old data never replace the latest price.
+    """
+    newest: Dict[int, Mapping[str, Any]] = {}
+    for record in records:
+        current = newest.get(record['crypto_id'])
+        if current is None or current['timestamp'] < record['timestamp']:
+            newest[record['crypto_id']] = record
+    
+    for crypto_id, record in newest.items():
+        price = LatestPrice.from_record(record)
+        latest_price_cache.put(
+            crypto_id,
+            price,
+            replaces=lambda current, price=price: current is not None and current.timestamp <= price.timestamp
+        )
+
+
+# Entries are keyed by crypto_id and hold LatestPrice values
+latest_price_cache = SessionCache('latest_price', DEFAULT_TTL_SECONDS, on_commit=_refresh)
+
+
+def cache_latest_price(price: LatestPrice) -> None:
+    """
+    Store a latest price read from the database unless a newer one is cached.
+    
+    Args:
+        price: Latest price of its crypto_id
+    """
+    latest_price_cache.put(
+        price.crypto_id,
+        price,
+        replaces=lambda current: current is None or current.timestamp <= price.timestamp
+    )
+
+
+def stage_latest_prices(session: Session, records: Iterable[Mapping[str, Any]]) -> None:
+    """
+    Queue ingested price records to refresh the cache once session commits.
+    
+    Args:
+        session: Session the records were written with
+        records: Ingested price records
+    """
+    latest_price_cache.stage(session, records)
@@ -3,15 +3,31 @@ Repository pattern implementation for data access.
 Provides clean interfaces for CRUD operations on all entities.
 """
 
+import io
 import logging
+from collections import OrderedDict
 from datetime import datetime
 from decimal import Decimal
-from typing import List, Optional, Dict, Any
+from itertools import islice
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
 
-from sqlalchemy import desc, asc, and_, or_, func
+import numpy as np
+import pandas as pd
+from sqlalchemy import Float, Select, bindparam, desc, asc, and_, or_, func, insert, select, text, tuple_
+from sqlalchemy.engine import Row
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
 from sqlalchemy.orm import Session
-from sqlalchemy.exc import IntegrityError
 
+from src.data.chat_history_cache import (
+    recent_history_cache,
+    invalidate_recent_history,
+    has_pending_history,
+    is_known_empty,
+)
+from src.data.price_cache import LatestPrice, latest_price_cache, cache_latest_price, stage_latest_prices
+from src.data.tendency_cache import LatestTendency, latest_tendency_cache, invalidate_latest_tendency
+from src.data.top_performers_cache import TopPerformer, top_performers_cache, invalidate_top_performers
 from src.data.models import (
     Cryptocurrency,
     PriceHistory,
@@ -24,10 +40,178 @@ from src.data.models import (
 
 logger = logging.getLogger(__name__)
 
+# Dialect-specific INSERT constructs supporting ON CONFLICT DO NOTHING
+_UPSERT_INSERTS = {
+    'postgresql': pg_insert,
+    'sqlite': sqlite_insert,
+}
+
+# Rows removed per transaction by retention cleanup
+RETENTION_DELETE_BATCH_SIZE = 5000
+
+# Rows per bulk_create batch, bounding memory for large or streamed inputs.
+# PostgreSQL batches are large enough to be loaded with COPY; SQLite and
+# SQL Server keep rows x columns under their bind parameter limits.
+BULK_BATCH_SIZES = {
+    'postgresql': 100_000,
+    'mysql': 10_000,
+    'mariadb': 10_000,
+    'sqlite': 500,
+    'mssql': 400,
+}
+DEFAULT_BULK_BATCH_SIZE = 1000
+
+# Rows fetched per round trip when streaming time ranges
+STREAM_BATCH_SIZE = 10_000
+
+# Chat rows carry full question and answer text, so stream fewer at a time
+CHAT_STREAM_BATCH_SIZE = 200
+
+
+def _chunked(records: Iterable[Dict[str, Any]], size: int) -> Iterator[List[Dict[str, Any]]]:
+    """
+    Split records into lists of at most size items without materializing them.
+    
+    Args:
+        records: Records to split (any iterable, including generators).
+        size: Maximum batch length.
+    
+    Yields:
+        Lists of consecutive records.
+    """
+    iterator = iter(records)
+    while batch := list(islice(iterator, size)):
+        yield batch
+
+
+def _bulk_batch_size(dialect: str) -> int:
+    """Get the bulk insert batch size for a database dialect name."""
+    return BULK_BATCH_SIZES.get(dialect, DEFAULT_BULK_BATCH_SIZE)
+
+
+def _copy_rows(
+    session: Session,
+    table: str,
+    columns: Tuple[str, ...],
+    records: List[Dict[str, Any]]
+) -> None:
+    """
+    Stream records into a PostgreSQL table with COPY FROM STDIN.
+    
+    Values are written in COPY's text format, so they must not contain tabs,
+    newlines or backslashes; numbers and datetimes are safe.
+    
+    Args:
+        session: Session bound to a PostgreSQL engine.
+        table: Target table name.
+        columns: Columns to load, in order.
+        records: Dictionaries keyed by column; missing keys load as NULL.
+    """
+    buf = io.StringIO()
+    for record in records:
+        buf.write('\t'.join(
+            '\\N' if record.get(c) is None else str(record[c])
+            for c in columns
+        ))
+        buf.write('\n')
+    buf.seek(0)
+    
+    conn = session.connection()
+    column_list = ', '.join(f'"{c}"' for c in columns)
+    copy_sql = f"COPY {table} ({column_list}) FROM STDIN"
+    cursor = conn.connection.dbapi_connection.cursor()
+    try:
+        if conn.dialect.driver == 'psycopg':
+            with cursor.copy(copy_sql) as copy:
+                copy.write(buf.getvalue())
+        else:
+            cursor.copy_expert(copy_sql, buf)
+    finally:
+        cursor.close()
+
+
+# Per-crypto lookups run on every scheduler tick and API request. Built once
+# so each call reuses the same statement object and its cached compilation.
+_LATEST_TIMESTAMP = select(PriceHistory.timestamp)\
+    .where(PriceHistory.crypto_id == bindparam('crypto_id'))\
+    .order_by(desc(PriceHistory.timestamp))\
+    .limit(1)
+_EARLIEST_TIMESTAMP = select(PriceHistory.timestamp)\
+    .where(PriceHistory.crypto_id == bindparam('crypto_id'))\
+    .order_by(asc(PriceHistory.timestamp))\
+    .limit(1)
+_LATEST_PRICE = select(PriceHistory)\
+    .where(PriceHistory.crypto_id == bindparam('crypto_id'))\
+    .order_by(desc(PriceHistory.timestamp))\
+    .limit(1)
+
+
+def _estimated_count(session: Session, model) -> int:
+    """
+    Get a table's row count from planner statistics where available.
+    
+    On PostgreSQL this reads pg_class.reltuples, kept current by (auto)ANALYZE,
+    instead of scanning the table. Other databases, and tables never analyzed,
+    fall back to an exact count.
+    
+    Args:
+        session: Database session.
+        model: Mapped model class.
+    
+    Returns:
+        Approximate number of rows.
+    """
+    if session.get_bind().dialect.name == 'postgresql':
+        estimate = session.execute(
+            text("SELECT reltuples::bigint FROM pg_class WHERE oid = to_regclass(:table)"),
+            {'table': model.__tablename__}
+        ).scalar()
+        if estimate is not None and estimate >= 0:
+            return estimate
+    return session.query(func.count()).select_from(model).scalar()
+
+
+def delete_before(session: Session, model, cutoff_date: datetime, batch_size: int) -> int:
+    """
+    Delete rows created before a cutoff in short, separately committed batches.
+    
+    Keeps each transaction's locks and WAL volume bounded, so cleanup of a
+    large backlog does not stall concurrent inserts.
+    
+    Args:
+        session: SQLAlchemy session instance.
+        model: Mapped class with id and created_at columns.
+        cutoff_date: Rows created before this time are deleted.
+        batch_size: Maximum rows deleted per transaction.
+    
+    Returns:
+        Number of records deleted.
+    """
+    deleted_count = 0
+    while True:
+        batch_ids = session.query(model.id)\
+            .filter(model.created_at < cutoff_date)\
+            .limit(batch_size)\
+            .scalar_subquery()
+        deleted = session.query(model)\
+            .filter(model.id.in_(batch_ids))\
+            .delete(synchronize_session=False)
+        session.commit()
+        
+        deleted_count += deleted
+        if deleted < batch_size:
+            return deleted_count
+
 
 class CryptoRepository:
     """Repository for Cryptocurrency CRUD operations."""
     
+    # Most symbol -> id mappings remembered per repository instance
+    SYMBOL_CACHE_SIZE = 512
+    
+    # Columns update() may set
+    UPDATABLE_COLUMNS = frozenset(Cryptocurrency.__table__.columns.keys()) - {'id'}
+    
     def __init__(self, session: Session):
         """
         Initialize repository with database session.
@@ -36,6 +220,10 @@ class CryptoRepository:
             session: SQLAlchemy session instance.
         """
         self.session = session
+        self._dialect = session.get_bind().dialect.name
+        # Ids rather than objects are cached; session.get() then resolves them
+        # from the identity map without a query
+        self._symbol_ids: "OrderedDict[str, int]" = OrderedDict()
     
     def create(self, symbol: str, name: str, market_cap_rank: Optional[int] = None) -> Cryptocurrency:
         """
@@ -53,22 +241,120 @@ class CryptoRepository:
             IntegrityError: If cryptocurrency with symbol already exists.
         """
         crypto = Cryptocurrency(
-            symbol=symbol.upper(),
+            symbol=symbol,
             name=name,
             market_cap_rank=market_cap_rank
         )
         self.session.add(crypto)
         self.session.flush()
+        self._remember(crypto)
         logger.debug(f"Created cryptocurrency: {symbol}")
         return crypto
     
     def get_by_id(self, crypto_id: int) -> Optional[Cryptocurrency]:
-        """Get cryptocurrency by ID."""
-        return self.session.query(Cryptocurrency).filter_by(id=crypto_id).first()
+        """Get cryptocurrency by ID (from the session's identity map when loaded)."""
+        return self.session.get(Cryptocurrency, crypto_id)
     
     def get_by_symbol(self, symbol: str) -> Optional[Cryptocurrency]:
-        """Get cryptocurrency by symbol."""
-        return self.session.query(Cryptocurrency).filter_by(symbol=symbol.upper()).first()
+        """Get cryptocurrency by symbol (case-insensitive via the stored upper-case form)."""
+        symbol = symbol.upper()
+        crypto_id = self._symbol_ids.get(symbol)
+        if crypto_id is not None:
+            crypto = self.session.get(Cryptocurrency, crypto_id)
+            if crypto is not None and crypto.symbol == symbol:
+                self._symbol_ids.move_to_end(symbol)
+                return crypto
+            del self._symbol_ids[symbol]
+        
+        crypto = self.session.query(Cryptocurrency).filter_by(symbol=symbol).first()
+        if crypto is not None:
+            self._remember(crypto)
+        return crypto
+    
+    def get_by_symbols(self, symbols: Iterable[str]) -> Dict[str, Cryptocurrency]:
+        """
+        Get several cryptocurrencies by symbol in one query.
+        
+        Args:
+            symbols: Cryptocurrency symbols (case-insensitive).
+        
+        Returns:
+            Dictionary mapping upper-case symbols to Cryptocurrency instances;
+            unknown symbols are absent.
+        """
+        wanted = list(dict.fromkeys(symbol.upper() for symbol in symbols))
+        if not wanted:
+            return {}
+        
+        cryptos = self.session.query(Cryptocurrency)\
+            .filter(Cryptocurrency.symbol.in_(wanted))\
+            .all()
+        for crypto in cryptos:
+            self._remember(crypto)
+        return {crypto.symbol: crypto for crypto in cryptos}
+    
+    def bulk_get_or_create(
+        self,
+        cryptos: Iterable[Tuple[str, str, Optional[int]]]
+    ) -> Dict[str, int]:
+        """
+        Resolve many symbols to ids, creating the missing cryptocurrencies.
+        
+        Uses one SELECT for existing symbols and one INSERT ... ON CONFLICT
+        DO NOTHING for the rest, instead of a get_or_create per symbol.
+        Existing ranks are not updated.
+        
+        Args:
+            cryptos: (symbol, name, market_cap_rank) tuples.
+        
+        Returns:
+            Dictionary mapping upper-case symbols to cryptocurrency IDs.
+        """
+        wanted = {symbol.upper(): (name, rank) for symbol, name, rank in cryptos}
+        if not wanted:
+            return {}
+        
+        existing = self.session.query(Cryptocurrency.symbol, Cryptocurrency.id)\
+            .filter(Cryptocurrency.symbol.in_(list(wanted)))\
+            .all()
+        ids = dict(existing)
+        missing = [
+            {'symbol': symbol, 'name': name, 'market_cap_rank': rank}
+            for symbol, (name, rank) in wanted.items()
+            if symbol not in ids
+        ]
+        
+        upsert_insert = _UPSERT_INSERTS.get(self._dialect)
+        if missing and upsert_insert is not None:
+            stmt = upsert_insert(Cryptocurrency)\
+                .on_conflict_do_nothing(index_elements=['symbol'])\
+                .returning(Cryptocurrency.symbol, Cryptocurrency.id)
+            ids.update(self.session.execute(stmt, missing).all())
+            
+            # Rows inserted concurrently by another session are not returned
+            raced = [row['symbol'] for row in missing if row['symbol'] not in ids]
+            if raced:
+                concurrent = self.session.query(Cryptocurrency.symbol, Cryptocurrency.id)\
+                    .filter(Cryptocurrency.symbol.in_(raced))\
+                    .all()
+                ids.update(concurrent)
+        elif missing:
+            for row in missing:
+                ids[row['symbol']] = self.create(**row).id
+        
+        for symbol, crypto_id in ids.items():
+            self._symbol_ids[symbol] = crypto_id
+            self._symbol_ids.move_to_end(symbol)
+        while len(self._symbol_ids) > self.SYMBOL_CACHE_SIZE:
+            self._symbol_ids.popitem(last=False)
+        return ids
+    
+    def _remember(self, crypto: Cryptocurrency) -> None:
+        """Cache a symbol's id, evicting the least recently used beyond the limit."""
+        self._symbol_ids[crypto.symbol] = crypto.id
+        self._symbol_ids.move_to_end(crypto.symbol)
+        if len(self._symbol_ids) > self.SYMBOL_CACHE_SIZE:
+            self._symbol_ids.popitem(last=False)
     
     def get_or_create(self, symbol: str, name: str, market_cap_rank: Optional[int] = None) -> Cryptocurrency:
         """
@@ -82,14 +368,57 @@ class CryptoRepository:
         Returns:
             Cryptocurrency instance.
         """
-        crypto = self.get_by_symbol(symbol)
-        if crypto is None:
-            crypto = self.create(symbol, name, market_cap_rank)
-        else:
-            # Update market cap rank if provided
-            if market_cap_rank is not None and crypto.market_cap_rank != market_cap_rank:
+        symbol = symbol.upper()
+        
+        # Known symbol with nothing to update: no statement needed
+        if symbol in self._symbol_ids:
+            crypto = self.get_by_symbol(symbol)
+            if crypto is not None and market_cap_rank in (None, crypto.market_cap_rank):
+                return crypto
+        
+        upsert_insert = _UPSERT_INSERTS.get(self._dialect)
+        if upsert_insert is None:
+            crypto = self.get_by_symbol(symbol)
+            if crypto is None:
+                crypto = self.create(symbol, name, market_cap_rank)
+            elif market_cap_rank is not None and crypto.market_cap_rank != market_cap_rank:
                 crypto.market_cap_rank = market_cap_rank
                 self.session.flush()
+            return crypto
+        
+        # Without a rank an existing row never changes: read it, don't upsert
+        if market_cap_rank is None:
+            crypto = self.get_by_symbol(symbol)
+            if crypto is not None:
+                return crypto
+        
+        # One round trip: insert, or update a changed rank, returning the row.
+        # Unchanged rows are not rewritten, so updated_at keeps its value.
+        stmt = upsert_insert(Cryptocurrency).values(
+            symbol=symbol,
+            name=name,
+            market_cap_rank=market_cap_rank
+        )
+        stmt = stmt.on_conflict_do_update(
+            index_elements=['symbol'],
+            set_={
+                'market_cap_rank': stmt.excluded.market_cap_rank,
+                'updated_at': func.now(),
+            },
+            where=and_(
+                stmt.excluded.market_cap_rank.isnot(None),
+                stmt.excluded.market_cap_rank.is_distinct_from(Cryptocurrency.market_cap_rank)
+            )
+        ).returning(Cryptocurrency)
+        crypto = self.session.scalars(
+            stmt,
+            execution_options={'populate_existing': True}
+        ).one_or_none()
+        if crypto is None:
+            # Conflict left the row as it was; RETURNING yields nothing
+            crypto = self.get_by_symbol(symbol)
+        else:
+            self._remember(crypto)
         return crypto
     
     def get_all(self, limit: Optional[int] = None) -> List[Cryptocurrency]:
@@ -129,16 +458,23 @@ class CryptoRepository:
         
         Args:
             crypto_id: Cryptocurrency ID.
-            **kwargs: Fields to update.
+            **kwargs: Column values to update.
         
         Returns:
             Updated Cryptocurrency instance or None if not found.
+        
+        Raises:
+            ValueError: If a keyword is not an updatable column.
         """
+        unknown = kwargs.keys() - self.UPDATABLE_COLUMNS
+        if unknown:
+            raise ValueError(f"Cannot update cryptocurrency fields: {', '.join(sorted(unknown))}")
+        
         crypto = self.get_by_id(crypto_id)
         if crypto:
+            self._symbol_ids.pop(crypto.symbol, None)
             for key, value in kwargs.items():
-                if hasattr(crypto, key):
-                    setattr(crypto, key, value)
+                setattr(crypto, key, value)
             self.session.flush()
             logger.debug(f"Updated cryptocurrency: {crypto_id}")
         return crypto
@@ -155,6 +491,7 @@ class CryptoRepository:
         """
         crypto = self.get_by_id(crypto_id)
         if crypto:
+            self._symbol_ids.pop(crypto.symbol, None)
             self.session.delete(crypto)
             self.session.flush()
             logger.debug(f"Deleted cryptocurrency: {crypto_id}")
@@ -173,6 +510,7 @@ class PriceHistoryRepository:
             session: SQLAlchemy session instance.
         """
         self.session = session
+        self._dialect = session.get_bind().dialect.name
     
     def create(
         self,
@@ -180,7 +518,8 @@ class PriceHistoryRepository:
         timestamp: datetime,
         price_usd: Decimal,
         volume_24h: Optional[Decimal] = None,
-        market_cap: Optional[Decimal] = None
+        market_cap: Optional[Decimal] = None,
+        flush: bool = False
     ) -> PriceHistory:
         """
         Create a new price history record.
@@ -191,12 +530,14 @@ class PriceHistoryRepository:
             price_usd: Price in USD.
             volume_24h: 24-hour trading volume.
             market_cap: Market capitalization.
+            flush: Flush now so the instance's id is available before commit.
         
         Returns:
             Created PriceHistory instance.
         
         Raises:
-            IntegrityError: If record with same crypto_id and timestamp exists.
+            IntegrityError: If record with same crypto_id and timestamp exists
+                (raised when the session flushes).
         """
         price = PriceHistory(
             crypto_id=crypto_id,
@@ -206,12 +547,46 @@ class PriceHistoryRepository:
             market_cap=market_cap
         )
         self.session.add(price)
-        self.session.flush()
+        if flush:
+            self.session.flush()
+        stage_latest_prices(self.session, [self._snapshot(price)])
         return price
     
-    def bulk_create(self, price_records: List[Dict[str, Any]]) -> int:
+    # Batches at least this large are loaded with COPY on PostgreSQL
+    COPY_THRESHOLD = 100_000
+    
+    BULK_COLUMNS = ('crypto_id', 'timestamp', 'price_usd', 'volume_24h', 'market_cap')
+    
+    def bulk_create(self, price_records: Iterable[Dict[str, Any]]) -> int:
         """
-        Bulk create price history records.
+        Bulk create price history records, skipping existing ones.
+        
+        Records are written in dialect-sized batches (see BULK_BATCH_SIZES),
+        so generators are streamed rather than loaded whole.
+        
+        Args:
+            price_records: Dictionaries with price data.
+        
+        Returns:
+            Number of records created.
+        
+        Raises:
+            IntegrityError: On dialects without conflict handling, if a
+                record already exists.
+        """
+        count = 0
+        for batch in _chunked(price_records, _bulk_batch_size(self._dialect)):
+            count += self._insert_batch(batch)
+        return count
+    
+    def _insert_batch(self, price_records: List[Dict[str, Any]]) -> int:
+        """
+        Insert one batch of price records, skipping existing ones.
+        
+        Rows are sent as a single multi-row INSERT ... ON CONFLICT DO NOTHING
+        (INSERT IGNORE on MySQL), batched by the engine's
+        insertmanyvalues_page_size; PostgreSQL batches of COPY_THRESHOLD rows
+        or more are streamed with COPY instead.
         
         Args:
             price_records: List of dictionaries with price data.
@@ -219,24 +594,57 @@ class PriceHistoryRepository:
         Returns:
             Number of records created.
         """
-        try:
-            objects = [PriceHistory(**record) for record in price_records]
-            self.session.bulk_save_objects(objects)
-            self.session.flush()
-            logger.debug(f"Bulk created {len(objects)} price history records")
-            return len(objects)
-        except IntegrityError as e:
-            logger.warning(f"Duplicate records in bulk create: {e}")
-            # Rollback and try individual inserts
-            self.session.rollback()
-            count = 0
-            for record in price_records:
-                try:
-                    self.create(**record)
-                    count += 1
-                except IntegrityError:
-                    continue
-            return count
+        upsert_insert = _UPSERT_INSERTS.get(self._dialect)
+        if self._dialect == 'postgresql' and len(price_records) >= self.COPY_THRESHOLD:
+            count = self._copy_records(price_records)
+        elif upsert_insert is not None:
+            stmt = upsert_insert(PriceHistory)\
+                .on_conflict_do_nothing(index_elements=['crypto_id', 'timestamp'])\
+                .returning(PriceHistory.id)
+            count = len(self.session.execute(stmt, price_records).all())
+        elif self._dialect in ('mysql', 'mariadb'):
+            stmt = insert(PriceHistory).prefix_with('IGNORE')
+            count = self.session.execute(stmt, price_records).rowcount
+        else:
+            self.session.execute(insert(PriceHistory), price_records)
+            count = len(price_records)
+        
+        logger.debug(f"Bulk created {count}/{len(price_records)} price history records")
+        if count:
+            stage_latest_prices(self.session, price_records)
+        return count
+    
+    def _copy_records(self, price_records: List[Dict[str, Any]]) -> int:
+        """
+        Load records through COPY into a staging table, then merge.
+        
+        COPY cannot skip conflicting rows itself, so rows land in a temporary
+        table first and are moved with INSERT ... SELECT ... ON CONFLICT.
+        
+        Args:
+            price_records: List of dictionaries with price data.
+        
+        Returns:
+            Number of records created.
+        """
+        columns = ', '.join(f'"{c}"' for c in self.BULK_COLUMNS)
+        
+        conn = self.session.connection()
+        conn.exec_driver_sql(
+            f"CREATE TEMP TABLE price_history_stage AS "
+            f"SELECT {columns} FROM price_history WITH NO DATA"
+        )
+        _copy_rows(self.session, 'price_history_stage', self.BULK_COLUMNS, price_records)
+        
+        result = conn.exec_driver_sql(
+            f"INSERT INTO price_history ({columns}) "
+            f"SELECT {columns} FROM price_history_stage "
+            f"ON CONFLICT (crypto_id, \"timestamp\") DO NOTHING"
+        )
+        conn.exec_driver_sql("DROP TABLE price_history_stage")
+        
+        logger.debug(f"Copied {result.rowcount}/{len(price_records)} price history records")
+        return result.rowcount
     
     def get_by_crypto_and_time_range(
         self,
@@ -266,6 +674,198 @@ class PriceHistoryRepository:
             .order_by(asc(PriceHistory.timestamp))\
             .all()
     
+    def get_by_crypto_ids_and_time_range(
+        self,
+        crypto_ids: Iterable[int],
+        start_time: datetime,
+        end_time: datetime
+    ) -> Dict[int, List[PriceHistory]]:
+        """
+        Get price history of several cryptocurrencies within time range in one query.
+        
+        Args:
+            crypto_ids: Cryptocurrency IDs.
+            start_time: Start of time range.
+            end_time: End of time range.
+        
+        Returns:
+            Dictionary mapping crypto_id to PriceHistory instances ordered by
+            timestamp; cryptocurrencies without records are absent.
+        """
+        crypto_ids = list(crypto_ids)
+        if not crypto_ids:
+            return {}
+        
+        prices = self.session.query(PriceHistory)\
+            .filter(
+                and_(
+                    PriceHistory.crypto_id.in_(crypto_ids),
+                    PriceHistory.timestamp >= start_time,
+                    PriceHistory.timestamp <= end_time
+                )
+            )\
+            .order_by(asc(PriceHistory.crypto_id), asc(PriceHistory.timestamp))\
+            .all()
+        
+        by_crypto: Dict[int, List[PriceHistory]] = {}
+        for price in prices:
+            by_crypto.setdefault(price.crypto_id, []).append(price)
+        return by_crypto
+    
+    def get_price_arrays_by_crypto_ids(
+        self,
+        crypto_ids: Iterable[int],
+        start_time: datetime,
+        end_time: datetime
+    ) -> Dict[int, np.ndarray]:
+        """
+        Get prices of several cryptocurrencies within time range as arrays.
+        
+        Reads only the crypto_id and price_usd columns in one query and packs
+        them into float64 arrays, skipping PriceHistory instances and the
+        identity map.
+        
+        Args:
+            crypto_ids: Cryptocurrency IDs.
+            start_time: Start of time range.
+            end_time: End of time range.
+        
+        Returns:
+            Dictionary mapping crypto_id to prices ordered by timestamp;
+            cryptocurrencies without records are absent.
+        """
+        crypto_ids = list(crypto_ids)
+        if not crypto_ids:
+            return {}
+        
+        stmt = select(PriceHistory.crypto_id, PriceHistory.price_usd)\
+            .where(
+                PriceHistory.crypto_id.in_(crypto_ids),
+                PriceHistory.timestamp >= start_time,
+                PriceHistory.timestamp <= end_time
+            )\
+            .order_by(asc(PriceHistory.crypto_id), asc(PriceHistory.timestamp))
+        rows = self.session.execute(stmt).all()
+        if not rows:
+            return {}
+        
+        ids = np.fromiter((row[0] for row in rows), dtype=np.int64, count=len(rows))
+        prices = np.fromiter((row[1] for row in rows), dtype=np.float64, count=len(rows))
+        # Rows are grouped by crypto_id; split where the id changes
+        starts = np.flatnonzero(np.diff(ids)) + 1
+        return {
+            int(group_ids[0]): group_prices
+            for group_ids, group_prices in zip(np.split(ids, starts), np.split(prices, starts))
+        }
+    
+    def get_prices_as_frame(
+        self,
+        crypto_id: int,
+        start_time: datetime,
+        end_time: datetime
+    ) -> pd.DataFrame:
+        """
+        Get price history within time range as a DataFrame.
+        
+        Builds float64 columns straight from the result rows, skipping
+        PriceHistory instances and the identity map, for numeric consumers
+        such as model training.
+        
+        Args:
+            crypto_id: Cryptocurrency ID.
+            start_time: Start of time range.
+            end_time: End of time range.
+        
+        Returns:
+            DataFrame with columns timestamp, price_usd, volume_24h and
+            market_cap ordered by timestamp; missing values are NaN.
+        """
+        stmt = select(
+            PriceHistory.timestamp,
+            PriceHistory.price_usd,
+            PriceHistory.volume_24h,
+            PriceHistory.market_cap
+        )\
+            .where(
+                PriceHistory.crypto_id == crypto_id,
+                PriceHistory.timestamp >= start_time,
+                PriceHistory.timestamp <= end_time
+            )\
+            .order_by(asc(PriceHistory.timestamp))
+        result = self.session.execute(stmt)
+        df = pd.DataFrame.from_records(result.all(), columns=list(result.keys()))
+        df['timestamp'] = pd.to_datetime(df['timestamp'])
+        return df.astype({
+            'price_usd': 'float64',
+            'volume_24h': 'float64',
+            'market_cap': 'float64',
+        })
+    
+    def iter_by_crypto_and_time_range(
+        self,
+        crypto_id: int,
+        start_time: datetime,
+        end_time: datetime,
+        batch_size: int = STREAM_BATCH_SIZE
+    ) -> Iterator[PriceHistory]:
+        """
+        Stream price history for a cryptocurrency within time range.
+        
+        Rows are fetched in batches through a server-side cursor on
+        PostgreSQL, so memory stays bounded however long the range is.
+        The session must not be used for other queries until the iterator
+        is exhausted.
+        
+        Args:
+            crypto_id: Cryptocurrency ID.
+            start_time: Start of time range.
+            end_time: End of time range.
+            batch_size: Rows fetched per round trip.
+        
+        Yields:
+            PriceHistory instances ordered by timestamp.
+        """
+        stmt = select(PriceHistory)\
+            .where(
+                PriceHistory.crypto_id == crypto_id,
+                PriceHistory.timestamp >= start_time,
+                PriceHistory.timestamp <= end_time
+            )\
+            .order_by(asc(PriceHistory.timestamp))\
+            .execution_options(yield_per=batch_size)
+        yield from self.session.scalars(stmt)
+    
+    def get_daily_ohlc(
+        self,
+        crypto_id: int,
+        start_time: datetime,
+        end_time: datetime
+    ) -> List[Dict[str, Any]]:
+        """
+        Get daily OHLC rows for a cryptocurrency from the mv_daily_ohlc view.
+        
+        Reads one precomputed row per day instead of aggregating hourly
+        prices. PostgreSQL only (see create_daily_ohlc_view).
+        
+        Args:
+            crypto_id: Cryptocurrency ID.
+            start_time: Start of time range.
+            end_time: End of time range.
+        
+        Returns:
+            List of dicts with day, open, high, low, close and volume_24h,
+            ordered by day.
+        """
+        rows = self.session.execute(
+            text(
+                "SELECT day, open, high, low, close, volume_24h FROM mv_daily_ohlc "
+                "WHERE crypto_id = :crypto_id AND day >= :start_time AND day <= :end_time "
+                "ORDER BY day"
+            ),
+            {'crypto_id': crypto_id, 'start_time': start_time, 'end_time': end_time}
+        ).mappings()
+        return [dict(row) for row in rows]
+    
     def get_latest_by_crypto(self, crypto_id: int, limit: int = 1) -> List[PriceHistory]:
         """
         Get latest price records for a cryptocurrency.
@@ -293,11 +893,27 @@ class PriceHistoryRepository:
         Returns:
             Latest timestamp or None if no records exist.
         """
-        result = self.session.query(PriceHistory.timestamp)\
-            .filter(PriceHistory.crypto_id == crypto_id)\
-            .order_by(desc(PriceHistory.timestamp))\
-            .first()
-        return result[0] if result else None
+        return self.session.scalar(_LATEST_TIMESTAMP, {'crypto_id': crypto_id})
+    
+    def get_latest_timestamps(
+        self,
+        crypto_ids: Optional[List[int]] = None
+    ) -> Dict[int, datetime]:
+        """
+        Get the latest timestamp of several cryptocurrencies in one query.
+        
+        Args:
+            crypto_ids: Cryptocurrency IDs (None for all).
+        
+        Returns:
+            Dictionary mapping crypto_id to its latest timestamp; cryptocurrencies
+            without records are absent.
+        """
+        query = select(PriceHistory.crypto_id, func.max(PriceHistory.timestamp))\
+            .group_by(PriceHistory.crypto_id)
+        if crypto_ids is not None:
+            query = query.where(PriceHistory.crypto_id.in_(crypto_ids))
+        return dict(self.session.execute(query).all())
     
     def get_timestamps_in_range(
         self,
@@ -316,17 +932,43 @@ class PriceHistoryRepository:
         Returns:
             List of timestamps ordered chronologically.
         """
-        results = self.session.query(PriceHistory.timestamp)\
-            .filter(
-                and_(
-                    PriceHistory.crypto_id == crypto_id,
-                    PriceHistory.timestamp >= start_time,
-                    PriceHistory.timestamp <= end_time
-                )
+        stmt = select(PriceHistory.timestamp)\
+            .where(
+                PriceHistory.crypto_id == crypto_id,
+                PriceHistory.timestamp >= start_time,
+                PriceHistory.timestamp <= end_time
+            )\
+            .order_by(asc(PriceHistory.timestamp))
+        return self.session.scalars(stmt).all()
+    
+    def iter_timestamps_in_range(
+        self,
+        crypto_id: int,
+        start_time: datetime,
+        end_time: datetime,
+        batch_size: int = STREAM_BATCH_SIZE
+    ) -> Iterator[datetime]:
+        """
+        Stream timestamps for a cryptocurrency within time range.
+        
+        Args:
+            crypto_id: Cryptocurrency ID.
+            start_time: Start of time range.
+            end_time: End of time range.
+            batch_size: Rows fetched per round trip.
+        
+        Yields:
+            Timestamps in chronological order.
+        """
+        stmt = select(PriceHistory.timestamp)\
+            .where(
+                PriceHistory.crypto_id == crypto_id,
+                PriceHistory.timestamp >= start_time,
+                PriceHistory.timestamp <= end_time
             )\
             .order_by(asc(PriceHistory.timestamp))\
-            .all()
-        return [r[0] for r in results]
+            .execution_options(yield_per=batch_size)
+        yield from self.session.scalars(stmt)
     
     def get_earliest_timestamp(self, crypto_id: int) -> Optional[datetime]:
         """
@@ -338,11 +980,23 @@ class PriceHistoryRepository:
         Returns:
             Earliest timestamp or None if no records exist.
         """
-        result = self.session.query(PriceHistory.timestamp)\
-            .filter(PriceHistory.crypto_id == crypto_id)\
-            .order_by(asc(PriceHistory.timestamp))\
-            .first()
-        return result[0] if result else None
+        return self.session.scalar(_EARLIEST_TIMESTAMP, {'crypto_id': crypto_id})
+    
+    def exists_for_crypto(self, crypto_id: int) -> bool:
+        """
+        Check whether any price history exists for a cryptocurrency.
+        
+        Stops at the first matching index entry instead of counting them all.
+        
+        Args:
+            crypto_id: Cryptocurrency ID.
+        
+        Returns:
+            True if at least one record exists.
+        """
+        query = self.session.query(PriceHistory)\
+            .filter(PriceHistory.crypto_id == crypto_id)
+        return self.session.query(query.exists()).scalar()
     
     def count_by_crypto(self, crypto_id: int) -> int:
         """
@@ -358,20 +1012,83 @@ class PriceHistoryRepository:
             .filter(PriceHistory.crypto_id == crypto_id)\
             .count()
     
-    def get_latest_price(self, crypto_id: int) -> Optional[PriceHistory]:
+    def get_latest_price(self, crypto_id: int) -> Optional[LatestPrice]:
         """
-        Get the most recent price record for a cryptocurrency.
+        Get the most recent price of a cryptocurrency.
+        
+        Served from the in-process latest price cache when possible.
         
         Args:
             crypto_id: Cryptocurrency ID.
         
         Returns:
-            Latest PriceHistory instance or None if no records exist.
+            LatestPrice with the record's data columns or None if no records
+            exist.
         """
-        return self.session.query(PriceHistory)\
-            .filter(PriceHistory.crypto_id == crypto_id)\
-            .order_by(desc(PriceHistory.timestamp))\
-            .first()
+        cached = latest_price_cache.get(crypto_id)
+        if cached is not None:
+            return cached
+        
+        price = self.session.scalars(_LATEST_PRICE, {'crypto_id': crypto_id}).first()
+        if price is None:
+            return None
+        
+        latest = LatestPrice.from_record(self._snapshot(price))
+        cache_latest_price(latest)
+        return latest
+    
+    def get_latest_by_crypto_ids(self, crypto_ids: Iterable[int]) -> Dict[int, LatestPrice]:
+        """
+        Get the most recent price record of several cryptocurrencies.
+        
+        Cached prices are served as in get_latest_price; the rest are read in
+        one query that looks up each latest timestamp through the
+        (crypto_id, timestamp) index.
+        
+        Args:
+            crypto_ids: Cryptocurrency IDs.
+        
+        Returns:
+            Dictionary mapping crypto_id to its LatestPrice; cryptocurrencies
+            without records are absent.
+        """
+        latest: Dict[int, LatestPrice] = {}
+        missing = []
+        for crypto_id in dict.fromkeys(crypto_ids):
+            cached = latest_price_cache.get(crypto_id)
+            if cached is not None:
+                latest[crypto_id] = cached
+            else:
+                missing.append(crypto_id)
+        if not missing:
+            return latest
+        
+        newest = select(func.max(PriceHistory.timestamp))\
+            .where(PriceHistory.crypto_id == Cryptocurrency.id)\
+            .correlate(Cryptocurrency)\
+            .scalar_subquery()
+        keys = select(Cryptocurrency.id, newest)\
+            .where(Cryptocurrency.id.in_(missing))
+        prices = self.session.query(PriceHistory)\
+            .filter(tuple_(PriceHistory.crypto_id, PriceHistory.timestamp).in_(keys))\
+            .all()
+        
+        for price in prices:
+            latest[price.crypto_id] = LatestPrice.from_record(self._snapshot(price))
+            cache_latest_price(latest[price.crypto_id])
+        return latest
+    
+    def _snapshot(self, price: PriceHistory) -> Dict[str, Any]:
+        """
+        Copy a record's data columns for the latest price cache.
+        
+        Args:
+            price: PriceHistory instance.
+        
+        Returns:
+            Dictionary keyed by BULK_COLUMNS.
+        """
+        return {column: getattr(price, column) for column in self.BULK_COLUMNS}
     
     def get_price_at_time(
         self,
@@ -396,23 +1113,33 @@ class PriceHistoryRepository:
         start_time = target_time - timedelta(minutes=tolerance_minutes)
         end_time = target_time + timedelta(minutes=tolerance_minutes)
         
-        # Find closest record within window
-        return self.session.query(PriceHistory)\
+        # Nearest record on each side: two seeks on the (crypto_id, timestamp)
+        # index instead of sorting the window by distance
+        before = self.session.query(PriceHistory)\
             .filter(
                 and_(
                     PriceHistory.crypto_id == crypto_id,
-                    PriceHistory.timestamp >= start_time,
-                    PriceHistory.timestamp <= end_time
+                    PriceHistory.timestamp <= target_time,
+                    PriceHistory.timestamp >= start_time
                 )
             )\
-            .order_by(
-                # Order by absolute difference from target time
-                func.abs(
-                    func.extract('epoch', PriceHistory.timestamp) -
-                    func.extract('epoch', target_time)
+            .order_by(desc(PriceHistory.timestamp))\
+            .first()
+        after = self.session.query(PriceHistory)\
+            .filter(
+                and_(
+                    PriceHistory.crypto_id == crypto_id,
+                    PriceHistory.timestamp >= target_time,
+                    PriceHistory.timestamp <= end_time
                 )
             )\
+            .order_by(asc(PriceHistory.timestamp))\
             .first()
+        
+        candidates = [p for p in (before, after) if p is not None]
+        if not candidates:
+            return None
+        return min(candidates, key=lambda p: abs((p.timestamp - target_time).total_seconds()))
 
 
 class PredictionRepository:
@@ -426,6 +1153,7 @@ class PredictionRepository:
             session: SQLAlchemy session instance.
         """
         self.session = session
+        self._dialect = session.get_bind().dialect.name
     
     def create(
         self,
@@ -433,7 +1161,8 @@ class PredictionRepository:
         prediction_date: datetime,
         predicted_price: Optional[Decimal] = None,
         confidence_score: Optional[Decimal] = None,
-        prediction_horizon_hours: int = 24
+        prediction_horizon_hours: int = 24,
+        flush: bool = False
     ) -> Prediction:
         """
         Create a new prediction record.
@@ -444,6 +1173,7 @@ class PredictionRepository:
             predicted_price: Predicted price.
             confidence_score: Confidence score (0-1).
             prediction_horizon_hours: Prediction horizon in hours.
+            flush: Flush now so the instance's id is available before commit.
         
         Returns:
             Created Prediction instance.
@@ -456,24 +1186,50 @@ class PredictionRepository:
             prediction_horizon_hours=prediction_horizon_hours
         )
         self.session.add(prediction)
-        self.session.flush()
+        if flush:
+            self.session.flush()
+        invalidate_top_performers(self.session)
         return prediction
     
-    def bulk_create(self, predictions: List[Dict[str, Any]]) -> int:
+    # Batches at least this large are loaded with COPY on PostgreSQL
+    COPY_THRESHOLD = 5000
+    
+    COPY_COLUMNS = (
+        'crypto_id',
+        'prediction_date',
+        'predicted_price',
+        'confidence_score',
+        'prediction_horizon_hours',
+    )
+    
+    def bulk_create(self, predictions: Iterable[Dict[str, Any]]) -> int:
         """
-        Bulk create prediction records.
+        Bulk create prediction records in dialect-sized batches.
+        
+        Each batch is one Core executemany INSERT, sent as multi-row VALUES
+        statements without building ORM objects. On PostgreSQL, batches of
+        COPY_THRESHOLD records or more are streamed with COPY instead.
         
         Args:
-            predictions: List of dictionaries with prediction data.
+            predictions: Dictionaries with prediction data, all with the same keys.
         
         Returns:
             Number of records created.
         """
-        objects = [Prediction(**pred) for pred in predictions]
-        self.session.bulk_save_objects(objects)
-        self.session.flush()
-        logger.debug(f"Bulk created {len(objects)} prediction records")
-        return len(objects)
+        count = 0
+        for batch in _chunked(predictions, _bulk_batch_size(self._dialect)):
+            if self._dialect == 'postgresql' and len(batch) >= self.COPY_THRESHOLD:
+                # COPY does not apply client-side column defaults
+                horizon = Prediction.__table__.c.prediction_horizon_hours.default.arg
+                batch = [{'prediction_horizon_hours': horizon, **p} for p in batch]
+                _copy_rows(self.session, 'predictions', self.COPY_COLUMNS, batch)
+            else:
+                self.session.execute(insert(Prediction), batch)
+            count += len(batch)
+        if count:
+            invalidate_top_performers(self.session)
+        logger.debug(f"Bulk created {count} prediction records")
+        return count
     
     def get_latest_predictions(self, limit: Optional[int] = None) -> List[Prediction]:
         """
@@ -509,36 +1265,95 @@ class PredictionRepository:
             query = query.limit(limit)
         return query.all()
     
-    def get_top_performers(self, limit: int = 20) -> List[Prediction]:
+    def get_latest_by_crypto_ids(self, crypto_ids: Iterable[int]) -> Dict[int, Prediction]:
         """
-        Get top predicted performers based on latest predictions.
+        Get the latest prediction of several cryptocurrencies in one query.
         
         Args:
-            limit: Number of top performers to retrieve.
+            crypto_ids: Cryptocurrency IDs.
         
         Returns:
-            List of Prediction instances ordered by confidence score descending.
+            Dictionary mapping crypto_id to its latest Prediction;
+            cryptocurrencies without predictions are absent.
+        """
+        crypto_ids = list(crypto_ids)
+        if not crypto_ids:
+            return {}
+        
+        ranked = select(
+                Prediction.id,
+                func.row_number().over(
+                    partition_by=Prediction.crypto_id,
+                    order_by=(desc(Prediction.prediction_date), desc(Prediction.id))
+                ).label('rank')
+            )\
+            .where(Prediction.crypto_id.in_(crypto_ids))\
+            .subquery()
+        predictions = self.session.query(Prediction)\
+            .join(ranked, Prediction.id == ranked.c.id)\
+            .filter(ranked.c.rank == 1)\
+            .all()
+        return {prediction.crypto_id: prediction for prediction in predictions}
+    
+    def get_top_performers(self, limit: int = 20) -> List[TopPerformer]:
         """
-        # Get the latest prediction date
-        latest_date = self.session.query(Prediction.prediction_date)\
-            .order_by(desc(Prediction.prediction_date))\
-            .first()
+        Get top predicted performers based on latest predictions.
         
-        if not latest_date:
-            return []
+        Served from the in-process top performers cache when possible.
         
-        # Get predictions from the latest date, ordered by confidence
-        return self.session.query(Prediction)\
-            .filter(Prediction.prediction_date == latest_date[0])\
-            .filter(Prediction.confidence_score.isnot(None))\
-            .order_by(desc(Prediction.confidence_score))\
-            .limit(limit)\
-            .all()
+        Args:
+            limit: Number of top performers to retrieve.
+        
+        Returns:
+            List of TopPerformer values (prediction columns with the
+            cryptocurrency's symbol, name and rank) ordered by confidence
+            score descending.
+        """
+        cached = top_performers_cache.get(limit)
+        if cached is not None:
+            return list(cached)
+        
+        generation = top_performers_cache.generation()
+        # Predictions from the latest date, resolved in the same statement
+        latest_date = select(func.max(Prediction.prediction_date)).scalar_subquery()
+        rows = self.session.execute(
+            select(
+                Prediction.crypto_id,
+                Cryptocurrency.symbol,
+                Cryptocurrency.name,
+                Cryptocurrency.market_cap_rank,
+                Prediction.prediction_date,
+                Prediction.predicted_price,
+                Prediction.confidence_score,
+                Prediction.prediction_horizon_hours,
+                Prediction.created_at
+            )
+            .join(Cryptocurrency, Prediction.crypto_id == Cryptocurrency.id)
+            .where(Prediction.prediction_date == latest_date)
+            .where(Prediction.confidence_score.isnot(None))
+            .order_by(desc(Prediction.confidence_score))
+            .limit(limit)
+        ).all()
+        
+        top = [TopPerformer(**row._mapping) for row in rows]
+        top_performers_cache.put(limit, tuple(top), generation)
+        return top
 
 
 class ChatHistoryRepository:
     """Repository for ChatHistory CRUD operations."""
     
+    # Stats of a session without messages
+    _EMPTY_SESSION_STATS = {
+        'message_count': 0,
+        'total_cost_usd': 0.0,
+        'total_tokens_input': 0,
+        'total_tokens_output': 0,
+        'avg_response_time_ms': None,
+        'first_message': None,
+        'last_message': None,
+    }
+    
     def __init__(self, session: Session):
         """
         Initialize repository with database session.
@@ -553,14 +1368,15 @@ class ChatHistoryRepository:
         session_id: str,
         question: str,
         answer: str,
-        question_hash: Optional[str] = None,
+        question_hash: Optional[bytes] = None,
         topic_valid: bool = True,
         pii_detected: bool = False,
         context_used: Optional[Dict[str, Any]] = None,
         openai_tokens_input: Optional[int] = None,
         openai_tokens_output: Optional[int] = None,
         openai_cost_usd: Optional[Decimal] = None,
-        response_time_ms: Optional[int] = None
+        response_time_ms: Optional[int] = None,
+        flush: bool = False
     ) -> ChatHistory:
         """
         Create a new chat history record.
@@ -569,7 +1385,7 @@ class ChatHistoryRepository:
             session_id: User session ID.
             question: User question.
             answer: AI response.
-            question_hash: SHA256 hash of question.
+            question_hash: Raw SHA256 digest of question.
             topic_valid: Whether question topic is valid.
             pii_detected: Whether PII was detected.
             context_used: Context data used for response.
@@ -577,6 +1393,7 @@ class ChatHistoryRepository:
             openai_tokens_output: Output tokens used.
             openai_cost_usd: Cost in USD.
             response_time_ms: Response time in milliseconds.
+            flush: Flush now so the instance's id is available before commit.
         
         Returns:
             Created ChatHistory instance.
@@ -595,9 +1412,50 @@ class ChatHistoryRepository:
             response_time_ms=response_time_ms
         )
         self.session.add(chat)
-        self.session.flush()
+        invalidate_recent_history(self.session, [session_id])
+        if flush:
+            self.session.flush()
         return chat
     
+    def create_returning_id(self, **values: Any) -> int:
+        """
+        Insert a chat history record without building an ORM instance.
+        
+        Runs a single INSERT ... RETURNING id for callers that only need the
+        new row's ID.
+        
+        Args:
+            **values: Column values, as accepted by create().
+        
+        Returns:
+            ID of the inserted row.
+        """
+        chat_id = self.session.execute(
+            insert(ChatHistory).values(**values).returning(ChatHistory.id)
+        ).scalar_one()
+        invalidate_recent_history(self.session, [values['session_id']])
+        return chat_id
+    
+    def bulk_create(self, records: List[Dict[str, Any]]) -> List[int]:
+        """
+        Insert many chat history records in one statement.
+        
+        Args:
+            records: Column dicts, all with the same keys.
+        
+        Returns:
+            IDs of the inserted rows, in the order of records.
+        """
+        if not records:
+            return []
+        
+        result = self.session.execute(
+            insert(ChatHistory).returning(ChatHistory.id, sort_by_parameter_order=True),
+            records
+        )
+        invalidate_recent_history(self.session, {record['session_id'] for record in records})
+        return list(result.scalars())
+    
     def get_recent_by_session(self, session_id: str, limit: int = 3) -> List[ChatHistory]:
         """
         Get recent chat history for a session (last N Q&A pairs).
@@ -609,12 +1467,76 @@ class ChatHistoryRepository:
         Returns:
             List of ChatHistory instances ordered by created_at descending.
         """
+        # id breaks ties between messages stored in the same instant
         return self.session.query(ChatHistory)\
             .filter(ChatHistory.session_id == session_id)\
-            .order_by(desc(ChatHistory.created_at))\
+            .order_by(desc(ChatHistory.created_at), desc(ChatHistory.id))\
             .limit(limit)\
             .all()
     
+    def get_recent_by_session_projected(self, session_id: str, limit: int = 3) -> List[Row]:
+        """
+        Get recent question/answer rows for a session without loading full records.
+        
+        Rows are served from the in-process recent history cache when
+        available; writes through this repository invalidate it on commit.
+        
+        Args:
+            session_id: User session ID.
+            limit: Number of recent messages to retrieve (default: 3).
+        
+        Returns:
+            List of the last N (question, answer, created_at) rows in
+            chronological order (oldest first).
+        """
+        # Uncommitted messages of this chat session must not be cached
+        use_cache = not has_pending_history(self.session, session_id)
+        if use_cache:
+            cached = recent_history_cache.get((session_id, limit))
+            if cached is not None:
+                return list(cached)
+            generation = recent_history_cache.generation()
+        
+        recent = select(
+                ChatHistory.id,
+                ChatHistory.question,
+                ChatHistory.answer,
+                ChatHistory.created_at
+            )\
+            .where(ChatHistory.session_id == session_id)\
+            .order_by(desc(ChatHistory.created_at), desc(ChatHistory.id))\
+            .limit(limit)\
+            .subquery()
+        
+        rows = self.session.execute(
+            select(recent.c.question, recent.c.answer, recent.c.created_at)
+            .order_by(asc(recent.c.created_at), asc(recent.c.id))
+        ).all()
+        if use_cache:
+            recent_history_cache.put((session_id, limit), tuple(rows), generation)
+        return rows
+    
+    def get_recent_answer(self, question_hash: bytes, since: datetime) -> Optional[ChatHistory]:
+        """
+        Get the most recent answer to a question asked since a given time.
+        
+        Args:
+            question_hash: Raw SHA256 digest of question.
+            since: Earliest creation time to consider.
+        
+        Returns:
+            Latest matching ChatHistory instance or None.
+        """
+        return self.session.query(ChatHistory)\
+            .filter(
+                and_(
+                    ChatHistory.question_hash == question_hash,
+                    ChatHistory.created_at >= since
+                )
+            )\
+            .order_by(desc(ChatHistory.created_at))\
+            .first()
+    
     def get_all_by_session(self, session_id: str) -> List[ChatHistory]:
         """
         Get all chat history for a session.
@@ -630,28 +1552,153 @@ class ChatHistoryRepository:
             .order_by(asc(ChatHistory.created_at))\
             .all()
     
-    def get_total_cost_by_session(self, session_id: str) -> Decimal:
+    def get_all_by_session_projected(self, session_id: str) -> List[Row]:
+        """
+        Get all chat history rows for a session without the context payload.
+        
+        Args:
+            session_id: User session ID.
+        
+        Returns:
+            List of (id, question, answer, created_at, pii_detected,
+            openai_tokens_input, openai_tokens_output, openai_cost_usd,
+            response_time_ms) rows ordered by created_at ascending.
+        """
+        return self.session.execute(self._session_history_stmt(session_id)).all()
+    
+    def iter_all_by_session_projected(
+        self,
+        session_id: str,
+        batch_size: int = CHAT_STREAM_BATCH_SIZE
+    ) -> Iterator[Row]:
+        """
+        Stream all chat history rows for a session without the context payload.
+        
+        Rows are fetched in batches through a server-side cursor on
+        PostgreSQL, so memory stays bounded however long the session is.
+        The session must not be used for other queries until the iterator
+        is exhausted.
+        
+        Args:
+            session_id: User session ID.
+            batch_size: Rows fetched per round trip.
+        
+        Yields:
+            Rows as returned by get_all_by_session_projected.
+        """
+        stmt = self._session_history_stmt(session_id)\
+            .execution_options(yield_per=batch_size)
+        yield from self.session.execute(stmt)
+    
+    @staticmethod
+    def _session_history_stmt(session_id: str) -> Select:
+        """Select a session's history columns, oldest first."""
+        return select(
+                ChatHistory.id,
+                ChatHistory.question,
+                ChatHistory.answer,
+                ChatHistory.created_at,
+                ChatHistory.pii_detected,
+                ChatHistory.openai_tokens_input,
+                ChatHistory.openai_tokens_output,
+                ChatHistory.openai_cost_usd,
+                ChatHistory.response_time_ms
+            )\
+            .where(ChatHistory.session_id == session_id)\
+            .order_by(asc(ChatHistory.created_at), asc(ChatHistory.id))
+    
+    def get_session_stats(self, session_id: str) -> Dict[str, Any]:
+        """
+        Aggregate usage for a session in a single query.
+        
+        Args:
+            session_id: User session ID.
+        
+        Returns:
+            Dictionary with message_count, total_cost_usd, total_tokens_input,
+            total_tokens_output, avg_response_time_ms (None without timings),
+            first_message and last_message (None for an empty session).
+        """
+        # A cached empty history means the session has no messages yet
+        if not has_pending_history(self.session, session_id) \
+                and is_known_empty(session_id):
+            return dict(self._EMPTY_SESSION_STATS)
+        
+        row = self.session.query(*self._session_stats_columns())\
+            .filter(ChatHistory.session_id == session_id)\
+            .one()
+        return dict(row._mapping)
+    
+    def get_session_stats_bulk(self, session_ids: Iterable[str]) -> Dict[str, Dict[str, Any]]:
+        """
+        Aggregate usage for many sessions in a single grouped query.
+        
+        Args:
+            session_ids: User session IDs.
+        
+        Returns:
+            Dictionary mapping each session ID to stats as returned by
+            get_session_stats; sessions without messages get empty stats.
+        """
+        session_ids = list(dict.fromkeys(session_ids))
+        stats = {session_id: dict(self._EMPTY_SESSION_STATS) for session_id in session_ids}
+        if not session_ids:
+            return stats
+        
+        rows = self.session.query(ChatHistory.session_id, *self._session_stats_columns())\
+            .filter(ChatHistory.session_id.in_(session_ids))\
+            .group_by(ChatHistory.session_id)\
+            .all()
+        for row in rows:
+            record = dict(row._mapping)
+            stats[record.pop('session_id')] = record
+        return stats
+    
+    @staticmethod
+    def _session_stats_columns() -> tuple:
+        """Aggregate columns of session stats, labeled with their keys."""
+        return (
+            func.count(ChatHistory.id).label('message_count'),
+            func.coalesce(func.sum(ChatHistory.openai_cost_usd), 0).cast(Float).label('total_cost_usd'),
+            func.coalesce(func.sum(ChatHistory.openai_tokens_input), 0).label('total_tokens_input'),
+            func.coalesce(func.sum(ChatHistory.openai_tokens_output), 0).label('total_tokens_output'),
+            func.avg(ChatHistory.response_time_ms).label('avg_response_time_ms'),
+            func.min(ChatHistory.created_at).label('first_message'),
+            func.max(ChatHistory.created_at).label('last_message'),
+        )
+    
+    def get_total_cost_by_session(self, session_id: str) -> float:
         """
         Calculate total OpenAI cost for a session.
         
+        The sum is cast to float in the database; per-row costs keep their
+        exact NUMERIC storage.
+        
         Args:
             session_id: User session ID.
         
         Returns:
             Total cost in USD.
         """
-        result = self.session.query(
-            func.sum(ChatHistory.openai_cost_usd)
-        ).filter(ChatHistory.session_id == session_id).scalar()
-        return result or Decimal('0')
+        result = self.session.scalar(
+            select(func.sum(ChatHistory.openai_cost_usd).cast(Float))
+            .where(ChatHistory.session_id == session_id)
+        )
+        return result or 0.0
     
-    def get_total_count(self) -> int:
+    def get_total_count(self, exact: bool = True) -> int:
         """
         Get total count of chat history records.
         
+        Args:
+            exact: Count every row; otherwise use the planner's estimate,
+                which avoids a full scan on PostgreSQL.
+        
         Returns:
             Total number of chat history records.
         """
+        if not exact:
+            return _estimated_count(self.session, ChatHistory)
         return self.session.query(ChatHistory).count()
     
     def count_old_records(self, cutoff_date: datetime) -> int:
@@ -668,22 +1715,24 @@ class ChatHistoryRepository:
             .filter(ChatHistory.created_at < cutoff_date)\
             .count()
     
-    def delete_old_chat_history(self, cutoff_date: datetime) -> int:
+    def delete_old_chat_history(
+        self,
+        cutoff_date: datetime,
+        batch_size: int = RETENTION_DELETE_BATCH_SIZE
+    ) -> int:
         """
         Delete chat history records older than cutoff date.
         
+        Rows are deleted and committed in batches of batch_size.
+        
         Args:
             cutoff_date: Cutoff date for deletion.
+            batch_size: Maximum records deleted per transaction.
             
         Returns:
             Number of records deleted.
         """
-        deleted_count = self.session.query(ChatHistory)\
-            .filter(ChatHistory.created_at < cutoff_date)\
-            .delete()
-        
-        self.session.commit()
-        return deleted_count
+        return delete_before(self.session, ChatHistory, cutoff_date, batch_size)
 
 
 class AuditLogRepository:
@@ -708,7 +1757,8 @@ class AuditLogRepository:
         ip_address: Optional[str] = None,
         user_agent: Optional[str] = None,
         rejected: bool = False,
-        rejection_reason: Optional[str] = None
+        rejection_reason: Optional[str] = None,
+        flush: bool = False
     ) -> QueryAuditLog:
         """
         Create a new audit log record.
@@ -723,6 +1773,7 @@ class AuditLogRepository:
             user_agent: User agent string.
             rejected: Whether query was rejected.
             rejection_reason: Reason for rejection.
+            flush: Flush now so the instance's id is available before commit.
         
         Returns:
             Created QueryAuditLog instance.
@@ -739,9 +1790,26 @@ class AuditLogRepository:
             rejection_reason=rejection_reason
         )
         self.session.add(audit)
-        self.session.flush()
+        if flush:
+            self.session.flush()
         return audit
     
+    def bulk_create(self, records: List[Dict[str, Any]]) -> int:
+        """
+        Insert many audit log records in one statement.
+        
+        Args:
+            records: Column dicts, all with the same keys.
+        
+        Returns:
+            Number of records inserted.
+        """
+        if not records:
+            return 0
+        
+        self.session.execute(insert(QueryAuditLog), records)
+        return len(records)
+    
     def get_rejected_queries(self, limit: Optional[int] = None) -> List[QueryAuditLog]:
         """
         Get rejected queries.
@@ -776,13 +1844,19 @@ class AuditLogRepository:
             query = query.limit(limit)
         return query.all()
     
-    def get_total_count(self) -> int:
+    def get_total_count(self, exact: bool = True) -> int:
         """
         Get total count of audit log records.
         
+        Args:
+            exact: Count every row; otherwise use the planner's estimate,
+                which avoids a full scan on PostgreSQL.
+        
         Returns:
             Total number of audit log records.
         """
+        if not exact:
+            return _estimated_count(self.session, QueryAuditLog)
         return self.session.query(QueryAuditLog).count()
     
     def count_old_records(self, cutoff_date: datetime) -> int:
@@ -799,22 +1873,24 @@ class AuditLogRepository:
             .filter(QueryAuditLog.created_at < cutoff_date)\
             .count()
     
-    def delete_old_audit_logs(self, cutoff_date: datetime) -> int:
+    def delete_old_audit_logs(
+        self,
+        cutoff_date: datetime,
+        batch_size: int = RETENTION_DELETE_BATCH_SIZE
+    ) -> int:
         """
         Delete audit log records older than cutoff date.
         
+        Rows are deleted and committed in batches of batch_size.
+        
         Args:
             cutoff_date: Cutoff date for deletion.
+            batch_size: Maximum records deleted per transaction.
             
         Returns:
             Number of records deleted.
         """
-        deleted_count = self.session.query(QueryAuditLog)\
-            .filter(QueryAuditLog.created_at < cutoff_date)\
-            .delete()
-        
-        self.session.commit()
-        return deleted_count
+        return delete_before(self.session, QueryAuditLog, cutoff_date, batch_size)
 
 
 class MarketTendencyRepository:
@@ -834,7 +1910,8 @@ class MarketTendencyRepository:
         tendency: str,
         timestamp: datetime,
         confidence: Optional[Decimal] = None,
-        metrics: Optional[Dict[str, Any]] = None
+        metrics: Optional[Dict[str, Any]] = None,
+        flush: bool = False
     ) -> MarketTendency:
         """
         Create a new market tendency record.
@@ -844,6 +1921,7 @@ class MarketTendencyRepository:
             timestamp: Tendency timestamp.
             confidence: Confidence score (0-1).
             metrics: Additional metrics as dictionary.
+            flush: Flush now so the instance's id is available before commit.
         
         Returns:
             Created MarketTendency instance.
@@ -855,19 +1933,39 @@ class MarketTendencyRepository:
             metrics=metrics
         )
         self.session.add(market_tendency)
-        self.session.flush()
+        if flush:
+            self.session.flush()
+        invalidate_latest_tendency(self.session)
         return market_tendency
     
-    def get_latest(self) -> Optional[MarketTendency]:
+    def get_latest(self) -> Optional[LatestTendency]:
         """
         Get the latest market tendency.
         
+        Served from the in-process latest tendency cache when possible.
+        
         Returns:
-            Latest MarketTendency instance or None.
+            LatestTendency with the record's data columns or None.
         """
-        return self.session.query(MarketTendency)\
+        cached = latest_tendency_cache.get()
+        if cached is not None:
+            return cached
+        
+        generation = latest_tendency_cache.generation()
+        tendency = self.session.query(MarketTendency)\
             .order_by(desc(MarketTendency.timestamp))\
             .first()
+        if tendency is None:
+            return None
+        
+        latest = LatestTendency(
+            tendency=tendency.tendency,
+            timestamp=tendency.timestamp,
+            confidence=tendency.confidence,
+            metrics=tendency.metrics
+        )
+        latest_tendency_cache.put(None, latest, generation)
+        return latest
     
     def get_by_time_range(
         self,
@@ -922,6 +2020,7 @@ class AlertLogRepository:
             session: SQLAlchemy session instance.
         """
         self.session = session
+        self._dialect = session.get_bind().dialect.name
     
     def create(
         self,
@@ -936,7 +2035,8 @@ class AlertLogRepository:
         timestamp: datetime,
         sms_message_id: Optional[str] = None,
         success: bool = False,
-        error_message: Optional[str] = None
+        error_message: Optional[str] = None,
+        flush: bool = False
     ) -> AlertLog:
         """
         Create a new alert log record.
@@ -954,6 +2054,7 @@ class AlertLogRepository:
             sms_message_id: SMS message ID from provider.
             success: Whether alert was sent successfully.
             error_message: Error message if failed.
+            flush: Flush now so the instance's id is available before commit.
         
         Returns:
             Created AlertLog instance.
@@ -973,9 +2074,27 @@ class AlertLogRepository:
             error_message=error_message
         )
         self.session.add(alert_log)
-        self.session.flush()
+        if flush:
+            self.session.flush()
         return alert_log
     
+    def bulk_create(self, alerts: Iterable[Dict[str, Any]]) -> int:
+        """
+        Bulk create alert log records in dialect-sized batches.
+        
+        Args:
+            alerts: Dictionaries with alert log data, all with the same keys.
+        
+        Returns:
+            Number of records created.
+        """
+        count = 0
+        for batch in _chunked(alerts, _bulk_batch_size(self._dialect)):
+            self.session.execute(insert(AlertLog), batch)
+            count += len(batch)
+        logger.debug(f"Bulk created {count} alert log records")
+        return count
+    
     def get_recent_alerts(self, limit: int = 50) -> List[AlertLog]:
         """
         Get recent alert logs.
@@ -1040,11 +2159,9 @@ class AlertLogRepository:
         Returns:
             Timestamp of last alert or None if no alerts exist.
         """
-        result = self.session.query(AlertLog.timestamp)\
+        return self.session.query(func.max(AlertLog.timestamp))\
             .filter(AlertLog.crypto_id == crypto_id)\
-            .order_by(desc(AlertLog.timestamp))\
-            .first()
-        return result[0] if result else None
+            .scalar()
     
     def count_alerts_by_crypto(self, crypto_id: int) -> int:
         """
@@ -1056,6 +2173,6 @@ class AlertLogRepository:
         Returns:
             Number of alerts.
         """
-        return self.session.query(AlertLog)\
+        return self.session.query(func.count(AlertLog.id))\
             .filter(AlertLog.crypto_id == crypto_id)\
-            .count()
+            .scalar()
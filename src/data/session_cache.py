@@ -0,0 +1,205 @@
+"""
+In-process caches kept consistent with database transactions.
+Repositories stage their writes in the SQLAlchemy session; each cache is
+updated once the transaction commits and the staged writes are dropped on
+rollback.
+"""
+
+import logging
+import threading
+import time
+import weakref
+from collections import OrderedDict
+from typing import Any, Callable, Hashable, Iterable, List, Optional, Tuple
+
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+logger = logging.getLogger(__name__)
+
+# Caches whose staged writes are applied or discarded by the session events
+_caches: "weakref.WeakSet[SessionCache]" = weakref.WeakSet()
+
+
+class SessionCache:
+    """
+    Thread-safe TTL cache, optionally bounded with LRU eviction.
+    
+    Writes are staged with stage() in the session that makes them and applied
+    after that session commits: by default the whole cache is invalidated,
+    or on_commit is called with the staged items. Every invalidation bumps a
+    generation counter; reads pass the generation() value taken before their
+    query to put(), so a read racing a commit cannot cache the data it
+    missed.
+    """
+    
+    def __init__(
+        self,
+        name: str,
+        ttl_seconds: float,
+        max_entries: Optional[int] = None,
+        on_commit: Optional[Callable[[List[Any]], None]] = None
+    ):
+        """
+        Initialize session cache.
+        
+        Args:
+            name: Cache name, used for the Session.info key of staged writes
+            ttl_seconds: Seconds an entry stays valid
+            max_entries: Most entries kept (None for no bound)
+            on_commit: Called with the committed staged items instead of
+                invalidating the whole cache
+        """
+        self.name = name
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._on_commit = on_commit
+        self._pending_key = f'{name}_cache_pending'
+        self._generation = 0
+        self._entries: "OrderedDict[Hashable, Tuple[float, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+        _caches.add(self)
+    
+    def get(self, key: Hashable = None) -> Optional[Any]:
+        """
+        Get a cached value.
+        
+        Args:
+            key: Entry key (None for single-entry caches)
+        
+        Returns:
+            Cached value or None if missing or expired
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or time.monotonic() - entry[0] > self.ttl_seconds:
+                self.misses += 1
+                return None
+            
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+    
+    def items(self) -> List[Tuple[Hashable, Any]]:
+        """
+        Get all unexpired entries.
+        
+        Returns:
+            List of (key, value) pairs
+        """
+        now = time.monotonic()
+        with self._lock:
+            return [
+                (key, value)
+                for key, (cached_at, value) in self._entries.items()
+                if now - cached_at <= self.ttl_seconds
+            ]
+    
+    def generation(self) -> int:
+        """
+        Get the invalidation counter, read before querying the database.
+        
+        Returns:
+            Number of invalidations so far
+        """
+        return self._generation
+    
+    def put(
+        self,
+        key: Hashable,
+        value: Any,
+        generation: Optional[int] = None,
+        replaces: Optional[Callable[[Optional[Any]], bool]] = None
+    ) -> None:
+        """
+        Store a value.
+        
+        Args:
+            key: Entry key (None for single-entry caches)
+            value: Value to cache
+            generation: generation() value read before the query; the value
+                is dropped if the cache was invalidated since
+            replaces: Called with the current value (None if missing, expired
+                or not) and returns whether value may replace it
+        """
+        with self._lock:
+            if generation is not None and generation != self._generation:
+                return
+            if replaces is not None:
+                current = self._entries.get(key)
+                if not replaces(current[1] if current is not None else None):
+                    return
+            
+            self._entries[key] = (time.monotonic(), value)
+            self._entries.move_to_end(key)
+            if self.max_entries is not None:
+                while len(self._entries) > self.max_entries:
+                    self._entries.popitem(last=False)
+    
+    def invalidate(self, where: Optional[Callable[[Hashable], bool]] = None) -> None:
+        """
+        Drop the entries whose key matches, or all entries.
+        
+        Args:
+            where: Key predicate (None clears the cache)
+        """
+        with self._lock:
+            self._generation += 1
+            if where is None:
+                self._entries.clear()
+                return
+            
+            for key in [key for key in self._entries if where(key)]:
+                del self._entries[key]
+    
+    def stage(self, session: Session, items: Iterable[Any] = ()) -> None:
+        """
+        Queue a write to apply to the cache once session commits.
+        
+        Args:
+            session: Database session the write was made with
+            items: Items passed to on_commit (keys, records, ...)
+        """
+        session.info.setdefault(self._pending_key, []).extend(items)
+    
+    def is_staged(self, session: Session, item: Any) -> bool:
+        """
+        Check whether session holds an uncommitted write of an item.
+        
+        Args:
+            session: Database session
+            item: Item passed to stage()
+        
+        Returns:
+            True if reads of the item must bypass the cache
+        """
+        return item in session.info.get(self._pending_key, ())
+    
+    def _apply(self, pending: List[Any]) -> None:
+        """Apply committed staged items."""
+        if self._on_commit is None:
+            self.invalidate()
+        else:
+            self._on_commit(pending)
+
+
+@event.listens_for(Session, 'after_commit')
+def _apply_pending(session: Session) -> None:
+    """Update the caches with writes committed by this session."""
+    if not session.info:
+        return
+    for cache in list(_caches):
+        pending = session.info.pop(cache._pending_key, None)
+        if pending is not None:
+            cache._apply(pending)
+
+
+@event.listens_for(Session, 'after_rollback')
+def _discard_pending(session: Session) -> None:
+    """Drop writes staged by a rolled-back transaction."""
+    if not session.info:
+        return
+    for cache in list(_caches):
+        session.info.pop(cache._pending_key, None)
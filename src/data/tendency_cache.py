@@ -0,0 +1,44 @@
+"""
+In-process cache of the latest market tendency.
+Serves the market tendency read by every chat context build without a
+database round-trip.
+"""
+
+import logging
+from dataclasses import dataclass
+from datetime import datetime
+from decimal import Decimal
+from typing import Any, Dict, Optional
+
+from sqlalchemy.orm import Session
+
+from src.data.session_cache import SessionCache
+
+logger = logging.getLogger(__name__)
+
+# Seconds the latest tendency is served before re-reading the database.
+# Tendencies are classified on a scheduled tick, far apart compared to this.
+DEFAULT_TTL_SECONDS = 30
+
+
+@dataclass(frozen=True)
+class LatestTendency:
+    """Latest market tendency, detached from any session."""
+    tendency: str
+    timestamp: datetime
+    confidence: Optional[Decimal] = None
+    metrics: Optional[Dict[str, Any]] = None
+
+
+# Single entry holding the LatestTendency value
+latest_tendency_cache = SessionCache('latest_tendency', DEFAULT_TTL_SECONDS)
+
+
+def invalidate_latest_tendency(session: Session) -> None:
+    """
+    Drop the cached tendency once session commits a new one.
+    
+    Args:
+        session: Session the tendency was written with
+    """
+    latest_tendency_cache.stage(session)
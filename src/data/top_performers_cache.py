@@ -0,0 +1,49 @@
+"""
+In-process cache of the top predicted performers.
+Serves the top-performer predictions read by every chat context build
+without a database round-trip.
+"""
+
+import logging
+from dataclasses import dataclass
+from datetime import datetime
+from decimal import Decimal
+from typing import Optional
+
+from sqlalchemy.orm import Session
+
+from src.data.session_cache import SessionCache
+
+logger = logging.getLogger(__name__)
+
+# Seconds an entry is served before re-reading the database. Predictions are
+# generated on a scheduled run, far apart compared to this.
+DEFAULT_TTL_SECONDS = 60
+
+
+@dataclass(frozen=True)
+class TopPerformer:
+    """Prediction of a top performer with its cryptocurrency, detached from any session."""
+    crypto_id: int
+    symbol: str
+    name: str
+    market_cap_rank: Optional[int]
+    prediction_date: datetime
+    predicted_price: Decimal
+    confidence_score: Optional[Decimal]
+    prediction_horizon_hours: int
+    created_at: datetime
+
+
+# Entries are keyed by the requested limit and hold tuples of TopPerformer
+top_performers_cache = SessionCache('top_performers', DEFAULT_TTL_SECONDS)
+
+
+def invalidate_top_performers(session: Session) -> None:
+    """
+    Drop the cached top performers once session commits new predictions.
+    
+    Args:
+        session: Session the predictions were written with
+    """
+    top_performers_cache.stage(session)
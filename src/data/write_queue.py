@@ -0,0 +1,127 @@
+"""
+Background batch write queue.
+Base for writers that persist records from a daemon thread in batches,
+keeping the database commit off the request path.
+"""
+
+import logging
+import queue
+import threading
+import time
+from abc import ABC, abstractmethod
+from typing import Any, Callable, List, Optional
+
+from sqlalchemy.orm import Session
+
+from src.data.database import new_session
+
+logger = logging.getLogger(__name__)
+
+
+class BatchWriteQueue(ABC):
+    """
+    Background batch writer.
+    
+    Entries are queued by request handlers and written by a daemon thread,
+    up to batch_size entries or flush_seconds at a time. Subclasses provide
+    a put method and _write_batch. Entries still queued when the process is
+    killed are lost.
+    """
+    
+    # Name of the writer thread
+    thread_name = 'batch-write-queue'
+    
+    def __init__(
+        self,
+        session_factory: Callable[[], Session] = new_session,
+        batch_size: int = 500,
+        flush_seconds: float = 1.0
+    ):
+        """
+        Initialize batch write queue.
+        
+        Args:
+            session_factory: Callable returning a new database session
+            batch_size: Most entries written per transaction
+            flush_seconds: Longest wait before queued entries are written
+        """
+        self.session_factory = session_factory
+        self.batch_size = batch_size
+        self.flush_seconds = flush_seconds
+        self._queue: "queue.Queue[Optional[Any]]" = queue.Queue()
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+    
+    def start(self) -> None:
+        """Start the writer thread if it is not running."""
+        with self._lock:
+            if self._thread is not None and self._thread.is_alive():
+                return
+            self._thread = threading.Thread(
+                target=self._run,
+                name=self.thread_name,
+                daemon=True
+            )
+            self._thread.start()
+    
+    def stop(self, timeout: Optional[float] = None) -> None:
+        """
+        Write all queued entries and stop the writer thread.
+        
+        Args:
+            timeout: Seconds to wait for the writer to finish (None waits)
+        """
+        with self._lock:
+            thread = self._thread
+            self._thread = None
+        
+        if thread is None or not thread.is_alive():
+            return
+        
+        self._queue.put(None)
+        thread.join(timeout)
+    
+    def _enqueue(self, entry: Any) -> None:
+        """
+        Queue an entry for writing, starting the writer if needed.
+        
+        Args:
+            entry: Entry passed to _write_batch
+        """
+        self.start()
+        self._queue.put(entry)
+    
+    def _run(self) -> None:
+        """Writer loop: collect a batch, write it, repeat until stopped."""
+        stopping = False
+        while not stopping:
+            entry = self._queue.get()
+            if entry is None:
+                break
+            
+            batch = [entry]
+            deadline = time.monotonic() + self.flush_seconds
+            while len(batch) < self.batch_size:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    entry = self._queue.get(timeout=remaining)
+                except queue.Empty:
+                    break
+                if entry is None:
+                    stopping = True
+                    break
+                batch.append(entry)
+            
+            self._write_batch(batch)
+    
+    @abstractmethod
+    def _write_batch(self, batch: List[Any]) -> None:
+        """
+        Write a batch of entries in one transaction.
+        
+        Args:
+            batch: Queued entries
+        """
+        pass
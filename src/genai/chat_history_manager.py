@@ -4,16 +4,15 @@ Manages conversation tracking, history retrieval, and audit logging.
 """
 
 import logging
-import hashlib
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Tuple
 from datetime import datetime
-from decimal import Decimal
 
 from sqlalchemy.orm import Session
 
 from src.data.repositories import ChatHistoryRepository, AuditLogRepository
 from src.data.models import ChatHistory, QueryAuditLog
-from src.genai.genai_engine import ChatResponse
+from src.data.chat_write_queue import get_chat_write_queue
+from src.genai.genai_engine import ChatResponse, hash_question
 
 logger = logging.getLogger(__name__)
 
@@ -53,6 +52,10 @@ class ChatHistoryManager:
         """
         Store chat message with full tracing data.
         
+        Synchronous write kept for direct callers; the chat API queues messages
+        with queue_chat_message, whose batch writer applies the same savepoint
+        handling. The audit log is written even if the chat insert fails.
+        
         Args:
             response: ChatResponse from GenAI engine
             ip_address: User IP address (optional)
@@ -63,62 +66,109 @@ class ChatHistoryManager:
         """
         logger.debug(f"Storing chat message for session {response.session_id}")
         
-        # Generate question hash
-        question_hash = self._generate_hash(response.question)
+        chat_record, audit_record = self._build_records(response, ip_address, user_agent)
         
-        # Store chat history only if not rejected
+        # Chat and audit rows share one transaction; the chat insert runs in a
+        # savepoint so a failure there still lets the audit log be written
         chat_history_id = None
-        if not response.rejected:
+        if chat_record is not None:
             try:
-                chat = self.chat_repo.create(
-                    session_id=response.session_id,
-                    question=response.question,
-                    answer=response.answer,
-                    question_hash=question_hash,
-                    topic_valid=True,
-                    pii_detected=response.pii_detected,
-                    context_used=response.context_used,
-                    openai_tokens_input=response.tokens_input,
-                    openai_tokens_output=response.tokens_output,
-                    openai_cost_usd=response.cost_usd,
-                    response_time_ms=response.response_time_ms
-                )
-                self.session.commit()
-                chat_history_id = chat.id
-                
-                logger.info(f"Stored chat message: id={chat.id}, session={response.session_id}")
+                with self.session.begin_nested():
+                    chat_history_id = self.chat_repo.create_returning_id(**chat_record)
             except Exception as e:
                 logger.error(f"Error storing chat message: {e}", exc_info=True)
-                self.session.rollback()
         
-        # Always store audit log
         try:
-            # Sanitize question if PII was detected
-            question_sanitized = response.question
-            if response.pii_detected:
-                # Replace with placeholder (actual sanitization done by PII filter)
-                question_sanitized = "[QUESTION WITH PII REMOVED]"
-            
-            audit = self.audit_repo.create(
-                session_id=response.session_id,
-                chat_history_id=chat_history_id,
-                question_sanitized=question_sanitized,
-                pii_patterns_detected=response.pii_patterns if response.pii_detected else None,
-                topic_validation_result='valid' if not response.rejected else response.rejection_reason,
-                ip_address=ip_address,
-                user_agent=user_agent,
-                rejected=response.rejected,
-                rejection_reason=response.rejection_reason
-            )
+            audit = self.audit_repo.create(chat_history_id=chat_history_id, **audit_record)
             self.session.commit()
             
+            if chat_history_id is not None:
+                logger.info(f"Stored chat message: id={chat_history_id}, session={response.session_id}")
             logger.debug(f"Stored audit log: id={audit.id}")
         except Exception as e:
-            logger.error(f"Error storing audit log: {e}", exc_info=True)
+            logger.error(f"Error storing chat message and audit log: {e}", exc_info=True)
             self.session.rollback()
+            chat_history_id = None
         
         return chat_history_id
     
+    def queue_chat_message(
+        self,
+        response: ChatResponse,
+        ip_address: Optional[str] = None,
+        user_agent: Optional[str] = None
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Queue chat message and audit log for a background batch write.
+        
+        Unlike store_chat_message, returns without waiting for the database;
+        the records are written within about a second, so history read right
+        after this call does not include the queued message yet.
+        
+        Args:
+            response: ChatResponse from GenAI engine
+            ip_address: User IP address (optional)
+            user_agent: User agent string (optional)
+        
+        Returns:
+            Queued chat record, or None if the response is not stored as chat
+        """
+        chat_record, audit_record = self._build_records(response, ip_address, user_agent)
+        get_chat_write_queue().put(chat_record, audit_record)
+        return chat_record
+    
+    def _build_records(
+        self,
+        response: ChatResponse,
+        ip_address: Optional[str],
+        user_agent: Optional[str]
+    ) -> Tuple[Optional[Dict[str, Any]], Dict[str, Any]]:
+        """
+        Build chat history and audit log column values for a response.
+        
+        Args:
+            response: ChatResponse from GenAI engine
+            ip_address: User IP address
+            user_agent: User agent string
+        
+        Returns:
+            Tuple of (chat record or None if failed or rejected, audit record
+            without chat_history_id)
+        """
+        chat_record = None
+        if response.success and not response.rejected:
+            chat_record = {
+                'session_id': response.session_id,
+                'question': response.question,
+                'answer': response.answer,
+                'question_hash': self._generate_hash(response.question),
+                'topic_valid': True,
+                'pii_detected': response.pii_detected,
+                'context_used': response.context_used,
+                'openai_tokens_input': response.tokens_input,
+                'openai_tokens_output': response.tokens_output,
+                'openai_cost_usd': response.cost_usd,
+                'response_time_ms': response.response_time_ms,
+            }
+        
+        # Sanitize question if PII was detected
+        question_sanitized = response.question
+        if response.pii_detected:
+            # Replace with placeholder (actual sanitization done by PII filter)
+            question_sanitized = "[QUESTION WITH PII REMOVED]"
+        
+        audit_record = {
+            'session_id': response.session_id,
+            'question_sanitized': question_sanitized,
+            'pii_patterns_detected': response.pii_patterns if response.pii_detected else None,
+            'topic_validation_result': 'valid' if not response.rejected else response.rejection_reason,
+            'ip_address': ip_address,
+            'user_agent': user_agent,
+            'rejected': response.rejected,
+            'rejection_reason': response.rejection_reason,
+        }
+        return chat_record, audit_record
+    
     def get_recent_history(
         self,
         session_id: str,
@@ -137,11 +187,8 @@ class ChatHistoryManager:
         logger.debug(f"Retrieving recent history for session {session_id}")
         
         try:
-            # Get recent chat history
-            history = self.chat_repo.get_recent_by_session(session_id, limit=limit)
-            
-            # Reverse to chronological order (oldest first)
-            history = list(reversed(history))
+            # Get recent chat history in chronological order (oldest first)
+            history = self.chat_repo.get_recent_by_session_projected(session_id, limit=limit)
             
             # Format as list of Q&A pairs
             qa_pairs = []
@@ -167,12 +214,14 @@ class ChatHistoryManager:
             session_id: User session ID
         
         Returns:
-            List of dictionaries with full chat data
+            List of dictionaries with full chat data; cost_usd is the exact
+            decimal cost as a string
         """
         logger.debug(f"Retrieving all history for session {session_id}")
         
         try:
-            history = self.chat_repo.get_all_by_session(session_id)
+            # Streamed so long sessions are not buffered twice
+            history = self.chat_repo.iter_all_by_session_projected(session_id)
             
             result = []
             for chat in history:
@@ -184,7 +233,7 @@ class ChatHistoryManager:
                     'pii_detected': chat.pii_detected,
                     'tokens_input': chat.openai_tokens_input,
                     'tokens_output': chat.openai_tokens_output,
-                    'cost_usd': float(chat.openai_cost_usd) if chat.openai_cost_usd else 0.0,
+                    'cost_usd': str(chat.openai_cost_usd or '0'),
                     'response_time_ms': chat.response_time_ms
                 })
             
@@ -195,7 +244,7 @@ class ChatHistoryManager:
             logger.error(f"Error retrieving all chat history: {e}", exc_info=True)
             return []
     
-    def get_session_cost(self, session_id: str) -> Decimal:
+    def get_session_cost(self, session_id: str) -> float:
         """
         Calculate total OpenAI cost for a session.
         
@@ -211,7 +260,7 @@ class ChatHistoryManager:
             return total_cost
         except Exception as e:
             logger.error(f"Error calculating session cost: {e}", exc_info=True)
-            return Decimal('0')
+            return 0.0
     
     def get_rejected_queries(
         self,
@@ -299,53 +348,21 @@ class ChatHistoryManager:
         logger.debug(f"Calculating statistics for session {session_id}")
         
         try:
-            history = self.chat_repo.get_all_by_session(session_id)
-            
-            if not history:
-                return {
-                    'session_id': session_id,
-                    'message_count': 0,
-                    'total_cost_usd': 0.0,
-                    'total_tokens_input': 0,
-                    'total_tokens_output': 0,
-                    'avg_response_time_ms': 0,
-                    'first_message': None,
-                    'last_message': None
-                }
-            
-            total_cost = sum(
-                float(chat.openai_cost_usd) if chat.openai_cost_usd else 0.0
-                for chat in history
-            )
-            
-            total_tokens_input = sum(
-                chat.openai_tokens_input if chat.openai_tokens_input else 0
-                for chat in history
-            )
-            
-            total_tokens_output = sum(
-                chat.openai_tokens_output if chat.openai_tokens_output else 0
-                for chat in history
-            )
+            stats = self.chat_repo.get_session_stats(session_id)
             
-            response_times = [
-                chat.response_time_ms for chat in history
-                if chat.response_time_ms is not None
-            ]
-            avg_response_time = (
-                sum(response_times) / len(response_times)
-                if response_times else 0
-            )
+            avg_response_time = stats['avg_response_time_ms']
+            first_message = stats['first_message']
+            last_message = stats['last_message']
             
             return {
                 'session_id': session_id,
-                'message_count': len(history),
-                'total_cost_usd': total_cost,
-                'total_tokens_input': total_tokens_input,
-                'total_tokens_output': total_tokens_output,
-                'avg_response_time_ms': int(avg_response_time),
-                'first_message': history[0].created_at.isoformat(),
-                'last_message': history[-1].created_at.isoformat()
+                'message_count': stats['message_count'],
+                'total_cost_usd': float(stats['total_cost_usd']),
+                'total_tokens_input': int(stats['total_tokens_input']),
+                'total_tokens_output': int(stats['total_tokens_output']),
+                'avg_response_time_ms': int(avg_response_time) if avg_response_time is not None else 0,
+                'first_message': first_message.isoformat() if first_message else None,
+                'last_message': last_message.isoformat() if last_message else None
             }
             
         except Exception as e:
@@ -355,7 +372,7 @@ class ChatHistoryManager:
                 'error': str(e)
             }
     
-    def _generate_hash(self, text: str) -> str:
+    def _generate_hash(self, text: str) -> bytes:
         """
         Generate SHA256 hash of text.
         
@@ -363,6 +380,6 @@ class ChatHistoryManager:
             text: Text to hash
         
         Returns:
-            SHA256 hash as hex string
+            Raw 32-byte SHA256 digest
         """
-        return hashlib.sha256(text.encode('utf-8')).hexdigest()
+        return hash_question(text)
@@ -9,6 +9,7 @@ from typing import List, Dict, Any, Optional
 from datetime import datetime, timedelta
 from decimal import Decimal
 
+import numpy as np
 from sqlalchemy.orm import Session
 
 from src.data.repositories import (
@@ -21,6 +22,42 @@ from src.data.models import Cryptocurrency, PriceHistory, Prediction
 
 logger = logging.getLogger(__name__)
 
+# Common crypto symbols and the names they are mentioned by
+CRYPTO_PATTERNS = {
+    'BTC': ['bitcoin', 'btc'],
+    'ETH': ['ethereum', 'eth', 'ether'],
+    'SOL': ['solana', 'sol'],
+    'ADA': ['cardano', 'ada'],
+    'XRP': ['ripple', 'xrp'],
+    'DOGE': ['dogecoin', 'doge'],
+    'DOT': ['polkadot', 'dot'],
+    'MATIC': ['polygon', 'matic'],
+    'LINK': ['chainlink', 'link'],
+    'AVAX': ['avalanche', 'avax'],
+    'UNI': ['uniswap', 'uni'],
+    'LTC': ['litecoin', 'ltc'],
+    'ATOM': ['cosmos', 'atom'],
+    'XLM': ['stellar', 'xlm'],
+    'BNB': ['binance', 'bnb'],
+}
+
+_PATTERN_TO_SYMBOL = {
+    pattern: symbol
+    for symbol, patterns in CRYPTO_PATTERNS.items()
+    for pattern in patterns
+}
+
+# One alternation of all patterns, scanned in a single pass; word boundaries
+# avoid false matches
+_CRYPTO_RE = re.compile(
+    r'\b(' + '|'.join(map(re.escape, _PATTERN_TO_SYMBOL)) + r')\b',
+    re.IGNORECASE
+)
+
+# Prompt line templates for format_context_for_prompt
+_PREDICTION_LINE = "- %s (%s): Current $%.2f, Predicted $%.2f (%+.2f%%), Confidence: %.2f"
+_TREND_LINE = "- %s: $%.2f → $%.2f (%+.2f%% over %d hours)"
+
 
 class ContextBuilder:
     """
@@ -60,37 +97,10 @@ class ContextBuilder:
         Returns:
             List of cryptocurrency symbols found
         """
-        # Common crypto symbols and names
-        crypto_patterns = {
-            'BTC': ['bitcoin', 'btc'],
-            'ETH': ['ethereum', 'eth', 'ether'],
-            'SOL': ['solana', 'sol'],
-            'ADA': ['cardano', 'ada'],
-            'XRP': ['ripple', 'xrp'],
-            'DOGE': ['dogecoin', 'doge'],
-            'DOT': ['polkadot', 'dot'],
-            'MATIC': ['polygon', 'matic'],
-            'LINK': ['chainlink', 'link'],
-            'AVAX': ['avalanche', 'avax'],
-            'UNI': ['uniswap', 'uni'],
-            'LTC': ['litecoin', 'ltc'],
-            'ATOM': ['cosmos', 'atom'],
-            'XLM': ['stellar', 'xlm'],
-            'BNB': ['binance', 'bnb'],
-        }
-        
-        question_lower = question.lower()
-        found_symbols = []
-        
-        for symbol, patterns in crypto_patterns.items():
-            for pattern in patterns:
-                # Use word boundaries to avoid false matches
-                if re.search(r'\b' + re.escape(pattern) + r'\b', question_lower):
-                    found_symbols.append(symbol)
-                    break
-        
-        # Remove duplicates
-        found_symbols = list(set(found_symbols))
+        found_symbols = list({
+            _PATTERN_TO_SYMBOL[match.group(1).lower()]
+            for match in _CRYPTO_RE.finditer(question)
+        })
         
         logger.debug(f"Extracted crypto symbols from question: {found_symbols}")
         return found_symbols
@@ -98,7 +108,8 @@ class ContextBuilder:
     def get_lstm_predictions(
         self,
         symbols: Optional[List[str]] = None,
-        limit: int = 20
+        limit: int = 20,
+        cryptos: Optional[Dict[str, Cryptocurrency]] = None
     ) -> Dict[str, Any]:
         """
         Get LSTM predictions for specified cryptocurrencies or top performers.
@@ -106,6 +117,7 @@ class ContextBuilder:
         Args:
             symbols: List of crypto symbols (None = top performers)
             limit: Number of predictions to retrieve
+            cryptos: Symbols already resolved with get_by_symbols (None = look up)
         
         Returns:
             Dictionary with prediction data
@@ -117,68 +129,49 @@ class ContextBuilder:
         }
         
         if symbols:
-            # Get predictions for specific cryptocurrencies
-            for symbol in symbols:
-                crypto = self.crypto_repo.get_by_symbol(symbol)
-                if not crypto:
-                    continue
-                
-                # Get latest prediction
-                predictions = self.prediction_repo.get_by_crypto(crypto.id, limit=1)
-                if predictions:
-                    pred = predictions[0]
-                    
-                    # Get current price
-                    latest_price = self.price_repo.get_latest_by_crypto(crypto.id, limit=1)
-                    current_price = latest_price[0].price_usd if latest_price else pred.predicted_price
-                    
-                    # Calculate predicted change
-                    predicted_change = (
-                        (float(pred.predicted_price) - float(current_price)) / float(current_price)
-                    ) * 100
-                    
-                    predictions_data['predictions'].append({
-                        'symbol': crypto.symbol,
-                        'name': crypto.name,
-                        'current_price': float(current_price),
-                        'predicted_price': float(pred.predicted_price),
-                        'predicted_change_percent': predicted_change,
-                        'confidence': float(pred.confidence_score) if pred.confidence_score else 0.0,
-                        'horizon_hours': pred.prediction_horizon_hours
-                    })
-                    
-                    if predictions_data['timestamp'] is None:
-                        predictions_data['timestamp'] = pred.prediction_date
+            # Get latest predictions for specific cryptocurrencies
+            if cryptos is None:
+                cryptos = self.crypto_repo.get_by_symbols(symbols)
+            latest_predictions = self.prediction_repo.get_latest_by_crypto_ids(
+                crypto.id for crypto in cryptos.values()
+            )
+            selected = []
+            for symbol in dict.fromkeys(symbol.upper() for symbol in symbols):
+                crypto = cryptos.get(symbol)
+                if crypto and crypto.id in latest_predictions:
+                    selected.append((crypto.id, crypto.symbol, crypto.name, latest_predictions[crypto.id]))
         else:
             # Get top performers
             top_predictions = self.prediction_repo.get_top_performers(limit=limit)
             
-            for pred in top_predictions:
-                crypto = self.crypto_repo.get_by_id(pred.crypto_id)
-                if not crypto:
-                    continue
-                
-                # Get current price
-                latest_price = self.price_repo.get_latest_by_crypto(crypto.id, limit=1)
-                current_price = latest_price[0].price_usd if latest_price else pred.predicted_price
-                
-                # Calculate predicted change
-                predicted_change = (
-                    (float(pred.predicted_price) - float(current_price)) / float(current_price)
-                ) * 100
-                
-                predictions_data['predictions'].append({
-                    'symbol': crypto.symbol,
-                    'name': crypto.name,
-                    'current_price': float(current_price),
-                    'predicted_price': float(pred.predicted_price),
-                    'predicted_change_percent': predicted_change,
-                    'confidence': float(pred.confidence_score) if pred.confidence_score else 0.0,
-                    'horizon_hours': pred.prediction_horizon_hours
-                })
-                
-                if predictions_data['timestamp'] is None:
-                    predictions_data['timestamp'] = pred.prediction_date
+            selected = [(pred.crypto_id, pred.symbol, pred.name, pred) for pred in top_predictions]
+        
+        # Current prices of all selected cryptocurrencies in one lookup
+        latest_prices = self.price_repo.get_latest_by_crypto_ids(
+            crypto_id for crypto_id, _, _, _ in selected
+        )
+        
+        for crypto_id, symbol, name, pred in selected:
+            latest_price = latest_prices.get(crypto_id)
+            current_price = latest_price.price_usd if latest_price else pred.predicted_price
+            
+            # Calculate predicted change
+            predicted_change = (
+                (float(pred.predicted_price) - float(current_price)) / float(current_price)
+            ) * 100
+            
+            predictions_data['predictions'].append({
+                'symbol': symbol,
+                'name': name,
+                'current_price': float(current_price),
+                'predicted_price': float(pred.predicted_price),
+                'predicted_change_percent': predicted_change,
+                'confidence': float(pred.confidence_score) if pred.confidence_score else 0.0,
+                'horizon_hours': pred.prediction_horizon_hours
+            })
+            
+            if predictions_data['timestamp'] is None:
+                predictions_data['timestamp'] = pred.prediction_date.isoformat()
         
         predictions_data['count'] = len(predictions_data['predictions'])
         
@@ -206,7 +199,7 @@ class ContextBuilder:
             tendency_data['tendency'] = latest.tendency
             tendency_data['confidence'] = float(latest.confidence) if latest.confidence else 0.0
             tendency_data['metrics'] = latest.metrics or {}
-            tendency_data['timestamp'] = latest.timestamp
+            tendency_data['timestamp'] = latest.timestamp.isoformat()
         
         logger.debug(f"Retrieved market tendency: {tendency_data['tendency']}")
         return tendency_data
@@ -214,45 +207,43 @@ class ContextBuilder:
     def get_recent_price_data(
         self,
         symbols: List[str],
-        hours: int = 24
-    ) -> Dict[str, List[Dict[str, Any]]]:
+        hours: int = 24,
+        cryptos: Optional[Dict[str, Cryptocurrency]] = None
+    ) -> Dict[str, List[float]]:
         """
         Get recent price data for specified cryptocurrencies.
         
         Args:
             symbols: List of crypto symbols
             hours: Number of hours to look back
+            cryptos: Symbols already resolved with get_by_symbols (None = look up)
         
         Returns:
-            Dictionary mapping symbols to price data
+            Dictionary mapping symbols to prices in USD, oldest first
         """
         price_data = {}
         
         end_time = datetime.now()
         start_time = end_time - timedelta(hours=hours)
         
+        # Resolve all symbols, then read every price series in one query
+        if cryptos is None:
+            cryptos = self.crypto_repo.get_by_symbols(symbols)
+        prices_by_crypto = self.price_repo.get_price_arrays_by_crypto_ids(
+            [crypto.id for crypto in cryptos.values()],
+            start_time,
+            end_time
+        )
+        
         for symbol in symbols:
-            crypto = self.crypto_repo.get_by_symbol(symbol)
+            crypto = cryptos.get(symbol.upper())
             if not crypto:
                 continue
             
-            # Get price history
-            prices = self.price_repo.get_by_crypto_and_time_range(
-                crypto.id,
-                start_time,
-                end_time
-            )
-            
-            if prices:
-                price_data[symbol] = [
-                    {
-                        'timestamp': p.timestamp.isoformat(),
-                        'price': float(p.price_usd),
-                        'volume_24h': float(p.volume_24h) if p.volume_24h else 0.0,
-                        'market_cap': float(p.market_cap) if p.market_cap else 0.0
-                    }
-                    for p in prices
-                ]
+            prices = prices_by_crypto.get(crypto.id)
+            if prices is not None:
+                # Plain floats: the context is stored as JSON with the chat
+                price_data[symbol] = prices.tolist()
         
         logger.debug(f"Retrieved recent price data for {len(price_data)} cryptocurrencies")
         return price_data
@@ -265,7 +256,8 @@ class ContextBuilder:
             question: User question
         
         Returns:
-            Dictionary with all relevant context data
+            Dictionary with all relevant context data; JSON-serializable, as
+            it is stored with the chat message (timestamps are ISO strings)
         """
         logger.info("Building context for question")
         
@@ -282,10 +274,16 @@ class ContextBuilder:
             'timestamp': datetime.now().isoformat()
         }
         
+        # Resolve mentioned cryptos once for predictions and price data
+        cryptos = self.crypto_repo.get_by_symbols(mentioned_symbols) if mentioned_symbols else None
+        
         # Get LSTM predictions
         if mentioned_symbols:
             # Get predictions for mentioned cryptos
-            context['lstm_predictions'] = self.get_lstm_predictions(symbols=mentioned_symbols)
+            context['lstm_predictions'] = self.get_lstm_predictions(
+                symbols=mentioned_symbols,
+                cryptos=cryptos
+            )
         else:
             # Get top performers if no specific cryptos mentioned
             context['lstm_predictions'] = self.get_lstm_predictions(limit=20)
@@ -295,7 +293,11 @@ class ContextBuilder:
         
         # Get recent price data for mentioned cryptos
         if mentioned_symbols:
-            context['recent_prices'] = self.get_recent_price_data(mentioned_symbols, hours=24)
+            context['recent_prices'] = self.get_recent_price_data(
+                mentioned_symbols,
+                hours=24,
+                cryptos=cryptos
+            )
         
         logger.info(
             f"Built context: {len(context['lstm_predictions']['predictions'])} predictions, "
@@ -335,14 +337,17 @@ class ContextBuilder:
         if context['lstm_predictions']['predictions']:
             lines.append("LSTM Model Predictions (Next 24 Hours):")
             
-            for pred in context['lstm_predictions']['predictions'][:10]:  # Limit to top 10 for prompt
-                lines.append(
-                    f"- {pred['symbol']} ({pred['name']}): "
-                    f"Current ${pred['current_price']:.2f}, "
-                    f"Predicted ${pred['predicted_price']:.2f} "
-                    f"({pred['predicted_change_percent']:+.2f}%), "
-                    f"Confidence: {pred['confidence']:.2f}"
+            lines.extend(
+                _PREDICTION_LINE % (
+                    pred['symbol'],
+                    pred['name'],
+                    pred['current_price'],
+                    pred['predicted_price'],
+                    pred['predicted_change_percent'],
+                    pred['confidence']
                 )
+                for pred in context['lstm_predictions']['predictions'][:10]  # Limit to top 10 for prompt
+            )
             
             if len(context['lstm_predictions']['predictions']) > 10:
                 lines.append(f"... and {len(context['lstm_predictions']['predictions']) - 10} more")
@@ -352,16 +357,23 @@ class ContextBuilder:
         if context['recent_prices']:
             lines.append("Recent Price Trends:")
             
-            for symbol, prices in context['recent_prices'].items():
-                if len(prices) >= 2:
-                    start_price = prices[0]['price']
-                    end_price = prices[-1]['price']
-                    change_percent = ((end_price - start_price) / start_price) * 100
-                    
-                    lines.append(
-                        f"- {symbol}: ${start_price:.2f} → ${end_price:.2f} "
-                        f"({change_percent:+.2f}% over {len(prices)} hours)"
-                    )
+            # Changes of all symbols with a trend, computed in one pass over
+            # their first and last prices
+            trends = {
+                symbol: prices
+                for symbol, prices in context['recent_prices'].items()
+                if len(prices) >= 2
+            }
+            start_prices = np.array([prices[0] for prices in trends.values()], dtype=np.float64)
+            end_prices = np.array([prices[-1] for prices in trends.values()], dtype=np.float64)
+            change_percents = (end_prices - start_prices) / start_prices * 100
+            
+            lines.extend(
+                _TREND_LINE % (symbol, start_price, end_price, change_percent, len(prices))
+                for (symbol, prices), start_price, end_price, change_percent in zip(
+                    trends.items(), start_prices, end_prices, change_percents
+                )
+            )
             lines.append("")
         
         formatted_text = "\n".join(lines)
@@ -11,10 +11,11 @@ Main interface for OpenAI API integration with full workflow:
 import logging
 import hashlib
 import time
+from functools import lru_cache
 from typing import Dict, Any, Optional, List
 from dataclasses import dataclass
 from decimal import Decimal
-from datetime import datetime
+from datetime import datetime, timedelta
 
 from openai import OpenAI, OpenAIError
 from sqlalchemy.orm import Session
@@ -23,10 +24,28 @@ from src.genai.pii_filter import PIIFilter, PIIDetectionResult
 from src.genai.topic_validator import TopicValidator, TopicValidationResult
 from src.genai.context_builder import ContextBuilder
 from src.config.config_loader import Config
+from src.data.repositories import ChatHistoryRepository
 
 logger = logging.getLogger(__name__)
 
 
+@lru_cache(maxsize=4096)
+def hash_question(question: str) -> bytes:
+    """
+    Generate SHA256 digest of a question, memoized.
+    
+    Each question is hashed for the cached answer lookup and again when it
+    is stored, and users often repeat questions.
+    
+    Args:
+        question: User question
+    
+    Returns:
+        Raw 32-byte SHA256 digest
+    """
+    return hashlib.sha256(question.encode('utf-8')).digest()
+
+
 @dataclass
 class ChatResponse:
     """Response from GenAI engine."""
@@ -78,6 +97,10 @@ class GenAIEngine:
         }
     }
     
+    # Reuse a stored answer to an identical question for this long; kept short
+    # because answers depend on live market data
+    ANSWER_CACHE_TTL_SECONDS = 3600
+    
     def __init__(
         self,
         config: Config,
@@ -100,6 +123,7 @@ class GenAIEngine:
         self.pii_filter = PIIFilter()
         self.topic_validator = TopicValidator()
         self.context_builder = ContextBuilder(session)
+        self.chat_repo = ChatHistoryRepository(session)
         
         # System prompt for crypto assistant
         self.system_prompt = (
@@ -178,7 +202,12 @@ class GenAIEngine:
                 response_time_ms=int((time.time() - start_time) * 1000)
             )
         
-        # Step 3: Build context
+        # Step 3: Reuse a recent answer to the same question
+        cached_response = self._get_cached_response(question, session_id, start_time)
+        if cached_response is not None:
+            return cached_response
+        
+        # Step 4: Build context
         try:
             context = self.context_builder.build_context(question)
             context_text = self.context_builder.format_context_for_prompt(context)
@@ -187,7 +216,7 @@ class GenAIEngine:
             context = {}
             context_text = ""
         
-        # Step 4: Call OpenAI API
+        # Step 5: Call OpenAI API
         try:
             answer, tokens_input, tokens_output = self._call_openai(
                 question,
@@ -239,6 +268,51 @@ class GenAIEngine:
                 response_time_ms=int((time.time() - start_time) * 1000)
             )
     
+    def _get_cached_response(
+        self,
+        question: str,
+        session_id: str,
+        start_time: float
+    ) -> Optional[ChatResponse]:
+        """
+        Build a response from a recent answer to an identical question.
+        
+        Args:
+            question: User question
+            session_id: User session ID
+            start_time: Query start time (time.time())
+        
+        Returns:
+            ChatResponse reusing the stored answer, or None on a miss
+        """
+        since = datetime.now() - timedelta(seconds=self.ANSWER_CACHE_TTL_SECONDS)
+        try:
+            cached = self.chat_repo.get_recent_answer(
+                self.generate_question_hash(question),
+                since
+            )
+        except Exception as e:
+            logger.warning(f"Error looking up cached answer: {e}")
+            self.session.rollback()
+            return None
+        
+        if cached is None:
+            return None
+        
+        logger.info(f"Reusing answer from chat history id={cached.id}")
+        
+        return ChatResponse(
+            success=True,
+            answer=cached.answer,
+            question=question,
+            session_id=session_id,
+            context_used=cached.context_used,
+            tokens_input=0,
+            tokens_output=0,
+            cost_usd=Decimal('0'),
+            response_time_ms=int((time.time() - start_time) * 1000)
+        )
+    
     def _call_openai(
         self,
         question: str,
@@ -324,7 +398,7 @@ class GenAIEngine:
         
         return Decimal(str(total_cost))
     
-    def generate_question_hash(self, question: str) -> str:
+    def generate_question_hash(self, question: str) -> bytes:
         """
         Generate SHA256 hash of question for deduplication.
         
@@ -332,9 +406,9 @@ class GenAIEngine:
             question: User question
         
         Returns:
-            SHA256 hash as hex string
+            Raw 32-byte SHA256 digest
         """
-        return hashlib.sha256(question.encode('utf-8')).hexdigest()
+        return hash_question(question)
     
     def validate_question(self, question: str) -> tuple[bool, str]:
         """
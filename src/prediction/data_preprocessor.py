@@ -4,7 +4,7 @@ Handles feature engineering, normalization, and sequence generation.
 """
 
 import logging
-from typing import List, Tuple, Optional, Dict, Any
+from typing import List, Tuple, Optional, Dict, Any, Union
 from datetime import datetime, timedelta
 from decimal import Decimal
 
@@ -41,30 +41,34 @@ class DataPreprocessor:
         
         logger.info(f"Initialized DataPreprocessor with sequence_length={sequence_length}")
     
-    def prepare_dataframe(self, price_history: List[Any]) -> pd.DataFrame:
+    def prepare_dataframe(self, price_history: Union[List[Any], pd.DataFrame]) -> pd.DataFrame:
         """
         Convert price history records to pandas DataFrame.
         
         Args:
-            price_history: List of PriceHistory model instances
+            price_history: List of PriceHistory model instances, or a DataFrame
+                from PriceHistoryRepository.get_prices_as_frame
         
         Returns:
             DataFrame with columns: timestamp, price_usd, volume_24h, market_cap
         """
-        if not price_history:
+        if len(price_history) == 0:
             logger.warning("Empty price history provided")
             return pd.DataFrame()
         
-        data = []
-        for record in price_history:
-            data.append({
-                'timestamp': record.timestamp,
-                'price_usd': float(record.price_usd) if record.price_usd else 0.0,
-                'volume_24h': float(record.volume_24h) if record.volume_24h else 0.0,
-                'market_cap': float(record.market_cap) if record.market_cap else 0.0
-            })
-        
-        df = pd.DataFrame(data)
+        value_columns = ['price_usd', 'volume_24h', 'market_cap']
+        if isinstance(price_history, pd.DataFrame):
+            df = price_history[['timestamp'] + value_columns].copy()
+        else:
+            df = pd.DataFrame.from_records(
+                [
+                    (r.timestamp, r.price_usd, r.volume_24h, r.market_cap)
+                    for r in price_history
+                ],
+                columns=['timestamp'] + value_columns
+            )
+        # Columns are read as floats; missing values become 0.0
+        df[value_columns] = df[value_columns].astype('float64').fillna(0.0)
         df = df.sort_values('timestamp').reset_index(drop=True)
         
         logger.debug(f"Prepared DataFrame with {len(df)} records")
@@ -334,7 +338,7 @@ class DataPreprocessor:
     
     def preprocess(
         self,
-        price_history: List[Any],
+        price_history: Union[List[Any], pd.DataFrame],
         fit: bool = True,
         create_splits: bool = True
     ) -> Dict[str, Any]:
@@ -342,7 +346,7 @@ class DataPreprocessor:
         Complete preprocessing pipeline.
         
         Args:
-            price_history: List of PriceHistory model instances
+            price_history: List of PriceHistory model instances or price DataFrame
             fit: Whether to fit scalers (True for training, False for inference)
             create_splits: Whether to create train/val/test splits
         
@@ -98,7 +98,7 @@ class IncrementalTrainer:
                     end_time = datetime.now()
                     start_time_data = end_time - timedelta(hours=hours_back)
                     
-                    new_prices = price_repo.get_by_crypto_and_time_range(
+                    new_prices = price_repo.get_prices_as_frame(
                         crypto.id,
                         start_time_data,
                         end_time
@@ -292,7 +292,7 @@ class IncrementalTrainer:
                 end_time = datetime.now()
                 start_time_data = end_time - timedelta(days=months_back * 30)
                 
-                prices = price_repo.get_by_crypto_and_time_range(
+                prices = price_repo.get_prices_as_frame(
                     crypto.id,
                     start_time_data,
                     end_time
@@ -89,26 +89,27 @@ class MarketTendencyClassifier:
         Returns:
             List of dictionaries with crypto info and price changes
         """
-        # Get top cryptocurrencies
+        # Calculate time range
+        end_time = datetime.now()
+        start_time = end_time - timedelta(hours=self.lookback_hours)
+        
+        # Get top cryptocurrencies, then their prices for the period in one query
         top_cryptos = self.crypto_repo.get_top_by_market_cap(self.top_n_cryptos)
         
         if not top_cryptos:
             logger.warning("No cryptocurrencies found")
             return []
         
-        # Calculate time range
-        end_time = datetime.now()
-        start_time = end_time - timedelta(hours=self.lookback_hours)
+        prices_by_crypto = self.price_repo.get_by_crypto_ids_and_time_range(
+            [crypto.id for crypto in top_cryptos],
+            start_time,
+            end_time
+        )
         
         price_changes = []
         
         for crypto in top_cryptos:
-            # Get price data for the period
-            prices = self.price_repo.get_by_crypto_and_time_range(
-                crypto.id,
-                start_time,
-                end_time
-            )
+            prices = prices_by_crypto.get(crypto.id, [])
             
             if len(prices) < 2:
                 continue
@@ -100,12 +100,12 @@ class PortfolioEvaluator:
                     logger.warning(f"{symbol}: Not found in database")
                     continue
                 
-                latest_prices = self.price_repo.get_latest_by_crypto(crypto.id, limit=1)
-                if not latest_prices:
+                latest_price = self.price_repo.get_latest_price(crypto.id)
+                if not latest_price:
                     logger.warning(f"{symbol}: No price data available")
                     continue
                 
-                current_price = float(latest_prices[0].price_usd)
+                current_price = float(latest_price.price_usd)
                 current_value = current_price * quantity
                 
                 # Get prediction
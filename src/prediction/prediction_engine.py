@@ -310,13 +310,9 @@ class PredictionEngine:
         # Convert to PredictionResult objects
         results = []
         for pred in db_predictions:
-            crypto = self.crypto_repo.get_by_id(pred.crypto_id)
-            if not crypto:
-                continue
-            
             # Get current price
-            latest_price = self.price_repo.get_latest_by_crypto(pred.crypto_id, limit=1)
-            current_price = latest_price[0].price_usd if latest_price else pred.predicted_price
+            latest_price = self.price_repo.get_latest_price(pred.crypto_id)
+            current_price = latest_price.price_usd if latest_price else pred.predicted_price
             
             # Calculate predicted change
             predicted_change_percent = (
@@ -325,8 +321,8 @@ class PredictionEngine:
             
             results.append(PredictionResult(
                 crypto_id=pred.crypto_id,
-                symbol=crypto.symbol,
-                name=crypto.name,
+                symbol=pred.symbol,
+                name=pred.name,
                 current_price=current_price,
                 predicted_price=pred.predicted_price,
                 predicted_change_percent=predicted_change_percent,
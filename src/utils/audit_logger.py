@@ -3,20 +3,30 @@ Comprehensive audit logging system.
 Tracks all security-relevant events and user activities for compliance and monitoring.
 """
 
+import atexit
 import logging
 import json
+import threading
 from datetime import datetime, timedelta
-from typing import Dict, Any, Optional, List
+from typing import Callable, Dict, Any, Optional, List
 from dataclasses import dataclass, asdict
 from enum import Enum
 from flask import request, g
 from sqlalchemy.orm import Session
-from sqlalchemy import Column, Integer, String, DateTime, Boolean, Text, JSON
+from sqlalchemy import Column, Integer, String, DateTime, Boolean, Text, JSON, insert
 
-from src.data.database import Base
+from src.data.database import Base, new_session
+from src.data.repositories import RETENTION_DELETE_BATCH_SIZE, delete_before
+from src.data.write_queue import BatchWriteQueue
 
 logger = logging.getLogger(__name__)
 
+# Most audit events written per transaction
+AUDIT_WRITE_BATCH_SIZE = 100
+
+# Longest time an audit event waits in the queue before it is written
+AUDIT_WRITE_FLUSH_SECONDS = 0.1
+
 
 class AuditEventType(Enum):
     """Types of audit events."""
@@ -105,15 +115,104 @@ class AuditLog(Base):
         return f"<AuditLog(id={self.id}, event_type='{self.event_type}', severity='{self.severity}')>"
 
 
+class AuditWriteQueue(BatchWriteQueue):
+    """
+    Background batch writer for audit events.
+    
+    Events are queued by request handlers and inserted by a daemon thread,
+    up to AUDIT_WRITE_BATCH_SIZE events or AUDIT_WRITE_FLUSH_SECONDS at a
+    time. Events still queued when the process is killed are lost.
+    """
+    
+    thread_name = 'audit-write-queue'
+    
+    def __init__(
+        self,
+        session_factory: Callable[[], Session] = new_session,
+        batch_size: int = AUDIT_WRITE_BATCH_SIZE,
+        flush_seconds: float = AUDIT_WRITE_FLUSH_SECONDS
+    ):
+        """
+        Initialize audit write queue.
+        
+        Args:
+            session_factory: Callable returning a new database session
+            batch_size: Most events written per transaction
+            flush_seconds: Longest wait before queued events are written
+        """
+        super().__init__(session_factory, batch_size, flush_seconds)
+    
+    def put(self, record: Dict[str, Any]) -> None:
+        """
+        Queue an audit event for writing, starting the writer if needed.
+        
+        Args:
+            record: AuditLog column values
+        """
+        self._enqueue(record)
+    
+    def _write_batch(self, batch: List[Dict[str, Any]]) -> None:
+        """
+        Insert a batch of audit events in one transaction.
+        
+        Args:
+            batch: Queued AuditLog column values
+        """
+        session = self.session_factory()
+        try:
+            session.execute(insert(AuditLog), batch)
+            session.commit()
+            logger.debug(f"Wrote {len(batch)} audit events")
+        except Exception as e:
+            session.rollback()
+            logger.error(f"Error writing {len(batch)} queued audit events: {e}", exc_info=True)
+        finally:
+            session.close()
+
+
+# Global audit write queue instance
+_audit_write_queue = None
+_queue_lock = threading.Lock()
+
+
+def get_audit_write_queue() -> AuditWriteQueue:
+    """
+    Get the global audit write queue, flushed on interpreter exit.
+    
+    Returns:
+        AuditWriteQueue instance
+    """
+    global _audit_write_queue
+    
+    with _queue_lock:
+        if _audit_write_queue is None:
+            _audit_write_queue = AuditWriteQueue()
+            atexit.register(_audit_write_queue.stop, AUDIT_WRITE_FLUSH_SECONDS * 50)
+    
+    return _audit_write_queue
+
+
 class AuditLogger:
     """
     Comprehensive audit logging system.
     Handles logging of security events, user activities, and system events.
     """
     
-    def __init__(self, session: Session):
-        """Initialize audit logger with database session."""
+    def __init__(
+        self,
+        session: Optional[Session] = None,
+        write_queue: Optional[AuditWriteQueue] = None
+    ):
+        """
+        Initialize audit logger.
+        
+        Args:
+            session: Database session for direct writes and queries
+            write_queue: Queue events for a background batch write instead
+                of committing each one
+        """
         self.session = session
+        self.write_queue = write_queue
         
     def log_event(self, event: AuditEvent) -> Optional[AuditLog]:
         """
@@ -123,24 +222,30 @@ class AuditLogger:
             event: AuditEvent instance to log
             
         Returns:
-            Created AuditLog instance or None if failed
+            Created AuditLog instance, or None if failed or queued
         """
+        record = {
+            'event_type': event.event_type.value,
+            'severity': event.severity.value,
+            'message': event.message,
+            'user_id': event.user_id,
+            'session_id': event.session_id,
+            'ip_address': event.ip_address,
+            'user_agent': event.user_agent,
+            'endpoint': event.endpoint,
+            'method': event.method,
+            'status_code': event.status_code,
+            'response_time_ms': event.response_time_ms,
+            'additional_data': event.additional_data,
+            'created_at': event.timestamp,
+        }
+        
+        if self.write_queue is not None:
+            self.write_queue.put(record)
+            return None
+        
         try:
-            audit_log = AuditLog(
-                event_type=event.event_type.value,
-                severity=event.severity.value,
-                message=event.message,
-                user_id=event.user_id,
-                session_id=event.session_id,
-                ip_address=event.ip_address,
-                user_agent=event.user_agent,
-                endpoint=event.endpoint,
-                method=event.method,
-                status_code=event.status_code,
-                response_time_ms=event.response_time_ms,
-                additional_data=event.additional_data,
-                created_at=event.timestamp
-            )
+            audit_log = AuditLog(**record)
             
             self.session.add(audit_log)
             self.session.commit()
@@ -315,12 +420,19 @@ class AuditLogger:
             
         return query.order_by(AuditLog.created_at.desc()).limit(limit).all()
     
-    def cleanup_old_logs(self, retention_days: int = 90) -> int:
+    def cleanup_old_logs(
+        self,
+        retention_days: int = 90,
+        batch_size: int = RETENTION_DELETE_BATCH_SIZE
+    ) -> int:
         """
         Clean up old audit logs based on retention policy.
         
+        Logs are deleted in separately committed batches.
+        
         Args:
             retention_days: Number of days to retain logs
+            batch_size: Maximum logs deleted per transaction
             
         Returns:
             Number of logs deleted
@@ -328,11 +440,7 @@ class AuditLogger:
         cutoff_date = datetime.utcnow() - timedelta(days=retention_days)
         
         try:
-            deleted_count = self.session.query(AuditLog)\
-                .filter(AuditLog.created_at < cutoff_date)\
-                .delete()
-            
-            self.session.commit()
+            deleted_count = delete_before(self.session, AuditLog, cutoff_date, batch_size)
             
             logger.info(f"Cleaned up {deleted_count} old audit logs (older than {retention_days} days)")
             return deleted_count
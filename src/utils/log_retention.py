@@ -160,8 +160,8 @@ class LogRetentionManager:
                 },
                 "current_counts": {
                     "total_audit_logs": session.query(audit_logger.AuditLog).count(),
-                    "total_chat_history": chat_repo.get_total_count(),
-                    "total_query_audit_logs": audit_repo.get_total_count()
+                    "total_chat_history": chat_repo.get_total_count(exact=False),
+                    "total_query_audit_logs": audit_repo.get_total_count(exact=False)
                 },
                 "eligible_for_cleanup": {
                     "audit_logs": session.query(audit_logger.AuditLog)
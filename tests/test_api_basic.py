@@ -134,6 +134,34 @@ def test_market_tendency_endpoint_structure(client):
             assert 'timestamp' in data
 
 
+def test_market_bundle_endpoint_structure(client):
+    """Test market bundle endpoint returns requested sections."""
+    with patch('src.api.routes.market.MarketTendencyClassifier') as mock_classifier:
+        mock_result = Mock()
+        mock_result.tendency = 'bullish'
+        mock_result.confidence = 0.78
+        mock_result.metrics = {'avg_change_percent': 2.5}
+        mock_result.timestamp = datetime.now()
+        
+        mock_classifier_instance = Mock()
+        mock_classifier_instance.get_cached_or_analyze.return_value = mock_result
+        mock_classifier_instance.get_tendency_history.return_value = [mock_result]
+        mock_classifier.return_value = mock_classifier_instance
+        
+        with patch('src.api.routes.market.session_scope'):
+            response = client.get('/api/market/bundle?include=tendency,history')
+            
+            assert response.status_code == 200
+            data = response.get_json()
+            
+            assert data['tendency']['tendency'] == 'bullish'
+            assert data['history']['count'] == 1
+            assert 'overview' not in data
+            
+            response = client.get('/api/market/bundle?include=unknown')
+            assert response.status_code == 400
+
+
 def test_chat_query_validation(client):
     """Test chat query endpoint validation."""
     # Test missing question
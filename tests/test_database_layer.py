@@ -4,9 +4,10 @@ Tests database connection, models, and repositories.
 """
 
 import pytest
-from datetime import datetime
+from datetime import datetime, timedelta
 from decimal import Decimal
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event, text
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import sessionmaker
 
 from src.data.database import Base
@@ -25,7 +26,11 @@ from src.data.repositories import (
     ChatHistoryRepository,
     AuditLogRepository,
     MarketTendencyRepository,
+    AlertLogRepository,
 )
+from src.data.chat_write_queue import ChatWriteQueue
+from src.data.chat_history_cache import recent_history_cache, is_known_empty
+from src.data.top_performers_cache import TopPerformer, top_performers_cache
 
 
 @pytest.fixture
@@ -69,6 +74,54 @@ class TestCryptoRepository:
         assert crypto.symbol == 'ETH'
         assert crypto.name == 'Ethereum'
     
+    def test_symbol_stored_upper_case(self, session):
+        """Test that symbols are normalized however the model is created."""
+        session.add(Cryptocurrency(symbol='doge', name='Dogecoin'))
+        session.commit()
+        
+        crypto = CryptoRepository(session).get_by_symbol('Doge')
+        assert crypto is not None
+        assert crypto.symbol == 'DOGE'
+    
+    def test_get_by_symbol_cached(self, session):
+        """Test that repeated symbol lookups resolve without a query."""
+        repo = CryptoRepository(session)
+        crypto = repo.create('ADA', 'Cardano', 8)
+        
+        statements = []
+        event.listen(
+            session.get_bind(),
+            'before_cursor_execute',
+            lambda conn, cursor, statement, *args: statements.append(statement)
+        )
+        assert repo.get_by_symbol('ada') is crypto
+        assert statements == []
+        
+        repo.update(crypto.id, symbol='ADA2')
+        assert repo.get_by_symbol('ADA') is None
+    
+    def test_get_by_symbols(self, session):
+        """Test resolving several symbols in one query."""
+        repo = CryptoRepository(session)
+        repo.create('BTC', 'Bitcoin', 1)
+        repo.create('ETH', 'Ethereum', 2)
+        session.commit()
+        
+        cryptos = repo.get_by_symbols(['btc', 'ETH', 'XYZ'])
+        assert sorted(cryptos) == ['BTC', 'ETH']
+        assert cryptos['BTC'].name == 'Bitcoin'
+        assert repo.get_by_symbols([]) == {}
+    
+    def test_update_rejects_unknown_fields(self, session):
+        """Test that update only sets known columns."""
+        repo = CryptoRepository(session)
+        crypto = repo.create('XRP', 'Ripple', 6)
+        
+        assert repo.update(crypto.id, name='XRP', market_cap_rank=5) is crypto
+        assert crypto.market_cap_rank == 5
+        with pytest.raises(ValueError):
+            repo.update(crypto.id, price_history=[])
+    
     def test_get_or_create(self, session):
         """Test get_or_create functionality."""
         repo = CryptoRepository(session)
@@ -81,6 +134,80 @@ class TestCryptoRepository:
         crypto2 = repo.get_or_create('SOL', 'Solana', 5)
         
         assert crypto1.id == crypto2.id
+    
+    def test_get_or_create_updates_rank(self, session):
+        """Test that get_or_create updates the rank of an existing symbol."""
+        crypto = CryptoRepository(session).create('SOL', 'Solana', 5)
+        session.commit()
+        
+        # A new repository has no cached ids, so the upsert path is taken
+        repo = CryptoRepository(session)
+        updated = repo.get_or_create('sol', 'Solana', 4)
+        assert updated is crypto
+        assert updated.market_cap_rank == 4
+        
+        unchanged = repo.get_or_create('SOL', 'Solana')
+        assert unchanged.market_cap_rank == 4
+    
+    def test_get_or_create_keeps_unchanged_row(self, session):
+        """Test that an unchanged rank does not rewrite the row or updated_at."""
+        crypto = CryptoRepository(session).create('SOL', 'Solana', 5)
+        session.commit()
+        session.execute(
+            text("UPDATE cryptocurrencies SET updated_at = '2024-01-01 00:00:00'")
+        )
+        session.commit()
+        
+        for rank in (5, None):
+            fetched = CryptoRepository(session).get_or_create('SOL', 'Solana', rank)
+            assert fetched is crypto
+            assert fetched.market_cap_rank == 5
+            session.commit()
+            assert crypto.updated_at == datetime(2024, 1, 1)
+        
+        CryptoRepository(session).get_or_create('SOL', 'Solana', 3)
+        session.commit()
+        assert crypto.market_cap_rank == 3
+        assert crypto.updated_at > datetime(2024, 1, 1)
+    
+    def test_bulk_get_or_create(self, session):
+        """Test resolving existing and new symbols in one call."""
+        repo = CryptoRepository(session)
+        btc = repo.create('BTC', 'Bitcoin', 1)
+        session.commit()
+        
+        ids = CryptoRepository(session).bulk_get_or_create([
+            ('btc', 'Bitcoin', 1),
+            ('ETH', 'Ethereum', 2),
+            ('ADA', 'Cardano', None),
+        ])
+        session.commit()
+        
+        assert set(ids) == {'BTC', 'ETH', 'ADA'}
+        assert ids['BTC'] == btc.id
+        assert repo.get_by_symbol('ETH').id == ids['ETH']
+        assert repo.get_by_symbol('ADA').name == 'Cardano'
+    
+    def test_price_history_not_loaded_implicitly(self, session):
+        """Test that price history is never lazy-loaded and deletes cascade in SQL."""
+        repo = CryptoRepository(session)
+        crypto = repo.create('BTC', 'Bitcoin', 1)
+        session.commit()
+        PriceHistoryRepository(session).create(crypto.id, datetime(2024, 1, 1), Decimal('45000'))
+        session.commit()
+        session.expunge_all()
+        
+        crypto = repo.get_by_symbol('BTC')
+        statements = []
+        event.listen(
+            session.get_bind(),
+            'before_cursor_execute',
+            lambda conn, cursor, statement, *args: statements.append(statement)
+        )
+        assert crypto.price_history == []
+        assert statements == []
+        
+        assert repo.delete(crypto.id) is True
 
 
 class TestPriceHistoryRepository:
@@ -101,7 +228,8 @@ class TestPriceHistoryRepository:
             timestamp=timestamp,
             price_usd=Decimal('45000.00'),
             volume_24h=Decimal('1000000.00'),
-            market_cap=Decimal('900000000.00')
+            market_cap=Decimal('900000000.00'),
+            flush=True
         )
         
         assert price.id is not None
@@ -123,6 +251,221 @@ class TestPriceHistoryRepository:
         # Test
         latest = price_repo.get_latest_timestamp(crypto.id)
         assert latest == datetime(2024, 1, 2)
+    
+    def test_get_latest_timestamps(self, session):
+        """Test getting the latest timestamp of several cryptos at once."""
+        crypto_repo = CryptoRepository(session)
+        btc = crypto_repo.create('BTC', 'Bitcoin', 1)
+        eth = crypto_repo.create('ETH', 'Ethereum', 2)
+        ada = crypto_repo.create('ADA', 'Cardano', 8)
+        session.commit()
+        
+        price_repo = PriceHistoryRepository(session)
+        price_repo.create(btc.id, datetime(2024, 1, 1), Decimal('45000'))
+        price_repo.create(btc.id, datetime(2024, 1, 2), Decimal('46000'))
+        price_repo.create(eth.id, datetime(2024, 1, 3), Decimal('2500'))
+        session.commit()
+        
+        assert price_repo.get_latest_timestamps([btc.id, ada.id]) == {
+            btc.id: datetime(2024, 1, 2)
+        }
+        assert price_repo.get_latest_timestamps() == {
+            btc.id: datetime(2024, 1, 2),
+            eth.id: datetime(2024, 1, 3),
+        }
+    
+    def test_get_latest_by_crypto_ids(self, session):
+        """Test getting the latest price record of several cryptos at once."""
+        from src.data.price_cache import latest_price_cache
+        latest_price_cache.invalidate()
+        
+        crypto_repo = CryptoRepository(session)
+        btc = crypto_repo.create('BTC', 'Bitcoin', 1)
+        eth = crypto_repo.create('ETH', 'Ethereum', 2)
+        ada = crypto_repo.create('ADA', 'Cardano', 8)
+        session.commit()
+        
+        price_repo = PriceHistoryRepository(session)
+        price_repo.create(btc.id, datetime(2024, 1, 1), Decimal('45000'))
+        price_repo.create(btc.id, datetime(2024, 1, 2), Decimal('46000'))
+        price_repo.create(eth.id, datetime(2024, 1, 3), Decimal('2500'))
+        session.commit()
+        
+        latest = price_repo.get_latest_by_crypto_ids([btc.id, eth.id, ada.id])
+        assert {crypto_id: p.price_usd for crypto_id, p in latest.items()} == {
+            btc.id: Decimal('46000'),
+            eth.id: Decimal('2500'),
+        }
+        # Second read is served from the latest price cache
+        cached = price_repo.get_latest_by_crypto_ids([btc.id])
+        assert cached[btc.id].timestamp == datetime(2024, 1, 2)
+        latest_price_cache.invalidate()
+    
+    def test_get_by_crypto_ids_and_time_range(self, session):
+        """Test reading several cryptos' price ranges in one query."""
+        crypto_repo = CryptoRepository(session)
+        btc = crypto_repo.create('BTC', 'Bitcoin', 1)
+        eth = crypto_repo.create('ETH', 'Ethereum', 2)
+        session.commit()
+        
+        price_repo = PriceHistoryRepository(session)
+        price_repo.create(btc.id, datetime(2024, 1, 2), Decimal('46000'))
+        price_repo.create(btc.id, datetime(2024, 1, 1), Decimal('45000'))
+        price_repo.create(eth.id, datetime(2023, 12, 1), Decimal('2000'))
+        session.commit()
+        
+        prices = price_repo.get_by_crypto_ids_and_time_range(
+            [btc.id, eth.id], datetime(2024, 1, 1), datetime(2024, 1, 31)
+        )
+        assert list(prices) == [btc.id]
+        assert [p.timestamp.day for p in prices[btc.id]] == [1, 2]
+    
+    def test_get_price_arrays_by_crypto_ids(self, session):
+        """Test reading several cryptos' prices as float arrays."""
+        crypto_repo = CryptoRepository(session)
+        btc = crypto_repo.create('BTC', 'Bitcoin', 1)
+        eth = crypto_repo.create('ETH', 'Ethereum', 2)
+        ada = crypto_repo.create('ADA', 'Cardano', 8)
+        session.commit()
+        
+        price_repo = PriceHistoryRepository(session)
+        price_repo.create(eth.id, datetime(2024, 1, 2), Decimal('2600'))
+        price_repo.create(btc.id, datetime(2024, 1, 2), Decimal('46000'))
+        price_repo.create(btc.id, datetime(2024, 1, 1), Decimal('45000'))
+        price_repo.create(eth.id, datetime(2024, 1, 1), Decimal('2500'))
+        price_repo.create(ada.id, datetime(2023, 12, 1), Decimal('0.5'))
+        session.commit()
+        
+        arrays = price_repo.get_price_arrays_by_crypto_ids(
+            [btc.id, eth.id, ada.id], datetime(2024, 1, 1), datetime(2024, 1, 31)
+        )
+        assert sorted(arrays) == sorted([btc.id, eth.id])
+        assert arrays[btc.id].dtype == 'float64'
+        assert arrays[btc.id].tolist() == [45000.0, 46000.0]
+        assert arrays[eth.id].tolist() == [2500.0, 2600.0]
+        assert price_repo.get_price_arrays_by_crypto_ids(
+            [ada.id], datetime(2024, 1, 1), datetime(2024, 1, 31)
+        ) == {}
+    
+    def test_get_prices_as_frame(self, session):
+        """Test reading a time range into float columns."""
+        crypto = CryptoRepository(session).create('BTC', 'Bitcoin', 1)
+        session.commit()
+        
+        price_repo = PriceHistoryRepository(session)
+        price_repo.create(crypto.id, datetime(2024, 1, 2), Decimal('46000.5'))
+        price_repo.create(crypto.id, datetime(2024, 1, 1), Decimal('45000'), Decimal('10'))
+        session.commit()
+        
+        df = price_repo.get_prices_as_frame(crypto.id, datetime(2024, 1, 1), datetime(2024, 1, 3))
+        assert list(df.columns) == ['timestamp', 'price_usd', 'volume_24h', 'market_cap']
+        assert df['price_usd'].dtype == 'float64'
+        assert df['price_usd'].tolist() == [45000.0, 46000.5]
+        assert df['timestamp'].iloc[0] == datetime(2024, 1, 1)
+        assert df['volume_24h'].isna().tolist() == [False, True]
+    
+    def test_iter_by_crypto_and_time_range(self, session):
+        """Test streaming a time range in small batches."""
+        crypto = CryptoRepository(session).create('BTC', 'Bitcoin', 1)
+        session.commit()
+        
+        price_repo = PriceHistoryRepository(session)
+        for hour in range(5):
+            price_repo.create(crypto.id, datetime(2024, 1, 1, hour), Decimal('45000'))
+        session.commit()
+        
+        start, end = datetime(2024, 1, 1, 1), datetime(2024, 1, 1, 3)
+        records = price_repo.iter_by_crypto_and_time_range(crypto.id, start, end, batch_size=2)
+        assert [p.timestamp.hour for p in records] == [1, 2, 3]
+        assert list(price_repo.iter_timestamps_in_range(crypto.id, start, end)) == \
+            price_repo.get_timestamps_in_range(crypto.id, start, end)
+    
+    def test_bulk_create_skips_existing(self, session):
+        """Test that bulk create ignores records that already exist."""
+        crypto_repo = CryptoRepository(session)
+        crypto = crypto_repo.create('BTC', 'Bitcoin', 1)
+        session.commit()
+        
+        price_repo = PriceHistoryRepository(session)
+        price_repo.create(crypto.id, datetime(2024, 1, 1), Decimal('45000'))
+        session.commit()
+        
+        records = [
+            {'crypto_id': crypto.id, 'timestamp': datetime(2024, 1, day), 'price_usd': Decimal('45000')}
+            for day in (1, 2, 3)
+        ]
+        assert price_repo.bulk_create(records) == 2
+        assert price_repo.count_by_crypto(crypto.id) == 3
+    
+    def test_exists_for_crypto(self, session):
+        """Test checking for price history without counting it."""
+        crypto = CryptoRepository(session).create('BTC', 'Bitcoin', 1)
+        session.commit()
+        
+        price_repo = PriceHistoryRepository(session)
+        assert price_repo.exists_for_crypto(crypto.id) is False
+        
+        price_repo.create(crypto.id, datetime(2024, 1, 1), Decimal('45000'))
+        session.commit()
+        assert price_repo.exists_for_crypto(crypto.id) is True
+    
+    def test_get_price_at_time_picks_closest(self, session):
+        """Test that the closest record within tolerance is returned."""
+        crypto = CryptoRepository(session).create('BTC', 'Bitcoin', 1)
+        price_repo = PriceHistoryRepository(session)
+        price_repo.create(crypto.id, datetime(2024, 1, 1, 10, 0), Decimal('100'))
+        price_repo.create(crypto.id, datetime(2024, 1, 1, 10, 40), Decimal('200'))
+        session.commit()
+        
+        closest = price_repo.get_price_at_time(crypto.id, datetime(2024, 1, 1, 10, 25))
+        assert closest.price_usd == 200
+        closest = price_repo.get_price_at_time(crypto.id, datetime(2024, 1, 1, 10, 15))
+        assert closest.price_usd == 100
+        assert price_repo.get_price_at_time(crypto.id, datetime(2024, 1, 1, 12, 0)) is None
+    
+    def test_bulk_create_streams_batches(self, session):
+        """Test that bulk create accepts a generator spanning several batches."""
+        crypto = CryptoRepository(session).create('BTC', 'Bitcoin', 1)
+        session.commit()
+        
+        start = datetime(2024, 1, 1)
+        records = (
+            {'crypto_id': crypto.id, 'timestamp': start + timedelta(hours=i), 'price_usd': 45000.0}
+            for i in range(1200)
+        )
+        price_repo = PriceHistoryRepository(session)
+        assert price_repo.bulk_create(records) == 1200
+        assert price_repo.count_by_crypto(crypto.id) == 1200
+    
+    
+    def test_get_latest_price_uses_cache(self, session):
+        """Test that latest price reads are cached and refreshed on ingest."""
+        from src.data.price_cache import LatestPrice, latest_price_cache
+        latest_price_cache.invalidate()
+        
+        crypto = CryptoRepository(session).create('BTC', 'Bitcoin', 1)
+        price_repo = PriceHistoryRepository(session)
+        price_repo.create(crypto.id, datetime(2024, 1, 1), Decimal('45000'))
+        session.commit()
+        
+        assert price_repo.get_latest_price(crypto.id).timestamp == datetime(2024, 1, 1)
+        # Hits serve the same detached value, never a transient PriceHistory
+        cached = latest_price_cache.get(crypto.id)
+        assert isinstance(cached, LatestPrice)
+        assert price_repo.get_latest_price(crypto.id) is cached
+        
+        # Older backfill data must not replace the cached latest price
+        price_repo.bulk_create([
+            {'crypto_id': crypto.id, 'timestamp': datetime(2023, 12, 31), 'price_usd': 44000.0},
+            {'crypto_id': crypto.id, 'timestamp': datetime(2024, 1, 2), 'price_usd': 46000.0},
+        ])
+        assert latest_price_cache.get(crypto.id).timestamp == datetime(2024, 1, 1)
+        session.commit()
+        
+        latest = price_repo.get_latest_price(crypto.id)
+        assert latest.timestamp == datetime(2024, 1, 2)
+        assert latest.price_usd == 46000.0
+        latest_price_cache.invalidate()
 
 
 class TestPredictionRepository:
@@ -142,12 +485,115 @@ class TestPredictionRepository:
             prediction_date=datetime(2024, 1, 1),
             predicted_price=Decimal('50000.00'),
             confidence_score=Decimal('0.85'),
-            prediction_horizon_hours=24
+            prediction_horizon_hours=24,
+            flush=True
         )
         
         assert prediction.id is not None
         assert prediction.predicted_price == Decimal('50000.00')
         assert prediction.confidence_score == Decimal('0.85')
+    
+    def test_bulk_create_predictions(self, session):
+        """Test bulk creating predictions with column defaults applied."""
+        crypto = CryptoRepository(session).create('BTC', 'Bitcoin', 1)
+        session.commit()
+        
+        pred_repo = PredictionRepository(session)
+        count = pred_repo.bulk_create(
+            {'crypto_id': crypto.id, 'prediction_date': datetime(2024, 1, day), 'predicted_price': 50000.0}
+            for day in (1, 2, 3)
+        )
+        session.commit()
+        
+        assert count == 3
+        predictions = pred_repo.get_by_crypto(crypto.id)
+        assert len(predictions) == 3
+        assert all(p.prediction_horizon_hours == 24 for p in predictions)
+    
+    def test_get_top_performers(self, session):
+        """Test ranking the latest predictions by confidence."""
+        top_performers_cache.invalidate()
+        crypto_repo = CryptoRepository(session)
+        pred_repo = PredictionRepository(session)
+        assert pred_repo.get_top_performers() == []
+        
+        btc = crypto_repo.create('BTC', 'Bitcoin', 1)
+        eth = crypto_repo.create('ETH', 'Ethereum', 2)
+        session.commit()
+        
+        latest = datetime(2024, 1, 2)
+        pred_repo.create(btc.id, datetime(2024, 1, 1), 50000.0, confidence_score=0.99)
+        pred_repo.create(btc.id, latest, 51000.0, confidence_score=0.6)
+        pred_repo.create(eth.id, latest, 2600.0, confidence_score=0.8)
+        pred_repo.create(eth.id, latest, 2700.0)
+        session.commit()
+        
+        session.expire_all()
+        top = pred_repo.get_top_performers(limit=5)
+        assert [p.confidence_score for p in top] == [0.8, 0.6]
+        # Cryptocurrency columns come with the predictions as plain values
+        assert all(isinstance(p, TopPerformer) for p in top)
+        assert [(p.crypto_id, p.symbol, p.name) for p in top] == [
+            (eth.id, 'ETH', 'Ethereum'),
+            (btc.id, 'BTC', 'Bitcoin'),
+        ]
+        top_performers_cache.invalidate()
+    
+    def test_get_top_performers_uses_cache(self, session):
+        """Test that top performers are cached until new predictions are committed."""
+        top_performers_cache.invalidate()
+        crypto_repo = CryptoRepository(session)
+        pred_repo = PredictionRepository(session)
+        btc = crypto_repo.create('BTC', 'Bitcoin', 1)
+        eth = crypto_repo.create('ETH', 'Ethereum', 2)
+        session.commit()
+        
+        pred_repo.create(btc.id, datetime(2024, 1, 1), 51000.0, confidence_score=0.6)
+        session.commit()
+        assert len(pred_repo.get_top_performers(limit=5)) == 1
+        
+        statements = []
+        event.listen(
+            session.get_bind(),
+            'before_cursor_execute',
+            lambda conn, cursor, statement, *args: statements.append(statement)
+        )
+        cached = pred_repo.get_top_performers(limit=5)
+        assert statements == []
+        assert [(p.crypto_id, p.symbol) for p in cached] == [(btc.id, 'BTC')]
+        assert cached[0].confidence_score == 0.6
+        assert cached[0].created_at is not None
+        
+        pred_repo.bulk_create([{
+            'crypto_id': eth.id,
+            'prediction_date': datetime(2024, 1, 1),
+            'predicted_price': 2600.0,
+            'confidence_score': 0.8,
+        }])
+        session.commit()
+        top = pred_repo.get_top_performers(limit=5)
+        assert [p.symbol for p in top] == ['ETH', 'BTC']
+        top_performers_cache.invalidate()
+    
+    def test_get_latest_by_crypto_ids(self, session):
+        """Test getting the latest prediction of several cryptos at once."""
+        crypto_repo = CryptoRepository(session)
+        pred_repo = PredictionRepository(session)
+        btc = crypto_repo.create('BTC', 'Bitcoin', 1)
+        eth = crypto_repo.create('ETH', 'Ethereum', 2)
+        ada = crypto_repo.create('ADA', 'Cardano', 8)
+        session.commit()
+        
+        pred_repo.create(btc.id, datetime(2024, 1, 2), 51000.0)
+        pred_repo.create(btc.id, datetime(2024, 1, 1), 50000.0)
+        pred_repo.create(eth.id, datetime(2024, 1, 1), 2600.0)
+        session.commit()
+        
+        latest = pred_repo.get_latest_by_crypto_ids([btc.id, eth.id, ada.id])
+        assert {crypto_id: p.prediction_date.day for crypto_id, p in latest.items()} == {
+            btc.id: 2,
+            eth.id: 1,
+        }
 
 
 class TestChatHistoryRepository:
@@ -164,7 +610,8 @@ class TestChatHistoryRepository:
             pii_detected=False,
             openai_tokens_input=50,
             openai_tokens_output=100,
-            openai_cost_usd=Decimal('0.0001')
+            openai_cost_usd=Decimal('0.0001'),
+            flush=True
         )
         
         assert chat.id is not None
@@ -189,6 +636,282 @@ class TestChatHistoryRepository:
         assert len(recent) == 3
         # Should be in descending order (most recent first)
         assert recent[0].question == 'Question 4'
+    
+    def test_get_total_cost_by_session(self, session):
+        """Test summing session cost as a float."""
+        repo = ChatHistoryRepository(session)
+        assert repo.get_total_cost_by_session('test-session') == 0.0
+        
+        for cost in ('0.001500', '0.002250'):
+            repo.create(
+                session_id='test-session',
+                question='Question',
+                answer='Answer',
+                openai_cost_usd=Decimal(cost)
+            )
+        session.commit()
+        
+        total = repo.get_total_cost_by_session('test-session')
+        assert isinstance(total, float)
+        assert total == pytest.approx(0.00375)
+    
+    def test_projected_session_history(self, session):
+        """Test reading session history as column rows."""
+        repo = ChatHistoryRepository(session)
+        for i in range(3):
+            repo.create(
+                session_id='test-session',
+                question=f'Question {i}',
+                answer=f'Answer {i}',
+                context_used={'predictions': [i]},
+                openai_tokens_input=10 * i
+            )
+        session.commit()
+        
+        recent = repo.get_recent_by_session_projected('test-session', limit=2)
+        assert [row.question for row in recent] == ['Question 1', 'Question 2']
+        assert recent[1].answer == 'Answer 2'
+        
+        history = repo.get_all_by_session_projected('test-session')
+        assert len(history) == 3
+        assert history[2].openai_tokens_input == 20
+        assert 'context_used' not in history[0]._fields
+        
+        streamed = list(repo.iter_all_by_session_projected('test-session', batch_size=2))
+        assert streamed == history
+    
+    def test_recent_history_cache_invalidated_on_commit(self, session):
+        """Test recent history is cached until a new message is committed."""
+        repo = ChatHistoryRepository(session)
+        repo.create(session_id='cached-session', question='Q1', answer='A1')
+        session.commit()
+        
+        assert [row.question for row in repo.get_recent_by_session_projected('cached-session')] == ['Q1']
+        hits = recent_history_cache.hits
+        assert [row.question for row in repo.get_recent_by_session_projected('cached-session')] == ['Q1']
+        assert recent_history_cache.hits == hits + 1
+        
+        repo.create_returning_id(session_id='cached-session', question='Q2', answer='A2')
+        # Uncommitted messages bypass the cache
+        assert len(repo.get_recent_by_session_projected('cached-session')) == 2
+        session.commit()
+        
+        recent = repo.get_recent_by_session_projected('cached-session')
+        assert [row.question for row in recent] == ['Q1', 'Q2']
+    
+    def test_get_session_stats_bulk(self, session):
+        """Test aggregating several sessions in one grouped query."""
+        repo = ChatHistoryRepository(session)
+        for session_id, tokens in (('bulk-a', 10), ('bulk-a', 20), ('bulk-b', 5)):
+            repo.create(
+                session_id=session_id,
+                question='Question',
+                answer='Answer',
+                openai_tokens_input=tokens
+            )
+        session.commit()
+        
+        stats = repo.get_session_stats_bulk(['bulk-a', 'bulk-b', 'bulk-c'])
+        assert stats['bulk-a']['message_count'] == 2
+        assert stats['bulk-a']['total_tokens_input'] == 30
+        assert stats['bulk-b']['total_tokens_input'] == 5
+        assert stats['bulk-c']['message_count'] == 0
+        assert stats['bulk-a'] == repo.get_session_stats('bulk-a')
+        assert repo.get_session_stats_bulk([]) == {}
+    
+    def test_session_stats_skip_known_empty_session(self, session):
+        """Test stats of a session with a cached empty history skip the query."""
+        repo = ChatHistoryRepository(session)
+        assert repo.get_recent_by_session_projected('empty-session') == []
+        assert is_known_empty('empty-session')
+        
+        statements = []
+        event.listen(session.get_bind(), 'before_cursor_execute', lambda *args: statements.append(args[2]))
+        assert repo.get_session_stats('empty-session')['message_count'] == 0
+        assert statements == []
+        
+        repo.create(session_id='empty-session', question='Q', answer='A')
+        session.commit()
+        assert not is_known_empty('empty-session')
+        assert repo.get_session_stats('empty-session')['message_count'] == 1
+    
+    def test_create_with_built_context(self, session):
+        """Test that a built chat context can be stored with the message."""
+        from src.data.price_cache import latest_price_cache
+        from src.data.tendency_cache import latest_tendency_cache
+        from src.genai.context_builder import ContextBuilder
+        latest_price_cache.invalidate()
+        latest_tendency_cache.invalidate()
+        
+        crypto = CryptoRepository(session).create('BTC', 'Bitcoin', 1)
+        session.commit()
+        now = datetime.now()
+        price_repo = PriceHistoryRepository(session)
+        price_repo.create(crypto.id, now - timedelta(hours=2), Decimal('45000'))
+        price_repo.create(crypto.id, now - timedelta(hours=1), Decimal('46000'))
+        PredictionRepository(session).create(crypto.id, now, 47000.0, confidence_score=0.7)
+        MarketTendencyRepository(session).create('bullish', now, Decimal('0.8'))
+        session.commit()
+        
+        context = ContextBuilder(session).build_context('What is the bitcoin outlook?')
+        assert context['recent_prices'] == {'BTC': [45000.0, 46000.0]}
+        
+        repo = ChatHistoryRepository(session)
+        chat = repo.create(session_id='context-session', question='Q', answer='A', context_used=context)
+        session.commit()
+        session.expire_all()
+        
+        stored = session.get(ChatHistory, chat.id).context_used
+        assert stored['recent_prices'] == {'BTC': [45000.0, 46000.0]}
+        assert stored['lstm_predictions']['timestamp'] == now.isoformat()
+        assert stored['market_tendency']['timestamp'] == now.isoformat()
+        latest_price_cache.invalidate()
+        latest_tendency_cache.invalidate()
+    
+    def test_create_returning_id(self, session):
+        """Test inserting a chat record and getting only its ID."""
+        repo = ChatHistoryRepository(session)
+        chat_id = repo.create_returning_id(
+            session_id='test-session',
+            question='What is Bitcoin?',
+            answer='Bitcoin is a cryptocurrency...'
+        )
+        session.commit()
+        
+        chat = session.get(ChatHistory, chat_id)
+        assert chat.session_id == 'test-session'
+        assert chat.topic_valid is True
+    
+    def test_get_session_stats(self, session):
+        """Test aggregating session usage in one query."""
+        repo = ChatHistoryRepository(session)
+        empty = repo.get_session_stats('test-session')
+        assert empty['message_count'] == 0
+        assert empty['total_tokens_input'] == 0
+        assert empty['first_message'] is None
+        
+        for tokens, response_time in ((100, 200), (50, 400)):
+            repo.create(
+                session_id='test-session',
+                question='Question',
+                answer='Answer',
+                openai_tokens_input=tokens,
+                openai_tokens_output=tokens * 2,
+                openai_cost_usd=Decimal('0.001000'),
+                response_time_ms=response_time
+            )
+        session.commit()
+        
+        stats = repo.get_session_stats('test-session')
+        assert stats['message_count'] == 2
+        assert stats['total_cost_usd'] == pytest.approx(0.002)
+        assert stats['total_tokens_input'] == 150
+        assert stats['total_tokens_output'] == 300
+        assert stats['avg_response_time_ms'] == pytest.approx(300)
+        assert stats['first_message'] <= stats['last_message']
+    
+    
+    def test_get_recent_answer(self, session):
+        """Test retrieving a recent answer by question hash."""
+        repo = ChatHistoryRepository(session)
+        repo.create(
+            session_id='session-a',
+            question='What is Bitcoin?',
+            answer='Bitcoin is a cryptocurrency...',
+            question_hash=b'\x01' * 32
+        )
+        session.commit()
+        
+        cached = repo.get_recent_answer(b'\x01' * 32, datetime(2000, 1, 1))
+        assert cached is not None
+        assert cached.answer == 'Bitcoin is a cryptocurrency...'
+        assert cached.question_hash_hex == '01' * 32
+        
+        assert repo.get_recent_answer(b'\x01' * 32, datetime(2999, 1, 1)) is None
+        assert repo.get_recent_answer(b'\x02' * 32, datetime(2000, 1, 1)) is None
+    
+    
+    def test_delete_old_chat_history_in_batches(self, session):
+        """Test that retention cleanup deletes all old records in batches."""
+        repo = ChatHistoryRepository(session)
+        for i in range(5):
+            repo.create(session_id='old-session', question=f'Q{i}', answer=f'A{i}')
+        session.commit()
+        
+        deleted = repo.delete_old_chat_history(datetime(2999, 1, 1), batch_size=2)
+        assert deleted == 5
+        assert repo.get_total_count() == 0
+    
+    
+    def test_chat_write_queue_links_audit_logs(self, tmp_path):
+        """Test that queued entries are written with audit logs linked."""
+        engine = create_engine(f"sqlite:///{tmp_path / 'chat.db'}")
+        Base.metadata.create_all(engine)
+        Session = sessionmaker(bind=engine)
+        
+        write_queue = ChatWriteQueue(session_factory=Session, flush_seconds=0.05)
+        write_queue.put(
+            {'session_id': 'session-q', 'question': 'Q1', 'answer': 'A1'},
+            {'session_id': 'session-q', 'rejected': False}
+        )
+        write_queue.put(None, {'session_id': 'session-q', 'rejected': True})
+        write_queue.stop(timeout=5)
+        
+        session = Session()
+        chat = session.query(ChatHistory).one()
+        audits = session.query(QueryAuditLog).order_by(QueryAuditLog.id).all()
+        assert [a.chat_history_id for a in audits] == [chat.id, None]
+        session.close()
+    
+    def test_chat_write_queue_keeps_audit_logs_on_chat_error(self, tmp_path):
+        """Test that a failing chat record does not drop the batch's audit logs."""
+        engine = create_engine(f"sqlite:///{tmp_path / 'chat.db'}")
+        Base.metadata.create_all(engine)
+        Session = sessionmaker(bind=engine)
+        
+        write_queue = ChatWriteQueue(session_factory=Session, flush_seconds=0.2)
+        write_queue.put(
+            {'session_id': 'session-a', 'question': 'Q1', 'answer': 'A1'},
+            {'session_id': 'session-a', 'rejected': False}
+        )
+        write_queue.put(
+            {'session_id': 'session-b', 'question': None, 'answer': 'A2'},
+            {'session_id': 'session-b', 'rejected': False}
+        )
+        write_queue.stop(timeout=5)
+        
+        session = Session()
+        chat = session.query(ChatHistory).one()
+        assert chat.session_id == 'session-a'
+        audits = session.query(QueryAuditLog).order_by(QueryAuditLog.id).all()
+        assert [a.chat_history_id for a in audits] == [chat.id, None]
+        session.close()
+    
+    def test_audit_write_queue_batches_events(self, tmp_path):
+        """Test that queued audit events are inserted by the writer."""
+        from src.utils.audit_logger import (
+            AuditEvent, AuditEventType, AuditLog, AuditLogger, AuditSeverity, AuditWriteQueue
+        )
+        engine = create_engine(f"sqlite:///{tmp_path / 'audit.db'}")
+        Base.metadata.create_all(engine)
+        Session = sessionmaker(bind=engine)
+        
+        write_queue = AuditWriteQueue(session_factory=Session, flush_seconds=0.05)
+        audit_logger = AuditLogger(write_queue=write_queue)
+        for status_code in (200, 404):
+            assert audit_logger.log_event(AuditEvent(
+                event_type=AuditEventType.MARKET_DATA_ACCESSED,
+                severity=AuditSeverity.LOW,
+                message='GET /api/market',
+                status_code=status_code
+            )) is None
+        write_queue.stop(timeout=5)
+        
+        session = Session()
+        logs = session.query(AuditLog).order_by(AuditLog.id).all()
+        assert [log.status_code for log in logs] == [200, 404]
+        assert logs[0].event_type == 'market_data_accessed'
+        session.close()
 
 
 class TestMarketTendencyRepository:
@@ -201,7 +924,8 @@ class TestMarketTendencyRepository:
             tendency='bullish',
             timestamp=datetime(2024, 1, 1),
             confidence=Decimal('0.75'),
-            metrics={'avg_change': 2.5, 'volatility': 0.15}
+            metrics={'avg_change': 2.5, 'volatility': 0.15},
+            flush=True
         )
         
         assert tendency.id is not None
@@ -220,3 +944,136 @@ class TestMarketTendencyRepository:
         latest = repo.get_latest()
         assert latest.tendency == 'bullish'
         assert latest.timestamp == datetime(2024, 1, 2)
+    
+    def test_get_latest_uses_cache(self, session):
+        """Test that the latest tendency is cached until a new one is committed."""
+        from src.data.tendency_cache import LatestTendency, latest_tendency_cache
+        latest_tendency_cache.invalidate()
+        
+        repo = MarketTendencyRepository(session)
+        repo.create('bearish', datetime(2024, 1, 1), Decimal('0.6'))
+        session.commit()
+        cached = repo.get_latest()
+        assert cached.tendency == 'bearish'
+        assert isinstance(cached, LatestTendency)
+        
+        statements = []
+        event.listen(
+            session.get_bind(),
+            'before_cursor_execute',
+            lambda conn, cursor, statement, *args: statements.append(statement)
+        )
+        assert repo.get_latest().tendency == 'bearish'
+        assert statements == []
+        
+        repo.create('bullish', datetime(2024, 1, 2), Decimal('0.8'))
+        session.commit()
+        assert repo.get_latest().tendency == 'bullish'
+        latest_tendency_cache.invalidate()
+    
+    def test_unknown_tendency_rejected(self, session):
+        """Test that the CHECK constraint rejects unknown tendencies."""
+        repo = MarketTendencyRepository(session)
+        
+        with pytest.raises(IntegrityError):
+            repo.create('sideways', datetime(2024, 1, 1), Decimal('0.5'), flush=True)
+
+
+class TestAlertLogRepository:
+    """Test AlertLogRepository operations."""
+    
+    def test_bulk_create_alerts(self, session):
+        """Test writing a check's alert logs in one batch."""
+        crypto = CryptoRepository(session).create('BTC', 'Bitcoin', 1)
+        session.commit()
+        
+        repo = AlertLogRepository(session)
+        count = repo.bulk_create(
+            {
+                'crypto_id': crypto.id,
+                'shift_type': 'decrease',
+                'change_percent': Decimal('-12.5'),
+                'previous_price': 50000.0,
+                'current_price': 43750.0,
+                'alert_message': 'DROP ALERT: BTC',
+                'recipient_number': 'N/A',
+                'sms_provider': 'twilio',
+                'timestamp': datetime(2024, 1, 1, hour),
+                'sms_message_id': None,
+                'success': hour == 1,
+                'error_message': None if hour == 1 else 'SMS gateway not configured'
+            }
+            for hour in (1, 2)
+        )
+        session.commit()
+        
+        assert count == 2
+        assert len(repo.get_recent_alerts()) == 2
+        assert [a.timestamp.hour for a in repo.get_failed_alerts()] == [2]
+        assert repo.get_last_alert_time(crypto.id) == datetime(2024, 1, 1, 2)
+        assert repo.count_alerts_by_crypto(crypto.id) == 2
+        assert repo.get_last_alert_time(crypto.id + 1) is None
+
+
+class TestCheckConnection:
+    """Test database connection check."""
+    
+    def test_check_connection_caches_result(self, engine, monkeypatch):
+        """Test that a recent result is reused without reconnecting."""
+        from src.data import database
+        
+        monkeypatch.setattr(database, '_engine', engine)
+        monkeypatch.setattr(database, '_last_check', (0.0, False))
+        
+        assert database.check_connection() is True
+        
+        connect_calls = []
+        monkeypatch.setattr(engine, 'connect', lambda: connect_calls.append(1))
+        
+        assert database.check_connection() is True
+        assert connect_calls == []
+
+
+class TestSessionScope:
+    """Test scoped session management."""
+    
+    @pytest.fixture
+    def scoped_db(self, engine, monkeypatch):
+        """Point the database module at the in-memory engine."""
+        from sqlalchemy.orm import scoped_session
+        from src.data import database
+        
+        maker = sessionmaker(bind=engine, expire_on_commit=False)
+        monkeypatch.setattr(database, '_SessionMaker', maker)
+        monkeypatch.setattr(
+            database,
+            '_SessionFactory',
+            scoped_session(maker, scopefunc=database._get_scope_id)
+        )
+        yield database
+        database.remove_session()
+    
+    def test_get_session_shared_within_context(self, scoped_db):
+        """Test that one context reuses a single session."""
+        assert scoped_db.get_session() is scoped_db.get_session()
+        assert scoped_db.new_session() is not scoped_db.get_session()
+        
+        first = scoped_db.get_session()
+        scoped_db.remove_session()
+        assert scoped_db.get_session() is not first
+    
+    def test_nested_session_scope_commits_once(self, scoped_db):
+        """Test that nested scopes share the outer transaction."""
+        with scoped_db.session_scope() as outer:
+            btc = CryptoRepository(outer).create('BTC', 'Bitcoin', 1)
+            
+            with scoped_db.session_scope() as inner:
+                assert inner is outer
+                CryptoRepository(inner).create('ETH', 'Ethereum', 2)
+            
+            # Inner scope must not have closed the outer session
+            assert btc in outer
+        
+        check = scoped_db.new_session()
+        assert check.query(Cryptocurrency).count() == 2
+        check.close()